@@ -0,0 +1,150 @@
+"""Run the benchmark suites and compare their results.
+
+    python -m benchmarks run [-s SUITE]... [-q] [-o RESULTS]
+    python -m benchmarks compare BASELINE RESULTS [-t THRESHOLD]
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from benchmarks.common import machine_info, temporary_data_path
+from pendulum import settings as sett
+from pendulum.lazy import import_object
+
+#: Benchmark suites, by name, and the function that runs each one
+SUITES = {
+    "startup": "benchmarks.startup:measurements",
+    "physics": "benchmarks.physics:run",
+    "recording": "benchmarks.recording:run",
+    "rendering": "benchmarks.rendering:run",
+}
+
+#: Relative change considered a regression
+THRESHOLD = 0.1
+
+
+@click.group()
+def cli():
+    """Pendulum Benchmarks."""
+
+
+@cli.command()
+@click.option(
+    "-s",
+    "--suite",
+    "suites",
+    type=click.Choice(list(SUITES)),
+    multiple=True,
+    help="Run only these suites (all of them by default).",
+)
+@click.option("-q", "--quick", is_flag=True, help="Smaller, noisier runs.")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Results file. Defaults to a timestamped one in the data path.",
+)
+def run(suites: tuple[str, ...], quick: bool, output: Path | None):
+    """Run the benchmarks, saving the results as JSON."""
+    results = {}
+    for suite in suites or SUITES:
+        click.secho(f"Running '{suite}' benchmarks...", fg="bright_green")
+        with temporary_data_path():
+            measurements = import_object(SUITES[suite])(quick=quick)
+
+        for measurement in measurements:
+            click.echo(
+                f" - {measurement.name}: "
+                f"{measurement.value:.6g} {measurement.unit}"
+            )
+            results[measurement.name] = measurement.to_dict()
+
+    if output is None:
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        output = sett.ensure_path(sett.BENCHMARK_PATH) / f"{ts}.json"
+
+    content = {"machine": machine_info(), "quick": quick, "results": results}
+    output.write_text(json.dumps(content, indent=2))
+    click.secho(f"Results saved to '{output}'.", fg="green")
+
+
+def relative_change(baseline: dict, result: dict) -> float | None:
+    """Change of a measurement, positive when it got better.
+
+    None if the baseline isn't positive, as a ratio to it is meaningless.
+    """
+    if baseline["value"] <= 0:
+        return None
+
+    change = result["value"] / baseline["value"] - 1
+    return change if baseline["higher_is_better"] else -change
+
+
+def is_significant(baseline: dict, result: dict) -> bool:
+    """Whether the absolute change is above the noise of the measurement."""
+    min_change = result.get("min_change", 0.0)
+    return abs(result["value"] - baseline["value"]) >= min_change
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True, path_type=Path))
+@click.argument("results", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "-t",
+    "--threshold",
+    type=float,
+    default=THRESHOLD,
+    help="Relative change flagged as a regression.",
+)
+def compare(baseline: Path, results: Path, threshold: float):
+    """Compare RESULTS against BASELINE, failing if anything regressed."""
+    old = json.loads(baseline.read_text())
+    new = json.loads(results.read_text())
+
+    for key in ("machine", "processor", "cpu_count", "python"):
+        if old["machine"].get(key) != new["machine"].get(key):
+            click.secho(
+                f"Results are from different machines ({key}).", fg="yellow"
+            )
+            break
+
+    regressions = 0
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            click.echo(f"{name}: new")
+            continue
+
+        change = relative_change(old["results"][name], result)
+        if change is None:
+            click.secho(
+                f"{name}: {result['value']:.6g} {result['unit']} "
+                "(baseline not comparable)",
+                fg="yellow",
+            )
+            continue
+
+        # Small changes of noisy measurements are neither.
+        significant = is_significant(old["results"][name], result)
+        color = None
+        if significant and change < -threshold:
+            color = "bright_red"
+            regressions += 1
+        elif significant and change > threshold:
+            color = "green"
+
+        click.secho(
+            f"{name}: {result['value']:.6g} {result['unit']} ({change:+.1%})",
+            fg=color,
+        )
+
+    if regressions:
+        click.secho(f"{regressions} regressions.", fg="bright_red")
+        raise click.exceptions.Exit(1)
+
+    click.secho("No regressions.", fg="green")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,109 @@
+"""Helpers shared by the benchmarks."""
+import contextlib
+import io
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from pendulum import settings as sett
+
+
+@dataclass
+class Measurement:
+    """Result of a single benchmark."""
+
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+    #: Smallest absolute change (in `unit`) that isn't considered noise
+    min_change: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "value": self.value,
+            "unit": self.unit,
+            "higher_is_better": self.higher_is_better,
+            "min_change": self.min_change,
+        }
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Shortest duration (s) of `repeat` calls, the least noisy estimate."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+@contextlib.contextmanager
+def temporary_data_path() -> Iterator[Path]:
+    """Point every data path in the settings to a temporary directory.
+
+    Benchmarks record, plot and render without touching the actual data.
+    """
+    data_paths = {
+        name: value
+        for name, value in vars(sett).items()
+        if isinstance(value, Path) and value.is_relative_to(sett.DATA_PATH)
+    }
+    with tempfile.TemporaryDirectory(prefix="pendulum_bench_") as tmp:
+        for name, value in data_paths.items():
+            relative = value.relative_to(data_paths["DATA_PATH"])
+            setattr(sett, name, Path(tmp) / relative)
+
+        try:
+            yield Path(tmp)
+        finally:
+            for name, value in data_paths.items():
+                setattr(sett, name, value)
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Hide the output of the benchmarked code."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=sett.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return result.stdout.strip()
+
+
+def machine_info() -> dict[str, Any]:
+    """Details of the machine and environment the benchmarks ran on."""
+    import numpy as np
+    import pymunk
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pymunk": pymunk.version,
+    }
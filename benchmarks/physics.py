@@ -0,0 +1,47 @@
+"""Physics steps per second of the headless simulations."""
+from typing import Callable
+
+from benchmarks.common import Measurement, quiet
+from pendulum.cart.headless import CartPendulumHeadless
+from pendulum.cart.parameters import Parameters
+from pendulum.fixed.headless import FixedPendulumHeadless
+from pendulum.headless import HeadlessSimulation
+
+#: Parameters of the Cart Pendulum runs
+PARAMS = "rest_top"
+
+
+def steps_per_second(
+    create: Callable[[], HeadlessSimulation], duration: float, repeat: int
+) -> float:
+    """Best rate among `repeat` runs of fresh simulations."""
+    best = 0.0
+    for _ in range(repeat):
+        summary = create().run(duration=duration)
+        best = max(best, summary.steps / summary.wall_time)
+
+    return best
+
+
+def run(quick: bool = False) -> list[Measurement]:
+    duration, repeat = (2.0, 1) if quick else (20.0, 3)
+    params = Parameters.load_from_file(filename=PARAMS)
+    simulations = {
+        "physics.fixed": lambda: FixedPendulumHeadless(record=False),
+        "physics.cart": lambda: CartPendulumHeadless(
+            record=False, controller=False, params=params
+        ),
+        "physics.cart.controller": lambda: CartPendulumHeadless(
+            record=False, controller=True, params=params
+        ),
+    }
+    with quiet():
+        return [
+            Measurement(
+                name=name,
+                value=steps_per_second(create, duration, repeat=repeat),
+                unit="steps/s",
+                higher_is_better=True,
+            )
+            for name, create in simulations.items()
+        ]
@@ -0,0 +1,92 @@
+"""Recording throughput, and loading and plotting time by recording size."""
+import itertools
+
+import numpy as np
+
+from benchmarks.common import Measurement, best_time, quiet
+from pendulum.cart import plot as cart_plot
+from pendulum.cart.headless import CartPendulumHeadless
+from pendulum.plot import load_recording
+from pendulum.recorder import FORMATS, Recorder
+
+#: Fields of the benchmarked Recordings
+FIELDS = CartPendulumHeadless.REC_FIELDS
+
+#: Rows of the loaded and plotted Recordings
+SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 10_000)
+
+
+def record(rows: int, rec_format: str, background: bool = False) -> Recorder:
+    """Record `rows` rows of (fake) Cart Pendulum data."""
+    recorder = Recorder(
+        fields=FIELDS,
+        prefix="cart",
+        rec_format=rec_format,
+        background=background,
+    )
+    values = np.random.default_rng(seed=0).normal(size=len(FIELDS))
+    row = dict(zip(FIELDS, values.tolist()))
+    for _ in itertools.repeat(None, rows):
+        recorder.insert(**row)
+
+    recorder.close()
+    return recorder
+
+
+def bench_recorder(rows: int, repeat: int) -> list[Measurement]:
+    """Rows inserted per second by each format, with and without a thread."""
+    measurements = []
+    for rec_format, background in itertools.product(FORMATS, (False, True)):
+        duration = best_time(
+            lambda: record(rows, rec_format=rec_format, background=background),
+            repeat=repeat,
+        )
+        name = f"recorder.{rec_format}" + (".background" if background else "")
+        measurements.append(
+            Measurement(
+                name=name,
+                value=rows / duration,
+                unit="rows/s",
+                higher_is_better=True,
+            )
+        )
+
+    return measurements
+
+
+def bench_by_size(sizes: tuple[int, ...], repeat: int) -> list[Measurement]:
+    """Time to load and to plot Recordings of each format and size."""
+    measurements = []
+    for rec_format, size in itertools.product(FORMATS, sizes):
+        path = record(rows=size, rec_format=rec_format, background=True).path
+        benchmarks = {
+            "load_recording": lambda: load_recording(path=path),
+            "plot_recording": lambda: cart_plot.plot_recording(
+                path=path, height=1080, width=1920
+            ),
+        }
+        for name, func in benchmarks.items():
+            measurements.append(
+                Measurement(
+                    name=f"{name}.{rec_format}.{size}",
+                    value=best_time(func, repeat=repeat),
+                    unit="s",
+                    higher_is_better=False,
+                )
+            )
+
+        path.unlink()
+
+    return measurements
+
+
+def run(quick: bool = False) -> list[Measurement]:
+    rows, sizes, repeat = (
+        (10_000, QUICK_SIZES, 1) if quick else (200_000, SIZES, 3)
+    )
+    with quiet():
+        return [
+            *bench_recorder(rows=rows, repeat=repeat),
+            *bench_by_size(sizes=sizes, repeat=repeat),
+        ]
@@ -0,0 +1,47 @@
+"""Frames per second of the animation rendering."""
+import imageio.v2 as iio
+
+from benchmarks.common import Measurement, best_time, quiet
+from pendulum import settings as sett
+from pendulum.render import Canvas, render_animation
+
+#: Exported frames rendered
+FRAMES = 600
+QUICK_FRAMES = 60
+
+
+def export_frames(count: int) -> None:
+    """Write PNG frames of a disk moving across the screen."""
+    canvas = Canvas(width=sett.WIDTH, height=sett.HEIGHT)
+    export_path = sett.ensure_path(sett.PNG_EXPORT_PATH)
+    for idx in range(count):
+        canvas.clear()
+        x = sett.WIDTH * idx / count
+        canvas.disk(x=x, y=sett.HEIGHT / 2, radius=40, color=(255, 0, 0))
+        iio.imwrite(export_path / f"frame_{idx:04d}.png", canvas.frame)
+
+
+def run(quick: bool = False) -> list[Measurement]:
+    frames = QUICK_FRAMES if quick else FRAMES
+    with quiet():
+        export_frames(count=frames)
+        # Without cached segments, every frame is decoded and encoded.
+        cold = best_time(lambda: render_animation(name="benchmark"), repeat=1)
+        cached = best_time(
+            lambda: render_animation(name="benchmark"), repeat=3
+        )
+
+    return [
+        Measurement(
+            name="render_animation",
+            value=frames / cold,
+            unit="frames/s",
+            higher_is_better=True,
+        ),
+        Measurement(
+            name="render_animation.cached",
+            value=frames / cached,
+            unit="frames/s",
+            higher_is_better=True,
+        ),
+    ]
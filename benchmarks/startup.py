@@ -0,0 +1,158 @@
+"""Startup time of the CLI.
+
+Scripts call the CLI many times, so short commands shouldn't pay for
+importing the heavy dependencies. Each command runs in a fresh interpreter,
+and the benchmark fails if it imports any of `HEAVY_MODULES` or if its
+median time exceeds the budget.
+
+Run it with `python -m benchmarks.startup`.
+"""
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+
+from benchmarks.common import Measurement
+from pendulum import settings as sett
+
+#: Commands that must start without importing the heavy dependencies
+COMMANDS = (
+    ("--help",),
+    ("cart", "--help"),
+    ("chain", "--help"),
+    ("fixed", "--help"),
+    ("recordings", "--help"),
+    ("render", "--help"),
+)
+
+#: Dependencies only the commands that use them should import
+HEAVY_MODULES = (
+    "control",
+    "imageio",
+    "numpy",
+    "pandas",
+    "plotly",
+    "pyglet",
+    "pymunk",
+    "scipy",
+    "sympy",
+)
+
+#: Maximum median time (s) of each command, on top of the bare interpreter
+BUDGET = 0.15
+
+#: Change (s) of the startup time below which it's considered noise
+MIN_CHANGE = 0.05
+
+#: Invokes the CLI, then reports the heavy modules it imported (to stderr)
+PROBE = """
+import json, sys
+from pendulum.cli import cli
+try:
+    cli(sys.argv[1:], standalone_mode=False)
+finally:
+    heavy = {name.partition(".")[0] for name in sys.modules} & set(%r)
+    print(json.dumps(sorted(heavy)), file=sys.stderr)
+"""
+
+
+def time_command(code: str, args: tuple[str, ...]) -> tuple[float, str]:
+    """Run Python `code` in a fresh interpreter, returning time and stderr."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=sett.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - start, result.stderr
+
+
+def run(runs: int = 10) -> dict[str, dict]:
+    """Median startup time (s) and heavy imports of each command.
+
+    The bare interpreter time is reported as `python`.
+    """
+    baseline = [time_command("pass", ())[0] for _ in range(runs)]
+    results = {"python": {"median": statistics.median(baseline)}}
+
+    probe = PROBE % (HEAVY_MODULES,)
+    for args in COMMANDS:
+        durations = []
+        for _ in range(runs):
+            duration, stderr = time_command(probe, args)
+            durations.append(duration)
+
+        results[" ".join(args)] = {
+            "median": statistics.median(durations),
+            "heavy_imports": json.loads(stderr.splitlines()[-1]),
+        }
+
+    return results
+
+
+def measurements(quick: bool = False) -> list[Measurement]:
+    """Startup time of each command, and of the bare interpreter.
+
+    Times are absolute: the overhead over the interpreter is small and
+    noisy enough to change sign between runs.
+    """
+    results = run(runs=3 if quick else 10)
+    measurements = []
+    for command, result in results.items():
+        if command == "python":
+            name = "startup.python"
+        else:
+            name = ".".join(["startup", "pendulum", *command.split()[:-1]])
+        measurements.append(
+            Measurement(
+                name=name,
+                value=result["median"],
+                unit="s",
+                higher_is_better=False,
+                min_change=MIN_CHANGE,
+            )
+        )
+
+    return measurements
+
+
+@click.command()
+@click.option("-n", "--runs", type=int, default=10, help="Runs per command.")
+@click.option(
+    "-b",
+    "--budget",
+    type=float,
+    default=BUDGET,
+    help="Maximum median time (s) over the bare interpreter.",
+)
+def main(runs: int, budget: float):
+    """Measure the CLI startup time, failing on regressions."""
+    results = run(runs=runs)
+    baseline = results.pop("python")["median"]
+    click.echo(f"python: {baseline * 1e3:.1f} ms")
+
+    failed = False
+    for command, result in results.items():
+        overhead = result["median"] - baseline
+        heavy = result["heavy_imports"]
+        ok = overhead <= budget and not heavy
+        failed |= not ok
+        click.secho(
+            f"pendulum {command}: {result['median'] * 1e3:.1f} ms "
+            f"(+{overhead * 1e3:.1f} ms)",
+            fg="green" if ok else "bright_red",
+        )
+        if heavy:
+            click.secho(f" - Imports {', '.join(heavy)}", fg="bright_red")
+
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Write buffered rows in bulk from a background thread."""
+import threading
+from typing import Any, Callable, Collection, Mapping
+
+import numpy as np
+
+from pendulum import settings as sett
+
+#: What to do when inserting into a full buffer: wait for the writer to
+# drain it, discard the row (counting it in `dropped`) or grow the buffer.
+POLICIES = ("block", "drop", "grow")
+
+
+class BackgroundWriter:
+    """Buffer rows in memory and write them in bulk, in a separate thread.
+
+    Rows are stored into a ring buffer (a NumPy structured array), which is
+    allocated on the first insert to infer the type of each field. The buffer
+    is drained when it's filled past `batch_size` rows or every
+    `flush_interval` seconds, and `write` is called with the drained column
+    arrays, outside of the caller's thread.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[dict[str, np.ndarray]], None],
+        fields: Collection[str],
+        capacity: int = sett.REC_BUFFER_SIZE,
+        policy: str = sett.REC_BUFFER_POLICY,
+        flush_interval: float = 0.5,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown buffer policy: {policy}.")
+
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.policy = policy
+        self.flush_interval = flush_interval
+        self.batch_size = max(capacity // 4, 1)
+
+        #: Number of rows discarded due to a full buffer (`drop` policy)
+        self.dropped = 0
+
+        self._write = write
+        self._buffer: np.ndarray | None = None
+        self._head = 0
+        self._count = 0
+
+        self._closing = False
+        self._error: BaseException | None = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="BackgroundWriter", daemon=True
+        )
+        self._thread.start()
+
+    def _allocate(self, row: Mapping[str, Any]) -> None:
+        dtype = [
+            (name, "?" if isinstance(row[name], bool) else "<f8")
+            for name in self.fields
+        ]
+        self._buffer = np.empty(self.capacity, dtype=dtype)
+
+    def _is_full(self) -> bool:
+        assert self._buffer is not None
+        return self._count == len(self._buffer)
+
+    def insert(self, row: Mapping[str, Any]) -> None:
+        """Add a row to the buffer, applying the `policy` if it's full."""
+        with self._cond:
+            self._raise_error()
+
+            if self._buffer is None:
+                self._allocate(row=row)
+
+            assert self._buffer is not None
+            if self._is_full():
+                if self.policy == "drop":
+                    self.dropped += 1
+                    return
+
+                if self.policy == "grow":
+                    self._buffer = self._ordered(size=2 * len(self._buffer))
+                    self._head = 0
+                else:
+                    self._cond.notify_all()
+                    self._cond.wait_for(
+                        lambda: not self._is_full() or self._error is not None
+                    )
+                    self._raise_error()
+
+            idx = (self._head + self._count) % len(self._buffer)
+            self._buffer[idx] = tuple(row[name] for name in self.fields)
+            self._count += 1
+
+            if self._count >= self.batch_size:
+                self._cond.notify_all()
+
+    def _ordered(self, size: int) -> np.ndarray:
+        """Copy the buffered rows, in order, into a new array of `size`."""
+        assert self._buffer is not None
+        rows = np.empty(size, dtype=self._buffer.dtype)
+
+        head, count = self._head, self._count
+        first = min(count, len(self._buffer) - head)
+        last = head + first
+        rest = count - first
+        rows[:first] = self._buffer[head:last]
+        rows[first:count] = self._buffer[:rest]
+        return rows
+
+    def _drain(self) -> np.ndarray:
+        """Remove every buffered row."""
+        rows = self._ordered(size=self._count)
+        self._head = 0
+        self._count = 0
+        self._cond.notify_all()
+        return rows
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._closing
+                        or self._count >= self.batch_size,
+                        timeout=self.flush_interval,
+                    )
+                    closing = self._closing
+                    rows = self._drain() if self._count else None
+
+                if rows is not None:
+                    self._write({name: rows[name] for name in self.fields})
+
+                if closing:
+                    return
+        except BaseException as error:
+            with self._cond:
+                self._error = error
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """Write all the buffered rows and stop the thread."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """Propagate an error raised while writing in the thread."""
+        if self._error is not None:
+            raise RuntimeError("Background writer failed.") from self._error
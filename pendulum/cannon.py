@@ -1,85 +1,295 @@
-from pyglet import clock, graphics, shapes
-from pymunk import Space, Vec2d
+import random
+from collections import deque
+
+import numpy as np
+from pyglet import gl, graphics, shapes
+from pymunk import ShapeFilter, Space, Vec2d
 
 from pendulum import settings as sett
 from pendulum.munk.entities import Circle
+from pendulum.munk.renderer import EntityRenderer
+from pendulum.utils import PointsGroup
+
+#: Collision category of the projectiles
+PROJECTILE_CATEGORY = 0b10
+
+#: Shapes the aim looks for: anything but the projectiles
+AIM_FILTER = ShapeFilter(mask=ShapeFilter.ALL_MASKS() ^ PROJECTILE_CATEGORY)
 
 
 class Aim:
-    """Estimate the trajectory of a projectile and draw a path."""
+    """Estimate the trajectory of a projectile and draw a path.
+
+    The whole path is computed at once and drawn as a single vertex list of
+    points, only when the aim changes. It stops where it first hits a shape
+    of the `space` (e.g. the pendulum or the cart), marking that point, as
+    of the last change.
+    """
 
     SPEED_RATE = 5  # Relation between mouse travel and speed.
 
     PATH_DOTS = int(sett.CLEAR_AIM_TIME / sett.SIMULATION_STEP)
 
+    #: Time (s) of each dot along the path
+    DOT_TIMES = np.arange(PATH_DOTS) * sett.SIMULATION_STEP
+
     DOT_COLOR = (255, 255, 0, 100)
-    DOT_RADIUS = 2
+    DOT_SIZE = 4  # px
+
+    HIT_COLOR = (255, 0, 0, 200)
+    HIT_RADIUS = 6
 
-    def __init__(self, x: int, y: int) -> None:
+    def __init__(
+        self, x: int, y: int, space: Space | None = None, radius: float = 0
+    ) -> None:
         self.initial_pos = Vec2d(x=x, y=y)
 
         self.velocity = Vec2d(0, 0)
 
-        self._batch = graphics.Batch()
-        self._dots = self._init_dots()
-
-    def _init_dots(self) -> list[shapes.Circle]:
-        dots = []
-        for _ in range(self.PATH_DOTS):
-            dot = shapes.Circle(
-                x=self.initial_pos.x,
-                y=self.initial_pos.y,
-                radius=self.DOT_RADIUS,
-                color=self.DOT_COLOR,
-                batch=self._batch,
-            )
-            dots.append(dot)
+        #: Where the path first hits a shape, if it does
+        self.hit: Vec2d | None = None
+        self._space = space
+        self._radius = radius
 
-        return dots
+        self._batch = graphics.Batch()
+        program = shapes.get_default_shader()
+        self._dots = program.vertex_list(
+            self.PATH_DOTS,
+            gl.GL_POINTS,
+            batch=self._batch,
+            group=PointsGroup(size=self.DOT_SIZE, program=program),
+            position=("f", (0.0, 0.0) * self.PATH_DOTS),
+            translation=("f", (x, y) * self.PATH_DOTS),
+            colors=("Bn", self.DOT_COLOR * self.PATH_DOTS),
+        )
+        self._hit_marker = shapes.Circle(
+            x=x,
+            y=y,
+            radius=self.HIT_RADIUS,
+            color=self.HIT_COLOR,
+            batch=self._batch,
+        )
+        self._hit_marker.visible = False
 
     def draw(self) -> None:
         self._batch.draw()
 
+    def delete(self) -> None:
+        """Release the vertex lists."""
+        self._dots.delete()
+        self._hit_marker.delete()
+
     def update(self, x: int, y: int) -> None:
         cur_pos = Vec2d(x=x, y=y)
-        self.velocity = (self.initial_pos - cur_pos) * self.SPEED_RATE
+        velocity = (self.initial_pos - cur_pos) * self.SPEED_RATE
+        if velocity == self.velocity:
+            return
+
+        self.velocity = velocity
         self._estimate_trajectory()
 
     def _estimate_trajectory(self) -> None:
         """Estimate the trajectory of the projectile."""
-        x_o, y_o = self.initial_pos.x, self.initial_pos.y
-        v_xo, v_yo = self.velocity.x, self.velocity.y
-        half_g = 0.5 * sett.GRAVITY[1]  # g already negative
+        t = self.DOT_TIMES
+        offsets = np.empty((self.PATH_DOTS, 2))
+        offsets[:, 0] = self.velocity.x * t
+        # Gravity is already negative
+        offsets[:, 1] = self.velocity.y * t + 0.5 * sett.GRAVITY[1] * t**2
+
+        hit_idx = self._find_hit(offsets=offsets)
+        if hit_idx is not None:
+            # Collapse the rest of the path into the hit.
+            offsets[hit_idx:] = offsets[hit_idx]
 
-        for n in range(self.PATH_DOTS):
-            t_step = n * sett.SIMULATION_STEP
-            x = x_o + v_xo * t_step
-            y = y_o + v_yo * t_step + half_g * (t_step**2)
+        self._dots.position[:] = offsets.ravel().tolist()
+
+    def _find_hit(self, offsets: np.ndarray) -> int | None:
+        """Index of the first dot whose path segment hits a shape."""
+        self.hit = None
+        self._hit_marker.visible = False
+        if self._space is None:
+            return None
+
+        x, y = self.initial_pos
+        points = (offsets + (x, y)).tolist()
+        for idx in range(1, self.PATH_DOTS):
+            info = self._space.segment_query_first(
+                points[idx - 1], points[idx], self._radius, AIM_FILTER
+            )
+            if info is not None:
+                self.hit = info.point
+                self._hit_marker.position = info.point
+                self._hit_marker.visible = True
+                offsets[idx] = info.point - self.initial_pos
+                return idx
 
-            self._dots[n].position = Vec2d(x=x, y=y)
+        return None
 
 
 class Cannon:
-    """Draw an estimation of the path of a projectile."""
+    """Fire projectiles, aimed by dragging the mouse.
+
+    Projectiles are pooled: instead of piling up in the space, they are
+    removed once their time to live expires or they leave the window, and
+    reused by the next shots. At most `MAX_PROJECTILES` are live at once,
+    firing more recycles the oldest ones. Released projectiles are hidden,
+    keeping their vertex list for the next shot.
+
+    With a `stress_rate`, projectiles are also fired automatically, from the
+    bottom left corner, to check how the simulation copes with many of them.
+    """
 
     PROJECTILE_MASS = 0.05
     PROJECTILE_RADIUS = 5
+    PROJECTILE_COLOR = 255, 0, 0, 255
+
+    #: Simulated time (s) before a projectile is removed
+    PROJECTILE_TTL = 10.0
+
+    #: Maximum number of projectiles in the space
+    MAX_PROJECTILES = 256
+
+    #: Simulated time (s) between checks for projectiles out of the window
+    CULL_INTERVAL = 0.1
+
+    #: Distance (mm) beyond the window edges before culling a projectile
+    CULL_MARGIN = 100
 
-    CLEAR_AIM_INTERVAL = sett.CLEAR_AIM_TIME * sett.SIMULATION_RATE
+    #: Speed range (mm/s) of the projectiles fired in stress mode
+    STRESS_SPEED = 1500, 3000
 
-    def __init__(self, space: Space) -> None:
+    def __init__(
+        self,
+        space: Space,
+        width: int = sett.WIDTH,
+        height: int = sett.HEIGHT,
+        stress_rate: float = 0.0,
+        renderer: EntityRenderer | None = None,
+    ) -> None:
         self._space = space
+        self._renderer = renderer
+        self._width = width
+        self._height = height
 
-        # TODO: Expire the circles after a certain amount of time
-        self._projectiles: list[Circle] = []
+        #: Projectiles in the space, oldest first, and when they expire
+        self._live: deque[tuple[float, Circle]] = deque()
+        self._free: list[Circle] = []
+
+        #: Simulated time (s) since the cannon was created
+        self._time = 0.0
+        self._next_cull = self.CULL_INTERVAL
+
+        #: Projectiles fired per (simulated) second in stress mode
+        self.stress_rate = stress_rate
+        self._stress_due = 0.0
+        self._random = random.Random(0)
 
         self._aim: Aim | None = None
+        #: Simulated time (s) left before clearing the aim, once fired
+        self._clear_aim_in: float | None = None
+
+    @property
+    def projectiles(self) -> int:
+        """Number of projectiles in the space."""
+        return len(self._live)
+
+    def step(self, dt: float) -> None:
+        """Advance the (simulated) time, removing expired projectiles.
+
+        The aim is also cleared, once its time expires.
+        """
+        self._time += dt
+        while self._live and self._live[0][0] <= self._time:
+            self._release(self._live.popleft()[1])
+
+        if self._time >= self._next_cull:
+            self._cull()
+            self._next_cull = self._time + self.CULL_INTERVAL
+
+        if self.stress_rate:
+            self._fire_stress(dt=dt)
+
+        if self._clear_aim_in is None:
+            return
+
+        self._clear_aim_in -= dt
+        if self._clear_aim_in <= 0:
+            self._clear_aim()
+
+    def _clear_aim(self) -> None:
+        if self._aim is not None:
+            self._aim.delete()
 
-    def _clear_aim(self, dt: int) -> None:
         self._aim = None
+        self._clear_aim_in = None
+
+    def launch(self, position: Vec2d, velocity: Vec2d) -> Circle:
+        """Add a projectile to the space, reusing a released one if any."""
+        if len(self._live) >= self.MAX_PROJECTILES:
+            self._release(self._live.popleft()[1])
+
+        if self._free:
+            projectile = self._free.pop()
+            self._space.add(projectile.body, projectile.shape)
+            projectile.visible = True
+        else:
+            projectile = Circle(
+                space=self._space,
+                mass=self.PROJECTILE_MASS,
+                radius=self.PROJECTILE_RADIUS,
+                color=self.PROJECTILE_COLOR,
+            )
+            projectile.shape.filter = ShapeFilter(
+                categories=PROJECTILE_CATEGORY
+            )
+            if self._renderer is not None:
+                self._renderer.add(projectile)
+
+        body = projectile.body
+        body.position = position
+        body.velocity = velocity
+        body.angle = 0.0
+        body.angular_velocity = 0.0
+        self._live.append((self._time + self.PROJECTILE_TTL, projectile))
+        return projectile
+
+    def _release(self, projectile: Circle) -> None:
+        self._space.remove(projectile.body, projectile.shape)
+        projectile.visible = False
+        self._free.append(projectile)
+
+    def _cull(self) -> None:
+        """Release the projectiles that left the window (by the margin)."""
+        margin = self.CULL_MARGIN
+        left, bottom = -margin, -margin
+        right, top = self._width + margin, self._height + margin
+
+        kept: deque[tuple[float, Circle]] = deque()
+        for expires, projectile in self._live:
+            x, y = projectile.body.position
+            if left <= x <= right and bottom <= y <= top:
+                kept.append((expires, projectile))
+            else:
+                self._release(projectile)
+
+        self._live = kept
+
+    def _fire_stress(self, dt: float) -> None:
+        self._stress_due += self.stress_rate * dt
+        while self._stress_due >= 1:
+            self._stress_due -= 1
+            speed = self._random.uniform(*self.STRESS_SPEED)
+            angle = self._random.uniform(20, 70)
+            self.launch(
+                position=Vec2d(self.CULL_MARGIN / 2, self.CULL_MARGIN / 2),
+                velocity=Vec2d(speed, 0).rotated_degrees(angle),
+            )
 
     def start(self, x: int, y: int) -> None:
-        self._aim = Aim(x=x, y=y)
+        self._clear_aim()
+        self._aim = Aim(
+            x=x, y=y, space=self._space, radius=self.PROJECTILE_RADIUS
+        )
 
     def aim(self, x: int, y: int) -> None:
         if self._aim:
@@ -89,17 +299,10 @@ class Cannon:
         if not self._aim:
             return
 
-        projectile = Circle(
-            space=self._space,
-            mass=self.PROJECTILE_MASS,
-            radius=self.PROJECTILE_RADIUS,
-            initial_pos=self._aim.initial_pos,
-            color=(255, 0, 0, 255),
+        self.launch(
+            position=self._aim.initial_pos, velocity=self._aim.velocity
         )
-        projectile.body.velocity = self._aim.velocity
-        self._projectiles.append(projectile)
-
-        clock.schedule_once(self._clear_aim, self.CLEAR_AIM_INTERVAL)
+        self._clear_aim_in = sett.CLEAR_AIM_TIME
 
     def draw(self):
         if self._aim is not None:
@@ -0,0 +1,351 @@
+"""Vectorized integration of the Cart Pendulum equations of motion.
+
+Instead of stepping one PyMunk space per pendulum, the closed-form equations
+derived in `pendulum.model` are integrated with a fixed-step RK4 for a whole
+batch of pendulums at once. They are written out by hand, in place, so steps
+don't allocate arrays (about twice as fast as the generated functions).
+
+The state of each pendulum is `[x, v, theta, omega]`, using the same units
+and conventions as `CartPendulumModel.output`.
+"""
+import math
+import time
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pendulum import settings as sett
+from pendulum.cart import lqr
+from pendulum.cart.controller import LQRController
+from pendulum.cart.model import CartPendulumModel
+from pendulum.cart.parameters import Parameters
+from pendulum.headless import RunSummary, StopCondition
+
+#: Gravity Acceleration (mm/s²)
+GRAVITY = -sett.GRAVITY[1]
+
+
+def initial_state(params: Parameters) -> tuple[float, float, float, float]:
+    """Initial `[x, v, theta, omega]` defined by the Parameters."""
+    return params.cart_x, params.cart_v, math.radians(params.angle), 0.0
+
+
+class AnalyticEnsemble:
+    """Batch of Cart Pendulums integrated with a fixed-step RK4.
+
+    Physical properties can either be scalars, shared by every pendulum, or
+    arrays with one value per pendulum. A gain `schedule` is shared by every
+    pendulum.
+
+    Friction and the rail ends are applied after each step, as velocity
+    corrections, similar to what the PyMunk joints do.
+    """
+
+    def __init__(
+        self,
+        states: npt.ArrayLike,
+        cart_mass: npt.ArrayLike,
+        circle_mass: npt.ArrayLike,
+        circle_length: npt.ArrayLike,
+        cart_friction: npt.ArrayLike = 0.0,
+        controller: bool = False,
+        dtype: npt.DTypeLike = np.float64,
+        width: int = sett.WIDTH,
+        schedule: lqr.GainSchedule | None = None,
+    ):
+        self.dtype = np.dtype(dtype)
+
+        # Stored transposed, so each variable is contiguous in memory.
+        self._y = np.array(states, dtype=self.dtype, ndmin=2).T.copy()
+        self.size = self._y.shape[1]
+
+        self.cart_mass = self._as_array(cart_mass)
+        self.circle_mass = self._as_array(circle_mass)
+        self.circle_length = self._as_array(circle_length)
+
+        # Same impulse clamp as the friction joint in `CartPendulumModel`.
+        friction = self._as_array(cart_friction)
+        self._max_friction = friction * sett.SIMULATION_STEP**2
+
+        self._ml = self.circle_mass * self.circle_length
+        self._weight = (self.cart_mass + self.circle_mass) * GRAVITY
+
+        self.rail_limit = width / 2 - CartPendulumModel.RAIL_OFFSET
+
+        self.controller = LQRController(
+            is_active=controller,
+            gains=self._controller_gains(),
+            schedule=schedule,
+        )
+
+        self.steps = 0
+        self.active = np.ones(self.size, dtype=bool)
+        self.stop_step = np.full(self.size, -1)
+        self._stop_index = np.full(self.size, -1)
+        self._condition_names: list[str] = []
+
+        self._k = np.empty((4, 4, self.size), dtype=self.dtype)
+        self._y_tmp = np.empty_like(self._y)
+        self._scratch = np.empty((4, self.size), dtype=self.dtype)
+        self._output = np.empty_like(self._y)
+
+    @classmethod
+    def from_parameters(
+        cls,
+        params: Parameters,
+        states: npt.ArrayLike | None = None,
+        **kwargs,
+    ) -> "AnalyticEnsemble":
+        """Ensemble sharing the same Parameters.
+
+        If `states` is not provided, a single pendulum is created with the
+        initial conditions of the Parameters.
+        """
+        if states is None:
+            states = [initial_state(params=params)]
+
+        return cls(
+            states=states,
+            cart_mass=params.cart_mass,
+            circle_mass=params.circle_mass,
+            circle_length=params.circle_length,
+            cart_friction=params.cart_friction or 0.0,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_parameter_list(
+        cls, params: Sequence[Parameters], **kwargs
+    ) -> "AnalyticEnsemble":
+        """Ensemble with one pendulum per Parameters."""
+        return cls(
+            states=[initial_state(params=p) for p in params],
+            cart_mass=[p.cart_mass for p in params],
+            circle_mass=[p.circle_mass for p in params],
+            circle_length=[p.circle_length for p in params],
+            cart_friction=[p.cart_friction or 0.0 for p in params],
+            **kwargs,
+        )
+
+    def _controller_gains(self) -> np.ndarray:
+        """LQR gains synthesized for each pendulum (or shared by all)."""
+        properties = (self.cart_mass, self.circle_mass, self.circle_length)
+        if not any(array.ndim for array in properties):
+            return lqr.cached_gains(*(float(array) for array in properties))
+
+        rows = np.broadcast_arrays(*properties)
+        # Synthesized once per distinct combination (see `lqr.cached_gains`)
+        return np.array(
+            [
+                lqr.cached_gains(*row)
+                for row in zip(*(array.tolist() for array in rows))
+            ]
+        )
+
+    def _as_array(self, value: npt.ArrayLike) -> np.ndarray:
+        array = np.asarray(value, dtype=self.dtype)
+        if array.ndim and array.shape != (self.size,):
+            raise ValueError(
+                f"Expected {self.size} values, got {array.shape}."
+            )
+
+        return array
+
+    @property
+    def states(self) -> np.ndarray:
+        """(N, 4) view of the `[x, v, theta, omega]` of every pendulum."""
+        return self._y.T
+
+    @property
+    def cart_x(self) -> np.ndarray:
+        return self._y[0]
+
+    @property
+    def cart_velocity(self) -> np.ndarray:
+        return self._y[1]
+
+    @property
+    def angle(self) -> np.ndarray:
+        """Angle (rad) wrapped to [0, 2π), as `CartPendulumModel.angle`."""
+        return np.mod(self._y[2], 2 * np.pi)
+
+    @property
+    def angular_velocity(self) -> np.ndarray:
+        return self._y[3]
+
+    @property
+    def output(self) -> np.ndarray:
+        """(N, 4) array with the output variables of every pendulum."""
+        output = self._y.copy()
+        np.mod(output[2], 2 * np.pi, out=output[2])
+        return output.T
+
+    @property
+    def elapsed(self) -> float:
+        """Simulated time (s) since the beginning of the simulation."""
+        return self.steps * sett.SIMULATION_STEP
+
+    @property
+    def stop_reasons(self) -> list[str | None]:
+        """Name of the condition that stopped each pendulum, if any."""
+        return [
+            self._condition_names[idx] if idx >= 0 else None
+            for idx in self._stop_index
+        ]
+
+    def derivatives(
+        self, y: np.ndarray, force: np.ndarray, out: np.ndarray
+    ) -> np.ndarray:
+        """Evaluate the equations of motion for the (4, N) state `y`.
+
+        `force` is the horizontal force (mN) applied on each cart.
+        """
+        _, v, theta, omega = y
+        m, M, length = self.circle_mass, self.cart_mass, self.circle_length
+        sin, cos, den, tmp = self._scratch
+
+        np.sin(theta, out=sin)
+        np.cos(theta, out=cos)
+
+        # den = M + m * sin²
+        np.multiply(sin, sin, out=den)
+        den *= m
+        den += M
+
+        out[0] = v
+        out[2] = omega
+
+        # x_ddot = (m * sin * (l * omega² + g * cos) + F) / den
+        acc = out[1]
+        np.multiply(omega, omega, out=acc)
+        acc *= length
+        np.multiply(cos, GRAVITY, out=tmp)
+        acc += tmp
+        acc *= sin
+        acc *= m
+        acc += force
+        acc /= den
+
+        # theta_ddot = -(sin * (m * l * cos * omega² + (M + m) * g) +
+        #               F * cos) / (l * den)
+        acc = out[3]
+        np.multiply(omega, omega, out=acc)
+        acc *= cos
+        acc *= self._ml
+        acc += self._weight
+        acc *= sin
+        np.multiply(force, cos, out=tmp)
+        acc += tmp
+        acc /= den
+        acc /= length
+        np.negative(acc, out=acc)
+        return out
+
+    def step(self) -> None:
+        """Advance every active pendulum by a single `SIMULATION_STEP`."""
+        dt = sett.SIMULATION_STEP
+        y, y_tmp, k = self._y, self._y_tmp, self._k
+
+        output = self._output
+        np.copyto(output, y)
+        np.mod(y[2], 2 * np.pi, out=output[2])
+        force = self.controller.step_batch(output.T)
+        force /= dt
+
+        self.derivatives(y, force, out=k[0])
+        np.multiply(k[0], dt / 2, out=y_tmp)
+        y_tmp += y
+        self.derivatives(y_tmp, force, out=k[1])
+        np.multiply(k[1], dt / 2, out=y_tmp)
+        y_tmp += y
+        self.derivatives(y_tmp, force, out=k[2])
+        np.multiply(k[2], dt, out=y_tmp)
+        y_tmp += y
+        self.derivatives(y_tmp, force, out=k[3])
+
+        # y_tmp = y + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        k[1] += k[2]
+        k[1] *= 2
+        k[1] += k[0]
+        k[1] += k[3]
+        np.multiply(k[1], dt / 6, out=y_tmp)
+        y_tmp += y
+
+        if self._max_friction.any():
+            self._apply_friction(y_tmp)
+        self._apply_rails(y_tmp)
+
+        np.copyto(y, y_tmp, where=self.active)
+        self.steps += 1
+
+    def _apply_impulse(self, y: np.ndarray, impulse: np.ndarray) -> None:
+        """Apply an horizontal impulse (mN.s) on the carts of the state `y`.
+
+        Since the pendulum is attached to the cart, the impulse also changes
+        its angular velocity.
+        """
+        theta = y[2]
+        den = self.cart_mass + self.circle_mass * np.sin(theta) ** 2
+        y[1] += impulse / den
+        y[3] -= impulse * np.cos(theta) / (self.circle_length * den)
+
+    def _apply_friction(self, y: np.ndarray) -> None:
+        """Oppose the cart motion, up to the maximum friction impulse."""
+        v = y[1]
+        den = self.cart_mass + self.circle_mass * np.sin(y[2]) ** 2
+        impulse = np.minimum(np.abs(v) * den, self._max_friction)
+        self._apply_impulse(y, impulse=-np.sign(v) * impulse)
+
+    def _apply_rails(self, y: np.ndarray) -> None:
+        """Stop the carts that went past the end of the rails."""
+        x, v = y[0], y[1]
+        outside = np.abs(x) > self.rail_limit
+        if not outside.any():
+            return
+
+        np.clip(x, -self.rail_limit, self.rail_limit, out=x)
+        den = self.cart_mass + self.circle_mass * np.sin(y[2]) ** 2
+        self._apply_impulse(y, impulse=np.where(outside, -v * den, 0.0))
+
+    def check_conditions(self, conditions: dict[str, StopCondition]) -> None:
+        """Deactivate the pendulums that met one of the `conditions`."""
+        for name, condition in conditions.items():
+            if name not in self._condition_names:
+                self._condition_names.append(name)
+
+            met = condition(self) & self.active
+            if not met.any():
+                continue
+
+            self._stop_index[met] = self._condition_names.index(name)
+            self.stop_step[met] = self.steps
+            self.active &= ~met
+
+    def run(
+        self,
+        duration: float,
+        conditions: dict[str, StopCondition] | None = None,
+    ) -> RunSummary:
+        """Step the ensemble for `duration` (simulated) seconds.
+
+        Stops early if every pendulum met one of the `conditions`. The
+        summary only reports a stop reason if all pendulums share the same.
+        """
+        conditions = conditions or {}
+        total_steps = self.steps + round(duration / sett.SIMULATION_STEP)
+
+        start = time.perf_counter()
+        while self.steps < total_steps and self.active.any():
+            self.step()
+            self.check_conditions(conditions=conditions)
+
+        wall_time = time.perf_counter() - start
+
+        reasons = set(self.stop_reasons)
+        return RunSummary(
+            steps=self.steps,
+            sim_time=self.elapsed,
+            wall_time=wall_time,
+            stop_reason=reasons.pop() if len(reasons) == 1 else None,
+        )
@@ -1,11 +1,74 @@
 """Cart Pendulum Simulator CLI."""
+import math
+import time
+from functools import partial
+from pathlib import Path
+
 import click
-import pyglet
 
+from pendulum import settings as sett
 from pendulum.cart.parameters import Parameters
-from pendulum.cart.plot import plot_recording
-from pendulum.cart.simulator import CartPendulumSim
-from pendulum.recorder import prompt_recording
+from pendulum.lazy import LazyChoice
+
+
+def load_parameters(params: str) -> Parameters | None:
+    """Load Parameters file, listing the available ones if not found."""
+    try:
+        return Parameters.load_from_file(filename=params)
+    except FileNotFoundError:
+        click.secho(f"Parameters '{params}' not found.", fg="bright_red")
+        click.echo("\n".join((f" - {p}" for p in Parameters.available())))
+        return None
+
+
+def find_checkpoints(path: Path):
+    """Open a checkpoint file, also looking in the recordings directory."""
+    from pendulum.checkpoint import CheckpointFile
+
+    for candidate in (path, sett.REC_PATH / path):
+        if not candidate.is_file():
+            continue
+
+        checkpoints = CheckpointFile(path=candidate)
+        if not checkpoints.index:
+            raise click.UsageError(f"Checkpoints '{path}' are empty.")
+
+        return checkpoints
+
+    raise click.UsageError(f"Checkpoints '{path}' not found.")
+
+
+def echo_state(sim) -> None:
+    """Print the state of a Headless Simulation."""
+    model = sim.model
+    click.secho(f"State at {sim.elapsed:.3f} s", fg="green")
+    click.echo(f" - Angle: {math.degrees(model.angle):.3f} deg")
+    click.echo(f" - Angular Velocity: {model.angular_velocity:.4f} rad/s")
+    click.echo(f" - Cart X: {model.cart_x:.3f} mm")
+    click.echo(f" - Cart Velocity: {model.cart_velocity:.3f} mm/s")
+
+
+CHECKPOINT_EVERY = click.option(
+    "-k",
+    "--checkpoint-every",
+    type=float,
+    help="Save a snapshot every this many (simulated) seconds, to seek and "
+    "branch from.",
+)
+
+GAIN_SCHEDULE = click.option(
+    "-G",
+    "--gain-schedule",
+    is_flag=True,
+    help="Interpolate Controller gains synthesized about several angles.",
+)
+
+AT = click.option(
+    "--at",
+    type=click.FloatRange(min=0),
+    required=True,
+    help="Simulated time (s) to seek to.",
+)
 
 
 @click.group()
@@ -19,13 +82,59 @@ def cart():
 @click.option("-g", "--grid", is_flag=True, help="Display Grid.")
 @click.option("-p", "--params", default="rest_bottom", help="Parameters File.")
 @click.option("-r", "--record", is_flag=True, help="Record simulation data.")
-def run(controller: bool, export: bool, grid: bool, params: str, record: bool):
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+@click.option(
+    "-t",
+    "--time-factor",
+    type=float,
+    default=sett.TIME_FACTOR,
+    help="Simulated time per real time ('inf' for full speed). Change it "
+    "while running with '[' and ']'.",
+)
+@click.option(
+    "-T",
+    "--timings",
+    is_flag=True,
+    help="Time each phase of the loop, saving the stats on exit. Toggle "
+    "the overlay with 'T'.",
+)
+@click.option(
+    "-S",
+    "--stress",
+    "stress_rate",
+    type=float,
+    default=0.0,
+    help="Fire this many projectiles per (simulated) second.",
+)
+@CHECKPOINT_EVERY
+@GAIN_SCHEDULE
+def run(
+    controller: bool,
+    export: bool,
+    grid: bool,
+    params: str,
+    record: bool,
+    rec_format: str,
+    time_factor: float,
+    timings: bool,
+    stress_rate: float,
+    checkpoint_every: float | None,
+    gain_schedule: bool,
+):
     """Run the simulation."""
-    try:
-        sim_params = Parameters.load_from_file(filename=params)
-    except FileNotFoundError:
-        click.secho(f"Parameters '{params}' not found.", fg="bright_red")
-        click.echo("\n".join((f" - {p}" for p in Parameters.available())))
+    # Importing pyglet windows requires a display.
+    import pyglet
+
+    from pendulum.cart.simulator import CartPendulumSim
+
+    sim_params = load_parameters(params=params)
+    if sim_params is None:
         return
 
     CartPendulumSim(
@@ -34,14 +143,405 @@ def run(controller: bool, export: bool, grid: bool, params: str, record: bool):
         grid=grid,
         controller=controller,
         params=sim_params,
+        rec_format=rec_format,
+        time_factor=time_factor,
+        timings=timings,
+        stress_rate=stress_rate,
+        checkpoint_every=checkpoint_every,
+        gain_schedule=gain_schedule,
     )
     pyglet.app.run()
 
 
+@cart.command()
+@click.option("-C", "--controller", is_flag=True, help="Engage Controller.")
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=60.0,
+    help="Simulated time (s).",
+)
+@click.option(
+    "-E",
+    "--engine",
+    type=click.Choice(["pymunk", "analytic"]),
+    default="pymunk",
+    help="Simulation engine.",
+)
+@click.option(
+    "-L", "--latency", is_flag=True, help="Report Controller latency."
+)
+@click.option("-p", "--params", default="rest_bottom", help="Parameters File.")
+@click.option("-r", "--record", is_flag=True, help="Record simulation data.")
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+@click.option(
+    "-s",
+    "--stop",
+    type=LazyChoice("pendulum.cart.headless:STOP_CONDITIONS"),
+    multiple=True,
+    help="Stop early when the condition is met.",
+)
+@CHECKPOINT_EVERY
+@GAIN_SCHEDULE
+def simulate(
+    controller: bool,
+    duration: float,
+    engine: str,
+    latency: bool,
+    params: str,
+    record: bool,
+    rec_format: str,
+    stop: tuple[str, ...],
+    checkpoint_every: float | None,
+    gain_schedule: bool,
+):
+    """Run the simulation without a window, as fast as possible."""
+    from pendulum.cart import lqr
+    from pendulum.cart.analytic import AnalyticEnsemble
+    from pendulum.cart.headless import STOP_CONDITIONS, CartPendulumHeadless
+
+    sim_params = load_parameters(params=params)
+    if sim_params is None:
+        return
+
+    if engine == "analytic":
+        if record or checkpoint_every:
+            raise click.UsageError(
+                "Analytic engine can't record data nor save snapshots."
+            )
+
+        schedule = (
+            lqr.GainSchedule.synthesize(params=sim_params)
+            if gain_schedule
+            else None
+        )
+        sim = AnalyticEnsemble.from_parameters(
+            params=sim_params, controller=controller, schedule=schedule
+        )
+        conditions = {name: STOP_CONDITIONS[name] for name in stop}
+        run = partial(sim.run, duration=duration, conditions=conditions)
+    else:
+        sim = CartPendulumHeadless(
+            record=record,
+            controller=controller,
+            params=sim_params,
+            rec_format=rec_format,
+            checkpoint_every=checkpoint_every,
+            gain_schedule=gain_schedule,
+        )
+        for name in stop:
+            sim.add_condition(name=name, condition=STOP_CONDITIONS[name])
+
+        run = partial(sim.run, duration=duration)
+
+    stats = sim.controller.measure_latency() if latency else None
+    run().echo()
+    if stats:
+        stats.echo(name="Controller", budget=sett.SIMULATION_STEP)
+
+
+@cart.command()
+@click.argument("checkpoints", type=click.Path(path_type=Path))
+@AT
+def seek(checkpoints: Path, at: float):
+    """Restore the state at a time of a run saved with snapshots.
+
+    CHECKPOINTS is a path or the name of a file in the recordings directory.
+    Only the steps since the nearest snapshot are simulated.
+    """
+    from pendulum.cart.headless import CartPendulumHeadless
+
+    start = time.perf_counter()
+    sim = CartPendulumHeadless.from_checkpoint(
+        checkpoints=find_checkpoints(path=checkpoints), at=at
+    )
+    wall_time = time.perf_counter() - start
+
+    echo_state(sim=sim)
+    click.echo(f" - Seek Time: {wall_time * 1000:.1f} ms")
+
+
+@cart.command()
+@click.argument("checkpoints", type=click.Path(path_type=Path))
+@AT
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=10.0,
+    help="Simulated time (s) after the branching point.",
+)
+@click.option(
+    "--controller/--no-controller",
+    default=None,
+    help="Engage or disengage the Controller (as saved by default).",
+)
+@click.option(
+    "--kick",
+    type=float,
+    default=0.0,
+    help="Horizontal impulse applied to the cart when branching.",
+)
+@click.option("-r", "--record", is_flag=True, help="Record simulation data.")
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+@click.option(
+    "-s",
+    "--stop",
+    type=LazyChoice("pendulum.cart.headless:STOP_CONDITIONS"),
+    multiple=True,
+    help="Stop early when the condition is met.",
+)
+def branch(
+    checkpoints: Path,
+    at: float,
+    duration: float,
+    controller: bool | None,
+    kick: float,
+    record: bool,
+    rec_format: str,
+    stop: tuple[str, ...],
+):
+    """Run a variation of a run saved with snapshots, from a time of it.
+
+    CHECKPOINTS is a path or the name of a file in the recordings directory.
+    """
+    from pymunk import Vec2d
+
+    from pendulum.cart.headless import STOP_CONDITIONS, CartPendulumHeadless
+
+    sim = CartPendulumHeadless.from_checkpoint(
+        checkpoints=find_checkpoints(path=checkpoints),
+        at=at,
+        controller=controller,
+        record=record,
+        rec_format=rec_format,
+    )
+    for name in stop:
+        sim.add_condition(name=name, condition=STOP_CONDITIONS[name])
+
+    echo_state(sim=sim)
+    if kick:
+        sim.model.apply_impulse(impulse=Vec2d(kick, 0))
+
+    sim.run(duration=duration).echo()
+    echo_state(sim=sim)
+
+
+@cart.command()
+@click.argument("spec_path", type=click.Path(exists=True, path_type=Path))
+@click.option("-n", "--name", help="Results name. Defaults to the spec name.")
+@click.option("-w", "--workers", type=int, help="Number of processes.")
+def sweep(spec_path: Path, name: str | None, workers: int | None):
+    """Run a parameter sweep, resuming it if interrupted.
+
+    SPEC_PATH is a JSON file with the base `params`, the `duration`, whether
+    the `controller` is engaged, the `stop` conditions and the `grid` of
+    values of each swept parameter, either a list or a range:
+
+    {"angle": [175, 180], "cart_mass": {"start": 0.1, "stop": 0.5, "num": 5}}
+    """
+    from pendulum.cart.sweep import Sweep, SweepSpec
+
+    spec = SweepSpec.load_from_file(path=spec_path)
+    if load_parameters(params=spec.params) is None:
+        return
+
+    Sweep(spec=spec, name=name or spec_path.stem).run(workers=workers)
+
+
+@cart.command()
+@click.argument(
+    "plane", type=LazyChoice("pendulum.cart.roa:PLANES"), default="angle"
+)
+@click.option("-p", "--params", default="rest_top", help="Parameters File.")
+@click.option(
+    "-x",
+    "--x-range",
+    type=(float, float),
+    help="Range of the first variable of the plane (angles in degrees).",
+)
+@click.option(
+    "-y", "--y-range", type=(float, float), help="Range of the second one."
+)
+@click.option("-g", "--grid", type=int, default=8, help="Coarse grid cells.")
+@click.option("-l", "--levels", type=int, default=4, help="Refinement levels.")
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=10.0,
+    help="Simulated time (s) before a run is undecided.",
+)
+@click.option(
+    "-E",
+    "--engine",
+    type=click.Choice(["analytic", "pymunk"]),
+    default="analytic",
+    help="Simulation engine.",
+)
+@GAIN_SCHEDULE
+@click.option("-w", "--workers", type=int, help="Number of processes.")
+@click.option("-n", "--name", help="Results name.")
+@click.option("-H", "--height", type=int, default=1080, help="Plot Height.")
+@click.option("-W", "--width", type=int, default=1080, help="Plot Width.")
+def roa(
+    plane: str,
+    params: str,
+    x_range: tuple[float, float] | None,
+    y_range: tuple[float, float] | None,
+    grid: int,
+    levels: int,
+    duration: float,
+    engine: str,
+    gain_schedule: bool,
+    workers: int | None,
+    name: str | None,
+    height: int,
+    width: int,
+):
+    """Map the Region of Attraction of the Controller.
+
+    Initial states on the PLANE ('angle': angle and angular velocity, or
+    'cart': position and velocity) are classified on a coarse grid, only
+    refining the cells whose corners disagree. Saves the classified points
+    and a heatmap.
+    """
+    from pendulum.cart.roa import Plane, RegionOfAttraction
+
+    sim_params = load_parameters(params=params)
+    if sim_params is None:
+        return
+
+    region = RegionOfAttraction(
+        params=sim_params,
+        plane=Plane.from_name(name=plane, x_range=x_range, y_range=y_range),
+        grid=grid,
+        levels=levels,
+        duration=duration,
+        engine=engine,
+        gain_schedule=gain_schedule,
+    )
+    region.run(workers=workers)
+    region.echo()
+
+    default_name = f"{params}_{plane}_{engine}"
+    if gain_schedule:
+        default_name += "_scheduled"
+    out_path = sett.ensure_path(sett.ROA_PATH) / (name or default_name)
+    points_path = out_path.with_suffix(".csv")
+    region.save_points(path=points_path)
+    plot_path = out_path.with_suffix(".png")
+    region.plot(path=plot_path, width=width, height=height)
+    click.secho(f"Points: '{points_path}'", fg="green")
+    click.secho(f"Heatmap: '{plot_path}'", fg="green")
+
+
 @cart.command()
 @click.option("-H", "--height", type=int, default=1080, help="Plot Height.")
 @click.option("-W", "--width", type=int, default=1920, help="Plot Width.")
-def plot(height: int, width: int):
+@click.option(
+    "--from", "start", type=float, help="Plot from this time (s) onwards."
+)
+@click.option("--to", "stop", type=float, help="Plot up to this time (s).")
+def plot(height: int, width: int, start: float | None, stop: float | None):
     """Plot Recording data."""
+    from pendulum.cart.plot import plot_recording
+    from pendulum.recorder import prompt_recording
+
     rec_path = prompt_recording(prefix="cart")
-    plot_recording(path=rec_path, height=height, width=width)
+    plot_recording(
+        path=rec_path, height=height, width=width, start=start, stop=stop
+    )
+
+
+@cart.command(name="replay-video")
+@click.argument("recording", type=click.Path(path_type=Path), required=False)
+@click.option("-f", "--fps", type=int, default=60, help="Frames per second.")
+@click.option(
+    "-H", "--height", type=int, default=sett.HEIGHT, help="Video Height."
+)
+@click.option(
+    "-W", "--width", type=int, default=sett.WIDTH, help="Video Width."
+)
+@click.option(
+    "-p",
+    "--params",
+    help="Parameters File (by default, the ones in the catalog).",
+)
+@click.option(
+    "--from", "start", type=float, help="Replay from this time (s) onwards."
+)
+@click.option("--to", "stop", type=float, help="Replay up to this time (s).")
+@click.option(
+    "--preset",
+    type=LazyChoice("pendulum.render:PRESETS"),
+    default="veryfast",
+    help="Encoding preset (faster ones produce larger files).",
+)
+def replay_video(
+    recording: Path | None,
+    fps: int,
+    height: int,
+    width: int,
+    params: str | None,
+    start: float | None,
+    stop: float | None,
+    preset: str,
+):
+    """Render a Recording into a video, without a window.
+
+    RECORDING is a path or the name of a file in the recordings directory.
+    If not set, it's prompted from the available ones.
+    """
+    from pendulum.cart.replay import recording_parameters, render_replay
+    from pendulum.recorder import prompt_recording
+
+    if recording is None:
+        rec_path = prompt_recording(prefix="cart")
+    elif recording.exists():
+        rec_path = recording
+    elif (sett.REC_PATH / recording).exists():
+        rec_path = sett.REC_PATH / recording
+    else:
+        raise click.UsageError(f"Recording '{recording}' not found.")
+
+    sim_params = (
+        load_parameters(params=params)
+        if params
+        else recording_parameters(path=rec_path)
+    )
+    if sim_params is None:
+        if params:
+            return
+
+        click.secho(
+            "Parameters not in the catalog. Using defaults.", fg="yellow"
+        )
+        sim_params = Parameters.load_from_file(filename="rest_bottom")
+
+    out_path = sett.ensure_path(sett.GIF_EXPORT_PATH) / f"{rec_path.stem}.mp4"
+    click.secho(f"Rendering replay to '{out_path}'...", fg="bright_green")
+    render_replay(
+        path=rec_path,
+        out_path=out_path,
+        params=sim_params,
+        fps=fps,
+        width=width,
+        height=height,
+        start=start,
+        stop=stop,
+        preset=preset,
+    )
@@ -1,27 +1,172 @@
+import time
+
 import numpy as np
+import numpy.typing as npt
 from pymunk import Vec2d
 
 import pendulum.settings as sett
+from pendulum.cart import lqr
+from pendulum.cart.parameters import Parameters
+from pendulum.timing import LatencyStats
 
 
 class LQRController:
+    """Compute the impulses that balance the Pendulum on the Cart.
+
+    Neither `step` (plain float arithmetic) nor `step_batch` (preallocated
+    buffers) allocate arrays in the simulation loop. Call durations are
+    recorded into `latency`, once enabled with `measure_latency`.
 
-    K_MATRIX = np.loadtxt("pendulum/cart/lqr_params.csv")
+    `gains` is either a single row of 4 gains, or one row per cart of the
+    batches given to `step_batch` (e.g. for ensembles with varied masses).
+
+    With a `schedule`, gains are interpolated at the current angle of each
+    pendulum instead (see `lqr.GainSchedule`).
+    """
 
     SET_POINT = np.array([0.0, 0.0, np.pi, 0.0])
 
-    def __init__(self, is_active: bool) -> None:
+    def __init__(
+        self,
+        is_active: bool,
+        gains: npt.ArrayLike,
+        schedule: lqr.GainSchedule | None = None,
+    ) -> None:
         self.is_active = is_active
+        self.schedule = schedule
+        self.latency: LatencyStats | None = None
+
+        self.k_matrix = np.array(gains, dtype=float)
+        if self.k_matrix.shape[-1] != len(self.SET_POINT):
+            raise ValueError(f"Invalid gains shape {self.k_matrix.shape}.")
+
+        # K @ (state - SET_POINT) == K @ state - K @ SET_POINT
+        self._offsets = self.k_matrix @ self.SET_POINT
+        self._gains: tuple[float, ...] | None = None
+        self._offset = 0.0
+        if self.k_matrix.ndim == 1:
+            self._gains = tuple(float(k) for k in self.k_matrix)
+            self._offset = float(self._offsets)
+
+        self._batch_gains: dict[np.dtype, np.ndarray] = {}
+        self._batch_out: np.ndarray | None = None
+
+    @classmethod
+    def from_parameters(
+        cls,
+        is_active: bool,
+        params: Parameters,
+        gain_schedule: bool = False,
+    ) -> "LQRController":
+        """Controller with the gains synthesized for the Parameters.
+
+        With `gain_schedule`, also synthesized about the `SCHEDULE_ANGLES`.
+        """
+        schedule = (
+            lqr.GainSchedule.synthesize(params=params)
+            if gain_schedule
+            else None
+        )
+        return cls(
+            is_active=is_active,
+            gains=lqr.gains_for(params),
+            schedule=schedule,
+        )
+
+    def __getstate__(self) -> dict:
+        # Latency stats belong to the run, not to the state of the controller.
+        state = self.__dict__.copy()
+        state["latency"] = None
+        return state
+
+    def measure_latency(self) -> LatencyStats:
+        """Start recording the duration of every call."""
+        self.latency = LatencyStats()
+        return self.latency
+
+    def impulse(self, x, v, theta, omega) -> float:
+        """Return the impulse (mN⋅s) to apply to the cart, along the rails."""
+        if not self.is_active:
+            return 0.0
+
+        if self.schedule is not None:
+            k_x, k_v, k_theta, k_omega = self.schedule.gains_at(theta)
+            force = k_x * x + k_v * v + k_theta * (theta - np.pi)
+            return (force + k_omega * omega) * sett.SIMULATION_STEP
+
+        if self._gains is None:
+            raise ValueError("Gains are per cart, use `step_batch`.")
+
+        k_x, k_v, k_theta, k_omega = self._gains
+        force = k_x * x + k_v * v + k_theta * theta + k_omega * omega
+        return (force - self._offset) * sett.SIMULATION_STEP
 
     def step(self, x, v, theta, omega) -> Vec2d:
         """Return the impulse to apply to the cart.
 
         Force should be in mN.
         """
+        if self.latency is None:
+            return Vec2d(self.impulse(x, v, theta, omega), 0.0)
+
+        start = time.perf_counter_ns()
+        impulse = self.impulse(x, v, theta, omega)
+        self.latency.record(time.perf_counter_ns() - start)
+        return Vec2d(impulse, 0.0)
+
+    def _batch_buffer(self, size: int, dtype: np.dtype) -> np.ndarray:
+        out = self._batch_out
+        if out is None or len(out) != size or out.dtype != dtype:
+            out = self._batch_out = np.empty(size, dtype=dtype)
+
+        return out
+
+    def compute_batch(self, states: np.ndarray, out: np.ndarray) -> None:
+        """Write the impulses for a batch of carts into `out`."""
         if not self.is_active:
-            return Vec2d(0.0, 0.0)
+            out[:] = 0.0
+            return
+
+        if self.schedule is not None:
+            # Scheduled gains change every step, so this one allocates.
+            gains = self.schedule.batch_gains(states[:, 2])
+            deviation = states - self.SET_POINT.astype(states.dtype)
+            np.einsum(
+                "ij,ij->i", deviation, gains.astype(states.dtype), out=out
+            )
+            out *= sett.SIMULATION_STEP
+            return
+
+        if states.dtype not in self._batch_gains:
+            gains = self.k_matrix.astype(states.dtype)
+            self._batch_gains[states.dtype] = gains
+
+        gains = self._batch_gains[states.dtype]
+        if gains.ndim == 1:
+            np.dot(states, gains, out=out)
+            out -= self._offset
+        else:
+            np.einsum("ij,ij->i", states, gains, out=out)
+            out -= self._offsets
+        out *= sett.SIMULATION_STEP
+
+    def step_batch(
+        self, states: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Return the impulses to apply to a batch of carts.
+
+        `states` is a (N, 4) array, where each row is `[x, v, theta, omega]`.
+        Impulses are written into `out`, if provided, or into a buffer
+        reused (and overwritten) by the next call.
+        """
+        if out is None:
+            out = self._batch_buffer(size=len(states), dtype=states.dtype)
+
+        if self.latency is None:
+            self.compute_batch(states=states, out=out)
+            return out
 
-        state = np.array([x, v, theta, omega])
-        x_impulse = self.K_MATRIX @ (state - self.SET_POINT)
-        x_impulse = x_impulse * sett.SIMULATION_STEP
-        return Vec2d(x_impulse, 0.0)
+        start = time.perf_counter_ns()
+        self.compute_batch(states=states, out=out)
+        self.latency.record(time.perf_counter_ns() - start)
+        return out
@@ -0,0 +1,144 @@
+"""Headless simulation of a Pendulum attached to a moving Cart."""
+import math
+
+import numpy as np
+
+from pendulum import checkpoint, settings as sett
+from pendulum.cart.controller import LQRController
+from pendulum.cart.model import CartPendulumModel
+from pendulum.cart.parameters import Parameters
+from pendulum.checkpoint import CheckpointFile
+from pendulum.headless import HeadlessSimulation, StopCondition
+
+#: Maximum deviation (rad) from the inverted position to be considered upright
+UPRIGHT_ANGLE = math.radians(1)
+
+#: Maximum angular velocity (rad/s) to be considered upright
+UPRIGHT_OMEGA = 0.05
+
+#: Angular velocity (rad/s) above which the simulation is considered unstable
+DIVERGED_OMEGA = 100.0
+
+#: Distance (mm) from the end of the rails considered as a hit
+RAIL_TOLERANCE = 1.0
+
+
+# NOTE: Conditions are written with NumPy operators so they can be evaluated
+# on a single model as well as on a whole `AnalyticEnsemble`.
+
+
+def is_upright(model: CartPendulumModel) -> bool:
+    """Pendulum is (almost) stopped at the inverted position."""
+    return (np.abs(model.angle - np.pi) < UPRIGHT_ANGLE) & (
+        np.abs(model.angular_velocity) < UPRIGHT_OMEGA
+    )
+
+
+def has_diverged(model: CartPendulumModel) -> bool:
+    """Model state is no longer finite or the pendulum is spinning away."""
+    finite = np.isfinite(model.output).all(axis=-1)
+    return ~finite | (np.abs(model.angular_velocity) > DIVERGED_OMEGA)
+
+
+def hit_rail(model: CartPendulumModel) -> bool:
+    """Cart reached one of the ends of the rails."""
+    return np.abs(model.cart_x) >= model.rail_limit - RAIL_TOLERANCE
+
+
+#: Stop Conditions available through the CLI
+STOP_CONDITIONS: dict[str, StopCondition] = {
+    "upright": is_upright,
+    "diverged": has_diverged,
+    "rail": hit_rail,
+}
+
+
+class CartPendulumHeadless(HeadlessSimulation):
+    """Cart Pendulum simulation stepped without a window."""
+
+    REC_PREFIX = "cart"
+    REC_FIELDS = (
+        "angle",
+        "angular_velocity",
+        "cart_friction",
+        "cart_x",
+        "cart_velocity",
+        "impulse",
+    )
+    STATE_ATTRS = ("space", "model", "controller")
+
+    def __init__(
+        self,
+        record: bool,
+        controller: bool,
+        params: Parameters,
+        rec_format: str = "csv",
+        checkpoint_every: float | None = None,
+        gain_schedule: bool = False,
+    ):
+        super().__init__(
+            record=record,
+            rec_format=rec_format,
+            checkpoint_every=checkpoint_every,
+        )
+
+        self.controller = LQRController.from_parameters(
+            is_active=controller, params=params, gain_schedule=gain_schedule
+        )
+        if self.recorder:
+            self.recorder.describe(controller=controller, params=params)
+
+        self.model = CartPendulumModel(
+            space=self.space, params=params, width=self.width
+        )
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        checkpoints: CheckpointFile,
+        at: float,
+        controller: bool | None = None,
+        record: bool = False,
+        rec_format: str = "csv",
+    ) -> "CartPendulumHeadless":
+        """Simulation seeked to `at` (s) of a checkpoint file.
+
+        Parameters come from the snapshots, as well as whether the
+        controller is engaged, unless `controller` is set: to branch from
+        that state with or without it.
+        """
+        _, state = checkpoint.loads(checkpoints.read(0))
+        if controller is None:
+            controller = state["controller"].is_active
+
+        sim = cls(
+            record=record,
+            controller=controller,
+            params=state["model"].params,
+            rec_format=rec_format,
+        )
+        sim.seek(checkpoints=checkpoints, at=at)
+        sim.controller.is_active = controller
+        return sim
+
+    def restore(self, payload: bytes) -> None:
+        latency = self.controller.latency
+        super().restore(payload=payload)
+        self.controller.latency = latency
+
+    def step(self) -> None:
+        impulse = self.controller.step(*self.model.output)
+        self.model.apply_impulse(impulse=impulse)
+
+        self.model.step()
+        self.space.step(sett.SIMULATION_STEP)
+
+        if self.recorder:
+            self.recorder.insert(
+                angle=self.model.angle,
+                angular_velocity=self.model.angular_velocity,
+                cart_friction=self.model.cart_friction,
+                cart_velocity=self.model.cart_velocity,
+                cart_x=self.model.cart_x,
+                impulse=impulse.x,
+            )
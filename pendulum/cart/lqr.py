@@ -0,0 +1,212 @@
+"""Synthesis of LQR gains for the Cart Pendulum.
+
+Gains are computed by solving the continuous algebraic Riccati equation of
+the (frictionless) model, linearized about the inverted position (see
+`pendulum.model`). Solutions are cached on disk, keyed by a hash of the
+inputs, and in memory, so runs sharing the same Parameters (e.g. within a
+sweep) only solve it once.
+
+Optionally, gains are scheduled over the pendulum angle (see `GainSchedule`).
+"""
+import bisect
+import hashlib
+import json
+import math
+import os
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+import scipy.linalg
+
+from pendulum import model, settings as sett
+from pendulum.cart.parameters import Parameters
+
+#: Default weights of the state errors (x, v, theta, omega)
+Q_WEIGHTS = (10.0, 1.0, 10.0, 1.0)
+
+#: Default weight of the input force
+R_WEIGHT = 0.01
+
+#: Gravity acceleration magnitude (mm/s²)
+GRAVITY = -sett.GRAVITY[1]
+
+#: Default operating points of a GainSchedule, in degrees from the inverted
+# position
+SCHEDULE_ANGLES = (-45.0, -30.0, -15.0, 0.0, 15.0, 30.0, 45.0)
+
+
+def linearize(
+    cart_mass: float,
+    circle_mass: float,
+    circle_length: float,
+    angle: float = math.pi,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the A and B matrices of the model about a pendulum `angle`.
+
+    By default, about the inverted position. The state is
+    `[x, v, theta, omega]` and the input the force (mN) applied to the cart
+    (see `pendulum.model.linearize`).
+    """
+    return model.linearize(
+        cart_mass=cart_mass,
+        circle_mass=circle_mass,
+        circle_length=circle_length,
+        state=(0.0, 0.0, angle, 0.0),
+        gravity=GRAVITY,
+    )
+
+
+def synthesize(
+    cart_mass: float,
+    circle_mass: float,
+    circle_length: float,
+    q: tuple[float, ...] = Q_WEIGHTS,
+    r: float = R_WEIGHT,
+    angle: float = math.pi,
+) -> np.ndarray:
+    """Solve the Riccati equation for the gains of the LQRController.
+
+    The controller applies `K @ (state - SET_POINT)`, so the returned gains
+    are the negated optimal gains (the optimal input is `-K @ state`).
+    """
+    a, b = linearize(cart_mass, circle_mass, circle_length, angle)
+    weights = np.diag(q)
+    r_matrix = np.array([[r]])
+    riccati = scipy.linalg.solve_continuous_are(a, b, weights, r_matrix)
+    return -np.linalg.solve(r_matrix, b.T @ riccati).ravel()
+
+
+def gains_key(
+    cart_mass: float,
+    circle_mass: float,
+    circle_length: float,
+    q: tuple[float, ...],
+    r: float,
+    angle: float,
+) -> str:
+    """Hash of everything the gains depend on."""
+    inputs = [
+        cart_mass,
+        circle_mass,
+        circle_length,
+        list(q),
+        r,
+        angle,
+        GRAVITY,
+        model.model_key(),
+    ]
+    return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1024)
+def cached_gains(
+    cart_mass: float,
+    circle_mass: float,
+    circle_length: float,
+    q: tuple[float, ...] = Q_WEIGHTS,
+    r: float = R_WEIGHT,
+    angle: float = math.pi,
+) -> np.ndarray:
+    """Return the gains, reading or writing them from the on-disk cache."""
+    key = gains_key(cart_mass, circle_mass, circle_length, q, r, angle)
+    path = sett.GAINS_PATH / f"{key}.json"
+    if path.exists():
+        return np.array(json.loads(path.read_text())["gains"])
+
+    gains = synthesize(cart_mass, circle_mass, circle_length, q, r, angle)
+
+    sett.ensure_path(sett.GAINS_PATH)
+    content = dict(
+        cart_mass=cart_mass,
+        circle_mass=circle_mass,
+        circle_length=circle_length,
+        q=list(q),
+        r=r,
+        angle=angle,
+        gains=gains.tolist(),
+    )
+    # Replace atomically, as parallel sweep workers may write the same file.
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(content))
+    tmp_path.replace(path)
+    return gains
+
+
+def gains_for(
+    params: Parameters,
+    q: tuple[float, ...] = Q_WEIGHTS,
+    r: float = R_WEIGHT,
+) -> np.ndarray:
+    """Gains of the LQRController for the Parameters."""
+    gains = cached_gains(
+        params.cart_mass, params.circle_mass, params.circle_length, q, r
+    )
+    return gains.copy()
+
+
+class GainSchedule:
+    """Gains synthesized about operating points of the pendulum angle.
+
+    Away from the inverted position, the model is linearized about each of
+    the `angles` (rad) and the controller interpolates the gains of the
+    current angle, clamped to the outermost points.
+    """
+
+    def __init__(self, angles: npt.ArrayLike, gains: npt.ArrayLike):
+        self.angles = np.array(angles, dtype=float)
+        #: Gains at each of the `angles`, with shape (len(angles), 4)
+        self.gains = np.array(gains, dtype=float)
+
+        # Plain floats, to interpolate a single angle without arrays.
+        self._points = self.angles.tolist()
+        self._rows = [tuple(row) for row in self.gains.tolist()]
+
+    @classmethod
+    def synthesize(
+        cls,
+        params: Parameters,
+        angles: Sequence[float] = SCHEDULE_ANGLES,
+        q: tuple[float, ...] = Q_WEIGHTS,
+        r: float = R_WEIGHT,
+    ) -> "GainSchedule":
+        """Schedule of the Parameters, `angles` (deg) from the inverted."""
+        points = sorted(math.pi + math.radians(angle) for angle in angles)
+        gains = [
+            cached_gains(
+                params.cart_mass,
+                params.circle_mass,
+                params.circle_length,
+                q,
+                r,
+                point,
+            )
+            for point in points
+        ]
+        return cls(angles=points, gains=gains)
+
+    def gains_at(self, angle: float) -> tuple[float, ...]:
+        """Interpolate the gains at a single angle (rad)."""
+        points, rows = self._points, self._rows
+        idx = bisect.bisect_right(points, angle)
+        if idx == 0:
+            return rows[0]
+        if idx == len(points):
+            return rows[-1]
+
+        lo, hi = points[idx - 1], points[idx]
+        weight = (angle - lo) / (hi - lo)
+        return tuple(
+            a + (b - a) * weight for a, b in zip(rows[idx - 1], rows[idx])
+        )
+
+    def batch_gains(self, angles: np.ndarray) -> np.ndarray:
+        """Interpolate the gains at every angle, as a (N, 4) array."""
+        return np.stack(
+            [
+                np.interp(angles, self.angles, column)
+                for column in self.gains.T
+            ],
+            axis=-1,
+        )
@@ -0,0 +1,167 @@
+"""PyMunk model of a Pendulum attached to a moving Cart."""
+import math
+
+import numpy as np
+import pymunk
+from pymunk import Vec2d
+
+from pendulum import settings as sett
+from pendulum.cart.parameters import Parameters
+from pendulum.munk.entities import Cart, Circle, Entity, Rail, Rod
+
+
+class CartPendulumModel:
+    """Cart Pendulum PyMunk Model."""
+
+    #: Distance between the rail endings and the screen width
+    RAIL_OFFSET = 50  # mm
+
+    def __init__(
+        self,
+        space: pymunk.Space,
+        params: Parameters,
+        width: float = sett.WIDTH,
+    ):
+        self.space = space
+        self.params = params
+        self.width = width
+
+        self._create_entities()
+        self._create_constraints()
+
+        self._last_angle = math.radians(self.params.angle)
+
+    def _create_entities(self) -> None:
+        cart_pos_x = (self.width / 2) + self.params.cart_x
+        cart_pos = Vec2d(cart_pos_x, 360)
+        self.cart = Cart(
+            space=self.space,
+            mass=self.params.cart_mass,
+            size=self.params.cart_size,
+            initial_pos=cart_pos,
+        )
+        self.cart.body.velocity = Vec2d(self.params.cart_v, 0)
+
+        self.circle = Circle(
+            space=self.space,
+            mass=self.params.circle_mass,
+            radius=self.params.circle_radius,
+            initial_pos=self._get_circle_initial_pos(cart_pos=cart_pos),
+        )
+
+    def _get_circle_initial_pos(self, cart_pos: Vec2d) -> Vec2d:
+        resting_pendulum = Vec2d(0, -self.params.circle_length)
+        return cart_pos + resting_pendulum.rotated_degrees(self.params.angle)
+
+    def _create_constraints(self) -> None:
+        self.rod = Rod(space=self.space, a=self.cart.body, b=self.circle.body)
+
+        rail_y = self.cart.initial_pos[1]
+        self.rail = Rail(
+            space=self.space,
+            body=self.cart.body,
+            start=(self.RAIL_OFFSET, rail_y),
+            end=(self.width - self.RAIL_OFFSET, rail_y),
+        )
+
+        # Lock rotation of the cart
+        gear = pymunk.GearJoint(
+            self.space.static_body, self.cart.body, 0.0, 1.0
+        )
+        self.space.add(gear)
+
+        # Simulate linear friciton by creating a PivotJoint, disabling
+        # correction and setting a maximum force. (Based on tank.py example)
+        if self.params.cart_friction:
+            self.friction_joint = pymunk.PivotJoint(
+                self.space.static_body, self.cart.body, (0, 0), (0, 0)
+            )
+            self.friction_joint.max_bias = 0
+            self.friction_joint.max_force = (
+                self.params.cart_friction * sett.SIMULATION_STEP
+            )
+
+            self.space.add(self.friction_joint)
+
+    @property
+    def entities(self) -> tuple[Entity, ...]:
+        """Moving entities to draw, from the back to the front.
+
+        The `rail` is static, so it's drawn once into a static layer.
+        """
+        return self.rod, self.cart, self.circle
+
+    @property
+    def cart_friction(self) -> float:
+        """Friction Force applied by the joint on the cart."""
+        if not self.params.cart_friction:
+            return 0.0
+
+        return self.friction_joint.impulse / sett.SIMULATION_STEP
+
+    @property
+    def angle(self) -> float:
+        """Angle (rad) between the Pendulum and the resting location.
+
+        Avoid negative angles around pi, which is supposed to be the
+        setpoint for the controller.
+        """
+        # Same as `-self.vector.get_angle_between(Vec2d(0, -1))`, without
+        # creating intermediate vectors (this is called every step).
+        circle_x, circle_y = self.circle.body.position
+        cart_x, cart_y = self.cart.body.position
+        angle = -math.atan2(cart_x - circle_x, cart_y - circle_y)
+        if angle < 0:
+            angle = 2 * np.pi + angle
+
+        return angle
+
+    @property
+    def angular_velocity(self) -> float:
+        """Pendulum Angular Velocity (rad/s)."""
+        ang_diff = self.angle - self._last_angle
+        if ang_diff > np.pi:
+            ang_diff = -(2 * np.pi - ang_diff)
+        elif ang_diff < -np.pi:
+            ang_diff = 2 * np.pi + ang_diff
+
+        return ang_diff / sett.SIMULATION_STEP
+
+    @property
+    def cart_x(self) -> float:
+        """Cart position related to the center of the rails.
+
+        Assume the rails are centered in the middle of the screen.
+        """
+        return self.cart.body.position.x - (self.width / 2)
+
+    @property
+    def cart_velocity(self) -> float:
+        """Linear Velocity of the Center of Mass of the Cart in the X axis."""
+        return self.cart.body.velocity.x
+
+    @property
+    def rail_limit(self) -> float:
+        """Maximum distance (mm) between the cart and the rails center."""
+        return self.width / 2 - self.RAIL_OFFSET
+
+    @property
+    def vector(self) -> Vec2d:
+        """Pendulum Vector, from Fixed point to the center of the Cart."""
+        return self.circle.body.position - self.cart.body.position
+
+    @property
+    def output(self) -> tuple[float, float, float, float]:
+        """Output variables of the system."""
+        return (
+            self.cart_x,
+            self.cart_velocity,
+            self.angle,
+            self.angular_velocity,
+        )
+
+    def apply_impulse(self, impulse) -> None:
+        self.cart.body.apply_impulse_at_local_point(impulse=impulse)
+
+    def step(self) -> None:
+        self._last_angle = self.angle
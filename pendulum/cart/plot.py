@@ -6,52 +6,41 @@ from plotly import graph_objects as go
 from plotly.subplots import make_subplots
 
 from pendulum import settings
-from pendulum.plot import load_recording
-
-
-def plot_recording(path: Path, height: int, width: int) -> None:
-    """Plot Recording data."""
-    df = load_recording(path)
-
-    fig = make_subplots(rows=5, cols=1)
-
-    fig.add_trace(
-        go.Scatter(x=df.index, y=df["cart_x"], name="Cart Position (mm)"),
-        row=1,
-        col=1,
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=df.index, y=df["cart_velocity"], name="Cart Velocity (mm/s)"
-        ),
-        row=2,
-        col=1,
-    )
-    fig.add_trace(
-        go.Scatter(x=df.index, y=df["angle"], name="Angle (rad)"),
-        row=3,
-        col=1,
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["angular_velocity"],
-            name="Angular Velocity (rad/s)",
-        ),
-        row=4,
-        col=1,
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["impulse"],
-            name="Input Impulse (mN)",
-        ),
-        row=5,
-        col=1,
+from pendulum.plot import decimate_recording
+
+#: Plotted columns and their trace names, one subplot each
+TRACES = {
+    "cart_x": "Cart Position (mm)",
+    "cart_velocity": "Cart Velocity (mm/s)",
+    "angle": "Angle (rad)",
+    "angular_velocity": "Angular Velocity (rad/s)",
+    "impulse": "Input Impulse (mN)",
+}
+
+
+def plot_recording(
+    path: Path,
+    height: int,
+    width: int,
+    start: float | None = None,
+    stop: float | None = None,
+) -> None:
+    """Plot Recording data, between the `start` and `stop` times.
+
+    Data is streamed and decimated to the plot `width`, keeping the minimum
+    and maximum of each pixel column, so large Recordings don't have to fit
+    in memory.
+    """
+    data = decimate_recording(
+        path, columns=TRACES, bins=width, start=start, stop=stop
     )
 
-    plot_path = settings.PLOT_PATH / f"{path.stem}.png"
+    fig = make_subplots(rows=len(TRACES), cols=1)
+    for row, (column, name) in enumerate(TRACES.items(), start=1):
+        t, y = data[column]
+        fig.add_trace(go.Scatter(x=t, y=y, name=name), row=row, col=1)
+
+    plot_path = settings.ensure_path(settings.PLOT_PATH) / f"{path.stem}.png"
     fig.update_layout(
         title="Cart Pendulum Simulation.",
         autosize=False,
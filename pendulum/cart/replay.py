@@ -0,0 +1,125 @@
+"""Replay Cart Pendulum Recordings into videos, without a window.
+
+Poses are rebuilt from the recorded `cart_x` and `angle` columns and drawn
+straight into NumPy frames (see `Canvas`), which are streamed to the encoder.
+"""
+import math
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from pendulum import settings as sett
+from pendulum.cart.model import CartPendulumModel
+from pendulum.cart.parameters import Parameters
+from pendulum.plot import iter_recording, recording_info
+from pendulum.recorder import open_catalog
+from pendulum.render import Canvas, write_video
+
+#: Height (mm) of the rails, as placed by the model
+RAIL_Y = 360
+
+RAIL_COLOR = (90, 90, 90)
+CART_COLOR = (52, 152, 219)
+ROD_COLOR = (200, 200, 200)
+CIRCLE_COLOR = (231, 76, 60)
+
+#: Rod thickness (mm)
+ROD_THICKNESS = 3
+
+
+def recording_parameters(path: Path) -> Parameters | None:
+    """Parameters of a Recording, as stored in the Catalog."""
+    with open_catalog() as catalog:
+        entry = catalog.get(filename=path.name)
+
+    if entry is None or not entry.params:
+        return None
+
+    return Parameters(**entry.params)
+
+
+def draw_rails(canvas: Canvas) -> None:
+    """Draw the rails, as the static background of the frames."""
+    offset = CartPendulumModel.RAIL_OFFSET
+    canvas.line((offset, RAIL_Y), (sett.WIDTH - offset, RAIL_Y), 1, RAIL_COLOR)
+    canvas.keep_as_background()
+
+
+def draw_pose(
+    canvas: Canvas, params: Parameters, cart_x: float, angle: float
+) -> None:
+    """Draw the Cart Pendulum at the given pose, over the background."""
+    canvas.clear()
+
+    cart = (sett.WIDTH / 2 + cart_x, RAIL_Y)
+    length = params.circle_length
+    circle = (
+        cart[0] + length * math.sin(angle),
+        cart[1] - length * math.cos(angle),
+    )
+    canvas.rect(*cart, *params.cart_size, color=CART_COLOR)
+    canvas.line(cart, circle, ROD_THICKNESS, ROD_COLOR)
+    canvas.disk(*circle, radius=params.circle_radius, color=CIRCLE_COLOR)
+
+
+def replay_frames(
+    path: Path,
+    canvas: Canvas,
+    params: Parameters,
+    fps: int,
+    start: float | None = None,
+    stop: float | None = None,
+) -> Iterator[np.ndarray]:
+    """Yield a frame every `1 / fps` seconds of the Recording.
+
+    The same frame buffer is reused: consume each before the next one.
+    """
+    draw_rails(canvas=canvas)
+
+    first_t = None
+    last_frame = -1
+    columns = ("cart_x", "angle")
+    for t, chunk in iter_recording(path, columns, start=start, stop=stop):
+        if first_t is None:
+            first_t = t[0]
+
+        # Sample at (or right after) the time of each frame.
+        frame_numbers = np.floor((t - first_t) * fps + 1e-6).astype(int)
+        is_new = np.diff(frame_numbers, prepend=last_frame) > 0
+        last_frame = frame_numbers[-1]
+        for cart_x, angle in zip(
+            chunk["cart_x"][is_new], chunk["angle"][is_new]
+        ):
+            draw_pose(canvas=canvas, params=params, cart_x=cart_x, angle=angle)
+            yield canvas.frame
+
+
+def render_replay(
+    path: Path,
+    out_path: Path,
+    params: Parameters,
+    fps: int = 60,
+    width: int = sett.WIDTH,
+    height: int = sett.HEIGHT,
+    start: float | None = None,
+    stop: float | None = None,
+    preset: str | None = None,
+) -> None:
+    """Render a Recording into a video at `fps` and `width`x`height`.
+
+    Frames can't be sampled more often than the Recording entries.
+    """
+    interval, length = recording_info(path=path)
+    window_start = max(start or 0.0, 0.0)
+    window_stop = (length - 1) * interval if stop is None else stop
+    frames = math.floor(max(window_stop - window_start, 0) * fps) + 1
+
+    canvas = Canvas(width=width, height=height)
+    write_video(
+        frames=replay_frames(path, canvas, params, fps, start, stop),
+        out_path=out_path,
+        length=frames,
+        fps=fps,
+        preset=preset,
+    )
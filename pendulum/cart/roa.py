@@ -0,0 +1,411 @@
+"""Region of Attraction of the LQR Controller.
+
+Maps which initial states, on a plane of two of the state variables, the
+controller brings back to the inverted position. The other variables start
+at the set point.
+
+Instead of a uniform grid, a coarse grid is evaluated first and only the
+cells whose corners disagree are split in four (quadtree), down to a number
+of levels, so most runs are spent along the boundary of the region. Each
+level is evaluated in parallel and every run stops as soon as it converges
+or fails.
+"""
+import csv
+import dataclasses
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import click
+import numpy as np
+from plotly import graph_objects as go
+
+from pendulum.cart import lqr
+from pendulum.cart.analytic import AnalyticEnsemble
+from pendulum.cart.controller import LQRController
+from pendulum.cart.headless import (
+    CartPendulumHeadless,
+    has_diverged,
+    hit_rail,
+    is_upright,
+)
+from pendulum.cart.parameters import Parameters
+from pendulum.headless import StopCondition
+
+#: Maximum distance (mm) from the center of the rails to be settled
+SETTLED_X = 1.0
+
+#: Maximum cart velocity (mm/s) to be settled
+SETTLED_V = 1.0
+
+#: Deviation (rad) from the inverted position considered a fall
+FALLEN_ANGLE = math.radians(90)
+
+#: Index of each variable in the `[x, v, theta, omega]` state
+STATE_INDEX = {
+    "cart_x": 0,
+    "cart_velocity": 1,
+    "angle": 2,
+    "angular_velocity": 3,
+}
+
+#: Swept variables of each plane and their default ranges (angle in degrees)
+PLANES = {
+    "angle": {"angle": (120.0, 240.0), "angular_velocity": (-6.0, 6.0)},
+    "cart": {"cart_x": (-500.0, 500.0), "cart_velocity": (-2000.0, 2000.0)},
+}
+
+#: Classes of the initial states
+FAILED, STABILIZED, UNDECIDED = 0, 1, 2
+LABELS = ("failed", "stabilized", "undecided")
+
+#: Heatmap color of each class
+COLORS = ("#e74c3c", "#2ecc71", "#95a5a6")
+
+#: Runs evaluated by each task submitted to the workers
+CHUNK_SIZE = {"analytic": 1024, "pymunk": 8}
+
+
+def has_converged(model) -> bool:
+    """Pendulum is upright and the cart settled at the center."""
+    return (
+        is_upright(model)
+        & (np.abs(model.cart_x) < SETTLED_X)
+        & (np.abs(model.cart_velocity) < SETTLED_V)
+    )
+
+
+def has_fallen(model) -> bool:
+    """Pendulum fell below the horizontal."""
+    return np.abs(model.angle - np.pi) > FALLEN_ANGLE
+
+
+#: Stop conditions of every run, `converged` is the only success
+CONDITIONS: dict[str, StopCondition] = {
+    "converged": has_converged,
+    "fallen": has_fallen,
+    "rail": hit_rail,
+    "diverged": has_diverged,
+}
+
+
+def classify(stop_reason: str | None) -> int:
+    """Class of an initial state, by the condition that stopped its run."""
+    if stop_reason is None:
+        return UNDECIDED
+
+    return STABILIZED if stop_reason == "converged" else FAILED
+
+
+def run_analytic(
+    states: np.ndarray,
+    params: Parameters,
+    duration: float,
+    gain_schedule: bool = False,
+) -> list[str | None]:
+    """Stop reason of each `[x, v, theta, omega]` state, as an ensemble.
+
+    Executed in the worker processes.
+    """
+    schedule = (
+        lqr.GainSchedule.synthesize(params=params) if gain_schedule else None
+    )
+    sim = AnalyticEnsemble.from_parameters(
+        params=params, states=states, controller=True, schedule=schedule
+    )
+    sim.run(duration=duration, conditions=CONDITIONS)
+    return sim.stop_reasons
+
+
+def run_pymunk(
+    states: np.ndarray,
+    params: Parameters,
+    duration: float,
+    gain_schedule: bool = False,
+) -> list[str | None]:
+    """Stop reason of each `[x, v, theta, omega]` state, one at a time.
+
+    Executed in the worker processes.
+    """
+    reasons = []
+    for x, v, theta, omega in states.tolist():
+        sim = CartPendulumHeadless(
+            record=False,
+            controller=True,
+            params=dataclasses.replace(
+                params, angle=math.degrees(theta), cart_x=x, cart_v=v
+            ),
+            gain_schedule=gain_schedule,
+        )
+        # Parameters have no initial angular velocity.
+        model = sim.model
+        model.circle.body.velocity = (
+            model.cart.body.velocity + model.vector.perpendicular() * omega
+        )
+        for name, condition in CONDITIONS.items():
+            sim.add_condition(name=name, condition=condition)
+
+        reasons.append(sim.run(duration=duration).stop_reason)
+
+    return reasons
+
+
+#: Evaluate a batch of initial states, returning their stop reasons
+ENGINES: dict[str, Callable[..., list[str | None]]] = {
+    "analytic": run_analytic,
+    "pymunk": run_pymunk,
+}
+
+
+@dataclass
+class Plane:
+    """Plane of two state variables, and their ranges."""
+
+    x: str
+    y: str
+    x_range: tuple[float, float]
+    y_range: tuple[float, float]
+
+    @classmethod
+    def from_name(
+        cls,
+        name: str,
+        x_range: tuple[float, float] | None = None,
+        y_range: tuple[float, float] | None = None,
+    ) -> "Plane":
+        """Plane of the `PLANES`, overriding its default ranges."""
+        (x, default_x), (y, default_y) = PLANES[name].items()
+        return cls(
+            x=x,
+            y=y,
+            x_range=x_range or default_x,
+            y_range=y_range or default_y,
+        )
+
+
+class RegionOfAttraction:
+    """Classify the initial states of a Plane, refining the boundaries.
+
+    Points lie on a lattice of `grid * 2**levels` cells per axis. Cells of
+    the coarse grid span `2**levels` of them and are split while their
+    corners disagree, until they span a single one.
+    """
+
+    def __init__(
+        self,
+        params: Parameters,
+        plane: Plane,
+        grid: int = 8,
+        levels: int = 4,
+        duration: float = 10.0,
+        engine: str = "analytic",
+        gain_schedule: bool = False,
+    ):
+        self.params = params
+        self.plane = plane
+        self.grid = grid
+        self.levels = levels
+        self.duration = duration
+        self.engine = engine
+        self.gain_schedule = gain_schedule
+
+        #: Lattice cells per axis
+        self.size = grid * 2**levels
+
+        #: Stop reason of each lattice point evaluated so far
+        self.reasons: dict[tuple[int, int], str | None] = {}
+
+        #: Cells that weren't split (lattice x, y and size)
+        self.leaves: list[tuple[int, int, int]] = []
+
+    def values(self, i: int, j: int) -> tuple[float, float]:
+        """Values of the plane variables at the lattice point."""
+        (x_lo, x_hi), (y_lo, y_hi) = self.plane.x_range, self.plane.y_range
+        return (
+            x_lo + (x_hi - x_lo) * i / self.size,
+            y_lo + (y_hi - y_lo) * j / self.size,
+        )
+
+    def state(self, i: int, j: int) -> list[float]:
+        """Initial `[x, v, theta, omega]` of the lattice point."""
+        state = LQRController.SET_POINT.tolist()
+        for name, value in zip(
+            (self.plane.x, self.plane.y), self.values(i=i, j=j)
+        ):
+            if name == "angle":
+                value = math.radians(value)
+            state[STATE_INDEX[name]] = value
+
+        return state
+
+    def corners(self, i: int, j: int, span: int) -> list[int]:
+        """Classes of the corners of a cell."""
+        return [
+            classify(self.reasons[(i + di, j + dj)])
+            for di in (0, span)
+            for dj in (0, span)
+        ]
+
+    def run(self, workers: int | None = None) -> None:
+        """Evaluate the coarse grid and refine it, level by level."""
+        workers = workers or os.cpu_count() or 1
+        span = 2**self.levels
+        cells = [
+            (i * span, j * span, span)
+            for i in range(self.grid)
+            for j in range(self.grid)
+        ]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            level = 0
+            while cells:
+                points = self._pending(cells=cells)
+                click.echo(
+                    f"Level {level}: {len(cells)} cells, "
+                    f"{len(points)} new points."
+                )
+                self._evaluate(
+                    points=points,
+                    executor=executor,
+                    workers=workers,
+                )
+                cells = self._refine(cells=cells)
+                level += 1
+
+    def _pending(
+        self, cells: list[tuple[int, int, int]]
+    ) -> list[tuple[int, int]]:
+        """Corners of the cells that weren't evaluated yet."""
+        points = {
+            (i + di, j + dj)
+            for i, j, span in cells
+            for di in (0, span)
+            for dj in (0, span)
+        }
+        return sorted(points - self.reasons.keys())
+
+    def _evaluate(
+        self,
+        points: list[tuple[int, int]],
+        executor: ProcessPoolExecutor,
+        workers: int,
+    ) -> None:
+        if not points:
+            return
+
+        states = np.array([self.state(i=i, j=j) for i, j in points])
+        # Enough chunks to keep every worker busy, but not too large.
+        chunks = max(workers, math.ceil(len(points) / CHUNK_SIZE[self.engine]))
+        run = partial(
+            ENGINES[self.engine],
+            params=self.params,
+            duration=self.duration,
+            gain_schedule=self.gain_schedule,
+        )
+        reasons = executor.map(
+            run, np.array_split(states, min(chunks, len(points)))
+        )
+        self.reasons.update(
+            zip(points, itertools.chain.from_iterable(reasons))
+        )
+
+    def _refine(
+        self, cells: list[tuple[int, int, int]]
+    ) -> list[tuple[int, int, int]]:
+        """Split the cells whose corners disagree, keeping the others."""
+        children = []
+        for i, j, span in cells:
+            if len(set(self.corners(i=i, j=j, span=span))) == 1 or span == 1:
+                self.leaves.append((i, j, span))
+                continue
+
+            half = span // 2
+            children.extend(
+                (i + di, j + dj, half) for di in (0, half) for dj in (0, half)
+            )
+
+        return children
+
+    def image(self) -> np.ndarray:
+        """Class of every lattice cell, indexed by `[y, x]`.
+
+        Each leaf takes the most common class of its corners (the lowest
+        one on ties).
+        """
+        image = np.empty((self.size, self.size), dtype=np.int8)
+        for i, j, span in self.leaves:
+            corners = self.corners(i=i, j=j, span=span)
+            rows, cols = slice(j, j + span), slice(i, i + span)
+            image[rows, cols] = np.bincount(
+                corners, minlength=len(LABELS)
+            ).argmax()
+
+        return image
+
+    def save_points(self, path: Path) -> None:
+        """Write every evaluated point, its stop reason and class."""
+        with path.open("w", newline="") as fd:
+            writer = csv.writer(fd)
+            writer.writerow(
+                [self.plane.x, self.plane.y, "stop_reason", "class"]
+            )
+            for (i, j), reason in sorted(self.reasons.items()):
+                writer.writerow(
+                    [
+                        *self.values(i=i, j=j),
+                        reason or "",
+                        LABELS[classify(reason)],
+                    ]
+                )
+
+    def plot(self, path: Path, width: int, height: int) -> None:
+        """Save the heatmap of the classes, over the lattice cells."""
+        (x_lo, x_hi), (y_lo, y_hi) = self.plane.x_range, self.plane.y_range
+        centers = (np.arange(self.size) + 0.5) / self.size
+        colorscale = [
+            [bound, color]
+            for idx, color in enumerate(COLORS)
+            for bound in (idx / len(COLORS), (idx + 1) / len(COLORS))
+        ]
+        fig = go.Figure(
+            go.Heatmap(
+                z=self.image(),
+                x=x_lo + (x_hi - x_lo) * centers,
+                y=y_lo + (y_hi - y_lo) * centers,
+                zmin=-0.5,
+                zmax=len(LABELS) - 0.5,
+                colorscale=colorscale,
+                colorbar=dict(
+                    tickvals=list(range(len(LABELS))), ticktext=LABELS
+                ),
+            )
+        )
+        fig.update_layout(
+            title="LQR Controller Region of Attraction.",
+            xaxis_title=self.plane.x,
+            yaxis_title=self.plane.y,
+            autosize=False,
+            width=width,
+            height=height,
+        )
+        fig.write_image(path)
+
+    def echo(self) -> None:
+        """Print a summary of the classified points."""
+        counts = np.bincount(
+            [classify(reason) for reason in self.reasons.values()],
+            minlength=len(LABELS),
+        )
+        uniform = (self.size + 1) ** 2
+        click.secho(
+            f"Evaluated {len(self.reasons)} points "
+            f"({len(self.reasons) / uniform:.1%} of a uniform grid).",
+            fg="green",
+        )
+        for name, count in zip(LABELS, counts):
+            click.echo(f" - {name.capitalize()}: {count}")
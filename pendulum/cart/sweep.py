@@ -0,0 +1,252 @@
+"""Parameter Sweeps over the Cart Pendulum simulation.
+
+A sweep runs the headless simulation for every combination of values of the
+swept Parameters, in parallel, writing one summary row per run to a results
+table. Rows are flushed as soon as each run finishes, so an interrupted sweep
+resumes from where it stopped.
+"""
+import csv
+import dataclasses
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import click
+import numpy as np
+from click import UsageError
+
+from pendulum import settings as sett
+from pendulum.cart.headless import STOP_CONDITIONS, CartPendulumHeadless
+from pendulum.cart.parameters import Parameters
+
+#: Parameters that can be swept (i.e. scalar ones)
+SWEEPABLE = (
+    "angle",
+    "cart_x",
+    "cart_v",
+    "cart_friction",
+    "cart_mass",
+    "circle_length",
+    "circle_mass",
+    "circle_radius",
+)
+
+#: Columns written for every run, after the swept Parameters
+SUMMARY_FIELDS = (
+    "steps",
+    "sim_time",
+    "wall_time",
+    "stop_reason",
+    "final_cart_x",
+    "final_cart_velocity",
+    "final_angle",
+    "final_angular_velocity",
+)
+
+
+def expand_values(field: str, spec: Any) -> list[float]:
+    """Expand the specification of a swept field into its values.
+
+    The specification is either an explicit list of values or a range, as a
+    dict with `start`, `stop` and either `num` (both ends included) or `step`.
+    """
+    if isinstance(spec, list):
+        return [float(value) for value in spec]
+
+    try:
+        if "num" in spec:
+            values = np.linspace(spec["start"], spec["stop"], spec["num"])
+        else:
+            values = np.arange(spec["start"], spec["stop"], spec["step"])
+    except (KeyError, TypeError):
+        raise UsageError(f"Invalid range for '{field}': {spec}.")
+
+    return values.tolist()
+
+
+@dataclass
+class SweepSpec:
+    """Specification of a Parameter Sweep."""
+
+    #: Name of the base Parameters file
+    params: str
+    #: Simulated time (s) of each run
+    duration: float
+    controller: bool
+    #: Names of the Stop Conditions
+    stop: list[str]
+    #: Values of each swept Parameter
+    grid: dict[str, list[float]]
+
+    @classmethod
+    def load_from_file(cls, path: Path) -> "SweepSpec":
+        with path.open() as fd:
+            spec = json.load(fd)
+
+        grid = spec.get("grid", {})
+        for field in grid:
+            if field not in SWEEPABLE:
+                raise UsageError(f"Parameter '{field}' can't be swept.")
+
+        stop = spec.get("stop", [])
+        for name in stop:
+            if name not in STOP_CONDITIONS:
+                raise UsageError(f"Unknown stop condition '{name}'.")
+
+        return cls(
+            params=spec.get("params", "rest_bottom"),
+            duration=spec.get("duration", 60.0),
+            controller=spec.get("controller", False),
+            stop=stop,
+            grid={
+                field: expand_values(field=field, spec=values)
+                for field, values in grid.items()
+            },
+        )
+
+    @property
+    def size(self) -> int:
+        """Total number of runs in the sweep."""
+        return int(np.prod([len(values) for values in self.grid.values()]))
+
+    def points(self) -> Iterator[dict[str, float]]:
+        """Iterate over every combination of the swept values."""
+        fields = list(self.grid)
+        for values in itertools.product(*self.grid.values()):
+            yield dict(zip(fields, values))
+
+
+def run_point(
+    index: int,
+    point: dict[str, float],
+    params: Parameters,
+    spec: SweepSpec,
+) -> dict[str, Any]:
+    """Run a single simulation of the sweep and summarize it.
+
+    Executed in the worker processes.
+    """
+    sim = CartPendulumHeadless(
+        record=False,
+        controller=spec.controller,
+        params=dataclasses.replace(params, **point),
+    )
+    for name in spec.stop:
+        sim.add_condition(name=name, condition=STOP_CONDITIONS[name])
+
+    summary = sim.run(duration=spec.duration)
+    x, v, theta, omega = sim.model.output
+    return dict(
+        run=index,
+        **point,
+        steps=summary.steps,
+        sim_time=summary.sim_time,
+        wall_time=summary.wall_time,
+        stop_reason=summary.stop_reason or "",
+        final_cart_x=x,
+        final_cart_velocity=v,
+        final_angle=theta,
+        final_angular_velocity=omega,
+    )
+
+
+class Sweep:
+    """Run a SweepSpec, checkpointing the results into a CSV file."""
+
+    def __init__(self, spec: SweepSpec, name: str):
+        self.spec = spec
+        self.params = Parameters.load_from_file(filename=spec.params)
+
+        self.results_path = sett.SWEEP_PATH / f"{name}.csv"
+        self.spec_path = sett.SWEEP_PATH / f"{name}.json"
+
+        self.fieldnames = ["run", *spec.grid, *SUMMARY_FIELDS]
+
+    def _check_resume(self) -> None:
+        """Make sure existing results were produced by the same spec."""
+        spec = dataclasses.asdict(self.spec)
+        if not self.spec_path.exists():
+            self.spec_path.write_text(json.dumps(spec, indent=2))
+            return
+
+        if json.loads(self.spec_path.read_text()) != spec:
+            msg = f"Results '{self.results_path.name}' use a different spec."
+            raise UsageError(msg)
+
+    def completed(self) -> set[int]:
+        """Indexes of the runs already in the results file."""
+        if not self.results_path.exists():
+            return set()
+
+        with self.results_path.open() as fd:
+            # Skip a row truncated by an interruption.
+            return {
+                int(row["run"])
+                for row in csv.DictReader(fd)
+                if None not in row.values()
+            }
+
+    def _drop_partial_row(self) -> None:
+        """Truncate the results after their last complete row.
+
+        A row cut short by an interruption has no line ending, and the
+        next one would be appended right onto it.
+        """
+        if not self.results_path.exists():
+            return
+
+        with self.results_path.open("rb+") as fd:
+            content = fd.read()
+            if content.endswith(b"\n"):
+                return
+
+            fd.truncate(content.rfind(b"\n") + 1)
+
+    def run(self, workers: int | None = None) -> None:
+        """Run the pending points of the sweep in parallel."""
+        sett.ensure_path(sett.SWEEP_PATH)
+        self._check_resume()
+        self._drop_partial_row()
+
+        done = self.completed()
+        if done:
+            click.secho(f"Resuming: {len(done)} runs completed.", fg="yellow")
+
+        pending = [
+            (index, point)
+            for index, point in enumerate(self.spec.points())
+            if index not in done
+        ]
+
+        # Also empty when the header itself was cut short.
+        new_file = (
+            not self.results_path.exists()
+            or self.results_path.stat().st_size == 0
+        )
+        with self.results_path.open("a", newline="") as fd:
+            writer = csv.DictWriter(fd, fieldnames=self.fieldnames)
+            if new_file:
+                writer.writeheader()
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        run_point, idx, point, self.params, self.spec
+                    )
+                    for idx, point in pending
+                ]
+                try:
+                    with click.progressbar(
+                        as_completed(futures), len(futures)
+                    ) as bar:
+                        for future in bar:
+                            writer.writerow(future.result())
+                            fd.flush()
+                except KeyboardInterrupt:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+
+        click.secho(f"Results: '{self.results_path}'", fg="green")
@@ -0,0 +1,272 @@
+"""Catalog of Simulation Recordings.
+
+Recordings are indexed into a SQLite database when the Recorder is closed, so
+they can be listed and filtered without globbing or opening every file.
+"""
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Collection, Mapping
+
+import click
+import numpy as np
+
+from pendulum import settings as sett
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    filename TEXT PRIMARY KEY,
+    prefix TEXT NOT NULL,
+    format TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    controller INTEGER,
+    params TEXT NOT NULL,
+    stats TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recordings_prefix_started
+    ON recordings (prefix, started);
+CREATE INDEX IF NOT EXISTS recordings_duration ON recordings (duration);
+"""
+
+#: Columns of Recording files that are not simulation data
+META_COLUMNS = ("ts", "interval")
+
+
+@dataclass
+class CatalogEntry:
+    """Summary of a Recording, as stored in the Catalog."""
+
+    filename: str
+    prefix: str
+    format: str
+    #: Timestamp of the first entry
+    started: float
+    #: Simulated time (s)
+    duration: float
+    samples: int
+    #: Whether the Controller was engaged (unknown for indexed files)
+    controller: bool | None = None
+    #: Simulation Parameters
+    params: dict[str, Any] = field(default_factory=dict)
+    #: Minimum, maximum and mean of each recorded field
+    stats: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def path(self) -> Path:
+        return sett.REC_PATH / self.filename
+
+    @property
+    def started_at(self) -> datetime:
+        return datetime.fromtimestamp(self.started)
+
+    def describe(self) -> str:
+        """One line description of the Recording."""
+        controller = ", controller" if self.controller else ""
+        return (
+            f"{self.started_at:%Y-%m-%d %H:%M:%S} "
+            f"({self.duration:.1f} s, {self.samples} samples{controller})"
+        )
+
+
+class FieldStats:
+    """Running minimum, maximum and mean of recorded fields."""
+
+    def __init__(self, fields: Collection[str]):
+        self.fields = list(fields)
+        self.count = 0
+        self._min = np.full(len(self.fields), np.inf)
+        self._max = np.full(len(self.fields), -np.inf)
+        self._sum = np.zeros(len(self.fields))
+
+    def update_row(self, row: Mapping[str, Any]) -> None:
+        """Add a single entry."""
+        values = np.array([row[name] for name in self.fields], dtype=float)
+        np.minimum(self._min, values, out=self._min)
+        np.maximum(self._max, values, out=self._max)
+        self._sum += values
+        self.count += 1
+
+    def update_block(self, columns: Mapping[str, np.ndarray]) -> None:
+        """Add the entries of whole column arrays at once."""
+        size = len(columns[self.fields[0]]) if self.fields else 0
+        if not size:
+            return
+
+        for idx, name in enumerate(self.fields):
+            values = np.asarray(columns[name], dtype=float)
+            self._min[idx] = min(self._min[idx], values.min())
+            self._max[idx] = max(self._max[idx], values.max())
+            self._sum[idx] += values.sum()
+
+        self.count += size
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        if not self.count:
+            return {}
+
+        mean = self._sum / self.count
+        return {
+            name: dict(
+                min=float(self._min[idx]),
+                max=float(self._max[idx]),
+                mean=float(mean[idx]),
+            )
+            for idx, name in enumerate(self.fields)
+        }
+
+
+class Catalog:
+    """SQLite index of the Recordings."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or sett.CATALOG_PATH
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add(self, entry: CatalogEntry) -> None:
+        """Add (or replace) a Recording entry."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO recordings VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.filename,
+                    entry.prefix,
+                    entry.format,
+                    entry.started,
+                    entry.duration,
+                    entry.samples,
+                    entry.controller,
+                    json.dumps(entry.params),
+                    json.dumps(entry.stats),
+                ),
+            )
+
+    def remove(self, filenames: Collection[str]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM recordings WHERE filename = ?",
+                [(name,) for name in filenames],
+            )
+
+    def query(
+        self,
+        prefix: str | None = None,
+        min_duration: float | None = None,
+        max_duration: float | None = None,
+        controller: bool | None = None,
+        params: Mapping[str, Any] | None = None,
+        limit: int | None = None,
+    ) -> list[CatalogEntry]:
+        """Return the Recordings matching every filter, newest first."""
+        filters = {
+            "prefix = ?": prefix,
+            "duration >= ?": min_duration,
+            "duration <= ?": max_duration,
+            "controller = ?": controller,
+        }
+        clauses = [
+            clause for clause, arg in filters.items() if arg is not None
+        ]
+        args = [arg for arg in filters.values() if arg is not None]
+        for name, value in (params or {}).items():
+            clauses.append("json_extract(params, ?) = ?")
+            args.extend((f"$.{name}", value))
+
+        sql = "SELECT * FROM recordings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY started DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        return [
+            self._to_entry(row) for row in self.connection.execute(sql, args)
+        ]
+
+    @staticmethod
+    def _to_entry(row: tuple) -> CatalogEntry:
+        *values, controller, params, stats = row
+        return CatalogEntry(
+            *values,
+            controller=None if controller is None else bool(controller),
+            params=json.loads(params),
+            stats=json.loads(stats),
+        )
+
+    def get(self, filename: str) -> CatalogEntry | None:
+        """Return the entry of a Recording, if it's in the Catalog."""
+        row = self.connection.execute(
+            "SELECT * FROM recordings WHERE filename = ?", (filename,)
+        ).fetchone()
+        return None if row is None else self._to_entry(row)
+
+    def filenames(self) -> set[str]:
+        rows = self.connection.execute("SELECT filename FROM recordings")
+        return {filename for (filename,) in rows}
+
+    def sync(self, suffixes: Mapping[str, str]) -> tuple[int, int]:
+        """Index Recordings missing from the Catalog and drop deleted ones.
+
+        Recordings created before the Catalog existed are read once, to
+        compute their entries. `suffixes` maps file suffixes to the format
+        names. Returns the number of added and removed entries.
+        """
+        on_disk = {
+            path.name: path
+            for path in sett.REC_PATH.glob("*_*")
+            if path.suffix in suffixes
+        }
+        known = self.filenames()
+
+        missing = [path for name, path in on_disk.items() if name not in known]
+        if missing:
+            with click.progressbar(missing, label="Indexing") as bar:
+                for path in bar:
+                    entry = index_recording(
+                        path=path, rec_format=suffixes[path.suffix]
+                    )
+                    self.add(entry)
+
+        deleted = known - set(on_disk)
+        self.remove(deleted)
+        return len(missing), len(deleted)
+
+
+def index_recording(path: Path, rec_format: str) -> CatalogEntry:
+    """Read a Recording file to create its Catalog entry."""
+    # Both depend on the Recorder, which depends on the Catalog.
+    from pendulum.plot import iter_recording, recording_columns, recording_info
+    from pendulum.recorder import parse_filename
+
+    interval, samples = recording_info(path=path)
+
+    fields = [
+        name for name in recording_columns(path) if name not in META_COLUMNS
+    ]
+    stats = FieldStats(fields=fields)
+    for _, chunk in iter_recording(path, columns=fields):
+        stats.update_block(chunk)
+
+    return CatalogEntry(
+        filename=path.name,
+        prefix=path.stem.split("_", maxsplit=1)[0],
+        format=rec_format,
+        started=parse_filename(path=path).timestamp(),
+        duration=samples * interval,
+        samples=samples,
+        stats=stats.summary(),
+    )
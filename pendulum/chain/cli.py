@@ -0,0 +1,122 @@
+"""N-link Chain Simulator CLI Commands."""
+import click
+
+from pendulum import settings as sett
+from pendulum.chain.parameters import ChainParameters
+from pendulum.lazy import LazyChoice
+
+
+def load_parameters(params: str) -> ChainParameters | None:
+    """Load Parameters file, listing the available ones if not found."""
+    try:
+        return ChainParameters.load_from_file(filename=params)
+    except FileNotFoundError:
+        click.secho(f"Parameters '{params}' not found.", fg="bright_red")
+        click.echo("\n".join((f" - {p}" for p in ChainParameters.available())))
+        return None
+
+
+@click.group()
+def chain():
+    """N-link Chain simulator, on a fixed point or a cart."""
+
+
+@chain.command()
+@click.option("-e", "--export", is_flag=True, help="Export Animation.")
+@click.option("-g", "--grid", is_flag=True, help="Display Grid.")
+@click.option("-p", "--params", default="chain_50", help="Parameters File.")
+@click.option("-r", "--record", is_flag=True, help="Record simulation data.")
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+@click.option(
+    "-t",
+    "--time-factor",
+    type=float,
+    default=sett.TIME_FACTOR,
+    help="Simulated time per real time ('inf' for full speed). Change it "
+    "while running with '[' and ']'.",
+)
+@click.option(
+    "-T",
+    "--timings",
+    is_flag=True,
+    help="Time each phase of the loop, saving the stats on exit. Toggle "
+    "the overlay with 'T'.",
+)
+@click.option(
+    "-S",
+    "--stress",
+    "stress_rate",
+    type=float,
+    default=0.0,
+    help="Fire this many projectiles per (simulated) second.",
+)
+def run(
+    export: bool,
+    grid: bool,
+    params: str,
+    record: bool,
+    rec_format: str,
+    time_factor: float,
+    timings: bool,
+    stress_rate: float,
+):
+    """Run the simulation."""
+    # Importing pyglet windows requires a display.
+    import pyglet
+
+    from pendulum.chain.simulator import ChainSim
+
+    sim_params = load_parameters(params=params)
+    if sim_params is None:
+        return
+
+    ChainSim(
+        record=record,
+        export=export,
+        grid=grid,
+        params=sim_params,
+        rec_format=rec_format,
+        time_factor=time_factor,
+        timings=timings,
+        stress_rate=stress_rate,
+    )
+    pyglet.app.run()
+
+
+@chain.command()
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=60.0,
+    help="Simulated time (s).",
+)
+@click.option("-p", "--params", default="chain_50", help="Parameters File.")
+@click.option("-r", "--record", is_flag=True, help="Record simulation data.")
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+def simulate(duration: float, params: str, record: bool, rec_format: str):
+    """Run the simulation without a window, as fast as possible."""
+    from pendulum.chain.headless import ChainHeadless
+
+    sim_params = load_parameters(params=params)
+    if sim_params is None:
+        return
+
+    sim = ChainHeadless(
+        record=record, params=sim_params, rec_format=rec_format
+    )
+    summary = sim.run(duration=duration)
+    summary.echo()
+    click.echo(f" - Stretch: {sim.model.stretch:.2%}")
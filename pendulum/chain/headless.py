@@ -0,0 +1,33 @@
+"""Headless simulation of an N-link Chain."""
+from pendulum.chain.model import ChainModel
+from pendulum.chain.parameters import ChainParameters
+from pendulum.headless import HeadlessSimulation
+
+
+class ChainHeadless(HeadlessSimulation):
+    """Chain simulation stepped without a window."""
+
+    REC_PREFIX = "chain"
+    REC_FIELDS = ("tip_x", "tip_y")
+
+    def __init__(
+        self,
+        record: bool,
+        params: ChainParameters,
+        rec_format: str = "csv",
+    ):
+        super().__init__(record=record, rec_format=rec_format)
+
+        if self.recorder:
+            self.recorder.describe(controller=False, params=params)
+
+        self.model = ChainModel(
+            space=self.space, params=params, width=self.width
+        )
+
+    def step(self) -> None:
+        self.model.step()
+
+        if self.recorder:
+            tip_x, tip_y = self.model.tip
+            self.recorder.insert(tip_x=tip_x, tip_y=tip_y)
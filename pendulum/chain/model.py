@@ -0,0 +1,170 @@
+"""PyMunk model of a Chain of N links, on a fixed point or a cart."""
+import math
+
+import numpy as np
+import pymunk
+from pymunk import Vec2d
+
+from pendulum import settings as sett
+from pendulum.chain.parameters import ChainParameters
+from pendulum.munk import state
+from pendulum.munk.entities import Cart, Chain, Entity, Fixed, Link, Rail
+
+
+class ChainModel:
+    """N-link Chain PyMunk Model.
+
+    The chain state is read in bulk, into NumPy arrays with one row per
+    link, from the top of the chain to its tip.
+    """
+
+    #: Distance between the rail endings and the screen width
+    RAIL_OFFSET = 50  # mm
+
+    #: Height of the fixed point, or the rails
+    MOUNT_Y = 360  # mm
+
+    #: Links pivot on each other (and the cart), they don't need to collide
+    LINK_FILTER = pymunk.ShapeFilter(group=1)
+
+    def __init__(
+        self,
+        space: pymunk.Space,
+        params: ChainParameters,
+        width: float = sett.WIDTH,
+    ):
+        self.space = space
+        self.params = params
+        self.width = width
+
+        # More iterations keep long chains from stretching.
+        self.space.iterations = params.iterations
+
+        self._create_mount()
+        self._create_links()
+
+    def _create_mount(self) -> None:
+        pos = Vec2d(self.width / 2, self.MOUNT_Y)
+        self.mount: Fixed | Cart
+        #: Static rail of the cart mount, drawn into a static layer
+        self.rail: Rail | None = None
+        if self.params.mount == "fixed":
+            self.mount = Fixed(space=self.space, pos=pos)
+            return
+
+        self.mount = Cart(
+            space=self.space,
+            mass=self.params.cart_mass,
+            size=self.params.cart_size,
+            initial_pos=pos,
+        )
+        self.mount.shape.filter = self.LINK_FILTER
+        self.rail = Rail(
+            space=self.space,
+            body=self.mount.body,
+            start=(self.RAIL_OFFSET, pos.y),
+            end=(self.width - self.RAIL_OFFSET, pos.y),
+        )
+        # Lock rotation of the cart
+        gear = pymunk.GearJoint(
+            self.space.static_body, self.mount.body, 0.0, 1.0
+        )
+        self.space.add(gear)
+
+        if self.params.cart_friction:
+            # Same linear friction as the `CartPendulumModel`.
+            friction = pymunk.PivotJoint(
+                self.space.static_body, self.mount.body, (0, 0), (0, 0)
+            )
+            friction.max_bias = 0
+            friction.max_force = (
+                self.params.cart_friction * sett.SIMULATION_STEP
+            )
+            self.space.add(friction)
+
+    def _create_links(self) -> None:
+        angle = math.radians(self.params.angle)
+
+        self.links: list[Link] = []
+        # Both mounts have their body on the top of the chain.
+        parent = self.mount.body
+        for _ in range(self.params.links):
+            link = Link(
+                space=self.space,
+                parent=parent,
+                mass=self.params.link_mass,
+                radius=self.params.link_radius,
+                length=self.params.link_length,
+                angle=angle,
+                damping=self.params.link_damping,
+                shape_filter=self.LINK_FILTER,
+            )
+            self.links.append(link)
+            parent = link.body
+
+        self.chain = Chain(links=self.links)
+        self.bodies = self.chain.bodies
+
+    @property
+    def entities(self) -> tuple[Entity, ...]:
+        """Moving entities to draw, from the back to the front."""
+        return self.mount, self.chain
+
+    @property
+    def pivot(self) -> Vec2d:
+        """Position of the top of the chain."""
+        return self.mount.body.position
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Position of each link (mm), as a (links, 2) array."""
+        return state.positions(self.bodies)
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """Velocity of each link (mm/s), as a (links, 2) array."""
+        return state.velocities(self.bodies)
+
+    @property
+    def angles(self) -> np.ndarray:
+        """Angle (rad) of each link, from hanging down."""
+        return state.angles(self.bodies)
+
+    @property
+    def angular_velocities(self) -> np.ndarray:
+        """Angular velocity (rad/s) of each link."""
+        return state.angular_velocities(self.bodies)
+
+    @property
+    def stretch(self) -> float:
+        """Largest relative error of the link lengths, 0 for a rigid chain.
+
+        The lengths are measured between the circles, a solver with too few
+        iterations lets the chain stretch.
+        """
+        points = np.vstack((self.pivot, self.positions))
+        lengths = np.hypot(*np.diff(points, axis=0).T)
+        return float(np.abs(lengths / self.params.link_length - 1).max())
+
+    @property
+    def tip(self) -> Vec2d:
+        """Position of the last link."""
+        return self.bodies[-1].position
+
+    def step(self) -> None:
+        """Advance the space by a `SIMULATION_STEP`, in `substeps`."""
+        dt = sett.SIMULATION_STEP / self.params.substeps
+        for _ in range(self.params.substeps):
+            self.space.step(dt)
+
+    def push(self, acceleration: Vec2d) -> None:
+        """Accelerate the cart or, on a fixed point, the tip of the chain.
+
+        Pushing with an acceleration, instead of an impulse, works the same
+        regardless of the mass of the pushed body.
+        """
+        body = (
+            self.mount.body if self.params.mount == "cart" else self.bodies[-1]
+        )
+        impulse = body.mass * acceleration * sett.SIMULATION_STEP
+        body.apply_impulse_at_world_point(impulse=impulse, point=body.position)
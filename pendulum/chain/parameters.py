@@ -0,0 +1,67 @@
+import json
+from dataclasses import dataclass
+
+from pendulum import settings as sett
+
+DIRECTORY = sett.BASE_DIR / "pendulum/chain/parameters"
+
+#: Where the chain hangs from
+MOUNTS = ("fixed", "cart")
+
+
+@dataclass
+class ChainParameters:
+    """Simulation Parameters for the N-link Chain"""
+
+    mount: str
+
+    # Initial Conditions
+    angle: float  # deg, of the whole chain
+
+    # Entity Properties
+    links: int
+    link_length: float  # mm
+    link_mass: float  # kg
+    link_radius: float  # mm
+    link_damping: float  # Torque per relative angular velocity
+
+    # Only used when mounted on the cart
+    cart_friction: float | None  # mN
+    cart_mass: float
+    cart_size: tuple[float, float]
+
+    # PyMunk Solver: long chains need more iterations and substeps
+    iterations: int
+    substeps: int  # Space steps per simulation step
+
+    def __post_init__(self):
+        if self.mount not in MOUNTS:
+            raise ValueError(f"Unknown mount '{self.mount}'.")
+
+    @classmethod
+    def load_from_file(cls, filename: str) -> "ChainParameters":
+        filepath = DIRECTORY / f"{filename}.json"
+        with filepath.open() as fd:
+            parameters = json.load(fd)
+
+        return cls(
+            mount=parameters["mount"],
+            angle=parameters["angle"],
+            links=parameters["links"],
+            link_length=parameters["link_length"],
+            link_mass=parameters["link_mass"],
+            link_radius=parameters["link_radius"],
+            link_damping=parameters["link_damping"],
+            cart_friction=parameters["cart_friction"],
+            cart_mass=parameters["cart_mass"],
+            cart_size=parameters["cart_size"],
+            iterations=parameters["iterations"],
+            substeps=parameters["substeps"],
+        )
+
+    @classmethod
+    def available(cls) -> list[str]:
+        """List all the available parameters."""
+        return [
+            path.stem for path in DIRECTORY.iterdir() if path.suffix == ".json"
+        ]
@@ -0,0 +1,100 @@
+"""PyMunk simulation of an N-link Chain."""
+from pyglet import clock
+from pyglet.window import key
+from pymunk import Vec2d
+
+from pendulum import settings as sett
+from pendulum.chain.model import ChainModel
+from pendulum.chain.parameters import ChainParameters
+from pendulum.simulation import BaseSimulation
+from pendulum.utils import HUD
+
+
+class ChainSim(BaseSimulation):
+    """Application simulating an N-link Chain."""
+
+    CAPTION = "PyMunk Chain Simulation"
+
+    REC_PREFIX = "chain"
+    REC_FIELDS = ("tip_x", "tip_y", "input_left", "input_right")
+
+    #: Keyboard Input Acceleration, the same the Cart Pendulum gets
+    ACCELERATION = 15000  # mm/s²
+
+    HUD_COLOR = 0, 255, 0, 255
+
+    def __init__(
+        self,
+        record: bool,
+        grid: bool,
+        export: bool,
+        params: ChainParameters,
+        rec_format: str = "csv",
+        time_factor: float = sett.TIME_FACTOR,
+        timings: bool = False,
+        stress_rate: float = 0.0,
+    ):
+        super().__init__(
+            record=record,
+            export=export,
+            grid=grid,
+            rec_format=rec_format,
+            time_factor=time_factor,
+            timings=timings,
+            stress_rate=stress_rate,
+        )
+
+        if self.recorder:
+            self.recorder.describe(controller=False, params=params)
+
+        self.model = ChainModel(
+            space=self.space, params=params, width=self.width
+        )
+        self.renderer.add(*self.model.entities)
+        if self.model.rail:
+            self.static_layers.register("rails", self.model.rail.draw)
+
+        self.hud: HUD = HUD(
+            window=self,
+            lines=[
+                (f"links: {params.links}", self.HUD_COLOR),
+                ("stretch: {stretch:.2%}", self.HUD_COLOR),
+            ],
+        )
+        # Reading every link is too slow for each step.
+        clock.schedule_interval(self._update_hud, 1 / sett.HUD_RATE)
+
+    def _update_hud(self, dt: float) -> None:
+        self.hud.update(stretch=self.model.stretch)
+
+    def step(self) -> None:
+        """Update PyMunk's Space state."""
+        timers = self.timers
+        timers.begin()
+        self._handle_input()
+        timers.lap("step.input")
+        self.model.step()
+        timers.lap("step.space")
+
+        if self.recorder:
+            tip_x, tip_y = self.model.tip
+            self.recorder.insert(
+                tip_x=tip_x,
+                tip_y=tip_y,
+                input_left=self.keyboard[key.LEFT],
+                input_right=self.keyboard[key.RIGHT],
+            )
+        timers.lap("step.recorder")
+
+    def _handle_input(self) -> None:
+        if self.keyboard[key.LEFT]:
+            self.model.push(acceleration=Vec2d(-self.ACCELERATION, 0))
+        elif self.keyboard[key.RIGHT]:
+            self.model.push(acceleration=Vec2d(self.ACCELERATION, 0))
+
+    def draw_extra(self) -> None:
+        self.hud.draw()
+
+    def on_close(self) -> None:
+        clock.unschedule(self._update_hud)
+        super().on_close()
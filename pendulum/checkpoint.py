@@ -0,0 +1,133 @@
+"""Snapshots of a simulation, to seek and branch from.
+
+A checkpoint file is a sequence of snapshots, appended while the simulation
+runs. Each one has a header, with the step count and the size of the
+payload: the compressed pickle of the objects that make up the state of the
+simulation (e.g. the PyMunk `Space`, the model and the controller). They
+are pickled together, so the restored objects keep referencing each other.
+
+NOTE: Snapshots are pickles, only load the checkpoint files you created.
+"""
+import bisect
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from pendulum import settings as sett
+from pendulum.recorder import Recorder, generate_filename
+
+#: Extension of the checkpoint files, saved next to the recordings
+SUFFIX = ".ckpt"
+
+#: Header of each snapshot: step count and size of the payload
+HEADER = struct.Struct("<QI")
+
+
+def checkpoint_path(prefix: str, recorder: Recorder | None) -> Path:
+    """Checkpoint file next to the recording, if any."""
+    if recorder:
+        return recorder.path.with_suffix(SUFFIX)
+
+    return sett.REC_PATH / generate_filename(prefix=prefix, suffix=SUFFIX)
+
+
+def dumps(steps: int, state: dict[str, Any]) -> bytes:
+    """Payload of a snapshot of the `state`, after `steps` steps."""
+    data = pickle.dumps(
+        {"steps": steps, **state}, protocol=pickle.HIGHEST_PROTOCOL
+    )
+    return zlib.compress(data)
+
+
+def loads(payload: bytes) -> tuple[int, dict[str, Any]]:
+    """Step count and state of a snapshot payload."""
+    state = pickle.loads(zlib.decompress(payload))
+    return state.pop("steps"), state
+
+
+class CheckpointWriter:
+    """Append a snapshot every `interval` (simulated) seconds."""
+
+    def __init__(self, path: Path, interval: float):
+        self.path = path
+        self.interval_steps = max(round(interval / sett.SIMULATION_STEP), 1)
+        self._fd: BinaryIO | None = None
+
+    def due(self, steps: int) -> bool:
+        """Whether a snapshot should be taken after `steps` steps."""
+        return steps % self.interval_steps == 0
+
+    def write(self, steps: int, payload: bytes) -> None:
+        if self._fd is None:
+            path = sett.ensure_path(self.path.parent) / self.path.name
+            self._fd = path.open("ab")
+
+        self._fd.write(HEADER.pack(steps, len(payload)))
+        self._fd.write(payload)
+        # A crash only loses the snapshot being written.
+        self._fd.flush()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self._fd.close()
+            self._fd = None
+
+
+class CheckpointFile:
+    """Snapshots of a checkpoint file, indexed by their step count.
+
+    Only the headers are read when opening the file, the payloads are read
+    on demand. A truncated snapshot, at the end, is ignored.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        #: Step count, offset and size of each snapshot, in order
+        self.index: list[tuple[int, int, int]] = []
+        self._read_index()
+
+    def _read_index(self) -> None:
+        file_size = self.path.stat().st_size
+        with self.path.open("rb") as fd:
+            while header := fd.read(HEADER.size):
+                if len(header) < HEADER.size:
+                    break
+
+                steps, size = HEADER.unpack(header)
+                offset = fd.tell()
+                if offset + size > file_size:
+                    break
+
+                self.index.append((steps, offset, size))
+                fd.seek(size, 1)
+
+    @property
+    def steps(self) -> list[int]:
+        """Step count of each snapshot."""
+        return [steps for steps, _, _ in self.index]
+
+    @property
+    def interval_steps(self) -> int | None:
+        """Steps between snapshots, if there is more than one."""
+        if len(self.index) < 2:
+            return None
+
+        return self.index[1][0] - self.index[0][0]
+
+    def nearest(self, steps: int) -> int:
+        """Position of the latest snapshot taken at or before `steps`."""
+        pos = bisect.bisect_right(self.steps, steps) - 1
+        if pos < 0:
+            raise ValueError(f"No snapshot before step {steps}.")
+
+        return pos
+
+    def read(self, pos: int) -> bytes:
+        """Payload of the snapshot at `pos`."""
+        _, offset, size = self.index[pos]
+        with self.path.open("rb") as fd:
+            fd.seek(offset)
+            return fd.read(size)
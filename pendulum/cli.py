@@ -1,10 +1,13 @@
 """Command Line Interface for the Pendulum application."""
+import json
+from typing import Any
 
 import click
 
-from pendulum.cart.cli import cart
+from pendulum import settings as sett
+from pendulum.cart.cli import cart, load_parameters
+from pendulum.chain.cli import chain
 from pendulum.fixed.cli import fixed
-from pendulum.utils import render_animation
 
 
 @click.group()
@@ -13,10 +16,184 @@ def cli():
 
 
 cli.add_command(cart)
+cli.add_command(chain)
 cli.add_command(fixed)
 
 
 @cli.command()
 @click.option("-n", "--name", help="Custom name to the animation file.")
-def render(name: str):
-    render_animation(name=name)
+@click.option("-w", "--workers", type=int, help="Frame decoding threads.")
+def render(name: str, workers: int | None):
+    """Render the exported frames into an animation."""
+    from pendulum.render import render_animation
+
+    render_animation(name=name, workers=workers)
+
+
+def parse_param(value: str) -> tuple[str, Any]:
+    """Parse a `NAME=VALUE` Parameter filter (values are JSON, if valid)."""
+    name, sep, raw = value.partition("=")
+    if not sep:
+        raise click.BadParameter(f"Expected NAME=VALUE, got '{value}'.")
+
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        return name, raw
+
+    if isinstance(parsed, (list, dict)):
+        raise click.BadParameter(f"Only scalar values can be matched: {raw}.")
+
+    return name, parsed
+
+
+@cli.group()
+def recordings():
+    """Recordings Catalog."""
+
+
+@recordings.command(name="list")
+@click.option("-P", "--prefix", type=click.Choice(["cart", "chain", "fixed"]))
+@click.option("--min-duration", type=float, help="Minimum simulated time.")
+@click.option("--max-duration", type=float, help="Maximum simulated time.")
+@click.option(
+    "--controller/--no-controller",
+    default=None,
+    help="Controller engaged (or not).",
+)
+@click.option(
+    "-q",
+    "--param",
+    "params",
+    multiple=True,
+    metavar="NAME=VALUE",
+    help="Match a Parameter value.",
+)
+@click.option("-n", "--limit", type=int, help="Maximum number of results.")
+@click.option("-S", "--stats", is_flag=True, help="Show field statistics.")
+def list_(
+    prefix: str | None,
+    min_duration: float | None,
+    max_duration: float | None,
+    controller: bool | None,
+    params: tuple[str, ...],
+    limit: int | None,
+    stats: bool,
+):
+    """List Recordings, newest first, filtered by their details."""
+    from pendulum.recorder import open_catalog
+
+    with open_catalog() as catalog:
+        entries = catalog.query(
+            prefix=prefix,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            controller=controller,
+            params=dict(parse_param(value) for value in params),
+            limit=limit,
+        )
+
+    for entry in entries:
+        name_str = click.style(entry.filename, bold=True)
+        click.echo(f"{name_str} - {entry.describe()}")
+        if not stats:
+            continue
+
+        for field, values in entry.stats.items():
+            click.echo(
+                f"    {field}: min {values['min']:.4g}, "
+                f"max {values['max']:.4g}, mean {values['mean']:.4g}"
+            )
+
+
+@recordings.command()
+def sync():
+    """Index new Recording files and forget deleted ones."""
+    from pendulum.recorder import SUFFIXES, open_catalog
+
+    with open_catalog() as catalog:
+        added, removed = catalog.sync(suffixes=SUFFIXES)
+
+    click.secho(f"Added {added}, removed {removed} recordings.", fg="green")
+
+
+@cli.group()
+def profile():
+    """Profile the simulations with cProfile."""
+
+
+@profile.command(name="cart")
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=30.0,
+    help="Simulated time (s). Real time, with a window.",
+)
+@click.option(
+    "-p", "--params", default="initial_angle", help="Parameters File."
+)
+@click.option("-r", "--record", is_flag=True, help="Record simulation data.")
+@click.option(
+    "-w",
+    "--window",
+    is_flag=True,
+    help="Profile the simulation in a window, drawing included. Phase "
+    "timings are saved as well.",
+)
+@click.option(
+    "-s",
+    "--sort",
+    type=click.Choice(["cumulative", "tottime", "ncalls"]),
+    default="cumulative",
+    help="Sort order of the report.",
+)
+@click.option("-n", "--lines", type=int, default=40, help="Report length.")
+def profile_cart(
+    duration: float,
+    params: str,
+    record: bool,
+    window: bool,
+    sort: str,
+    lines: int,
+):
+    """Run the controlled Cart Pendulum and save a cProfile report."""
+    from pendulum.recorder import generate_filename
+    from pendulum.timing import profile_call
+
+    sim_params = load_parameters(params=params)
+    if sim_params is None:
+        return
+
+    if window:
+        # Importing pyglet windows requires a display.
+        import pyglet
+
+        from pendulum.cart.simulator import CartPendulumSim
+
+        sim = CartPendulumSim(
+            record=record,
+            grid=False,
+            export=False,
+            controller=True,
+            params=sim_params,
+            timings=True,
+        )
+        pyglet.clock.schedule_once(lambda dt: sim.on_close(), duration)
+        func = pyglet.app.run
+    else:
+        from pendulum.cart.headless import CartPendulumHeadless
+
+        headless = CartPendulumHeadless(
+            record=record, controller=True, params=sim_params
+        )
+
+        def func():
+            headless.run(duration=duration).echo()
+
+    out_path = sett.ensure_path(sett.PROFILE_PATH) / generate_filename(
+        prefix="cart_profile", suffix=".prof"
+    )
+    profile_call(func, out_path=out_path, sort=sort, lines=lines)
+    click.secho(f"Profile saved to '{out_path}'.", fg="green")
+    click.echo(f"Report: '{out_path.with_suffix('.txt')}'")
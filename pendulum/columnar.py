@@ -0,0 +1,280 @@
+"""Chunked Columnar file format for Simulation Recordings.
+
+Values are buffered into typed columns and written in chunks, instead of
+formatting every row as text. Constant values (e.g. the simulation interval)
+are only stored once, in the header.
+
+File layout (integers are little-endian `uint32`):
+
+    MAGIC
+    header size, JSON header (columns and their dtypes, constants, compression)
+    chunks:
+        number of rows
+        size (in bytes) of each column, in the header order
+        data of each column, optionally compressed
+"""
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Collection, Iterator, Mapping
+
+import numpy as np
+
+MAGIC = b"PNDCOL01"
+
+#: Supported compression algorithms
+COMPRESSION = {
+    "zlib": (zlib.compress, zlib.decompress),
+}
+
+_UINT32 = struct.Struct("<I")
+
+
+class ColumnarWriter:
+    """Write rows into a Chunked Columnar file.
+
+    Column types are inferred from the first row: `bool` values are stored as
+    booleans and everything else as `float64`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Collection[str],
+        constants: Mapping[str, Any] | None = None,
+        compression: str | None = None,
+        chunk_size: int = 4096,
+    ):
+        if compression is not None and compression not in COMPRESSION:
+            raise ValueError(f"Unknown compression: {compression}.")
+
+        self.path = path
+        self.columns = list(columns)
+        self.constants = dict(constants or {})
+        self.compression = compression
+        self.chunk_size = chunk_size
+
+        self._fd: BinaryIO = path.open("wb")
+        self._buffers: dict[str, np.ndarray] | None = None
+        self._rows = 0
+
+    def _write_header(self, dtypes: Mapping[str, np.dtype]) -> None:
+        header = json.dumps(
+            {
+                "columns": [[name, dtypes[name].str] for name in self.columns],
+                "constants": self.constants,
+                "compression": self.compression,
+            }
+        ).encode()
+        self._fd.write(MAGIC)
+        self._fd.write(_UINT32.pack(len(header)))
+        self._fd.write(header)
+
+    def _init_buffers(self, dtypes: Mapping[str, np.dtype]) -> None:
+        self._write_header(dtypes=dtypes)
+        self._buffers = {
+            name: np.empty(self.chunk_size, dtype=dtypes[name])
+            for name in self.columns
+        }
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Append a single row of values."""
+        if self._buffers is None:
+            self._init_buffers(
+                {
+                    name: np.dtype(
+                        bool if isinstance(row[name], bool) else "<f8"
+                    )
+                    for name in self.columns
+                }
+            )
+
+        assert self._buffers is not None
+        for name, buffer in self._buffers.items():
+            buffer[self._rows] = row[name]
+
+        self._rows += 1
+        if self._rows == self.chunk_size:
+            self.flush()
+
+    def extend(self, columns: Mapping[str, np.ndarray]) -> None:
+        """Append the rows of whole column arrays at once."""
+        if self._buffers is None:
+            self._init_buffers(
+                {
+                    name: np.dtype(bool if array.dtype == bool else "<f8")
+                    for name, array in columns.items()
+                }
+            )
+
+        assert self._buffers is not None
+        total = len(columns[self.columns[0]])
+        start = 0
+        while start < total:
+            row_start = self._rows
+            size = min(self.chunk_size - row_start, total - start)
+            end = start + size
+            row_end = row_start + size
+            for name, buffer in self._buffers.items():
+                buffer[row_start:row_end] = columns[name][start:end]
+
+            self._rows = row_end
+            start = end
+            if self._rows == self.chunk_size:
+                self.flush()
+
+    def _write_chunk(self, arrays: list[np.ndarray]) -> None:
+        rows = len(arrays[0])
+        blocks = [array.tobytes() for array in arrays]
+        if self.compression is not None:
+            compress, _ = COMPRESSION[self.compression]
+            blocks = [compress(block) for block in blocks]
+
+        self._fd.write(_UINT32.pack(rows))
+        for block in blocks:
+            self._fd.write(_UINT32.pack(len(block)))
+        for block in blocks:
+            self._fd.write(block)
+
+    def flush(self) -> None:
+        """Write the buffered rows to the file."""
+        if self._buffers is None or not self._rows:
+            return
+
+        rows = self._rows
+        self._write_chunk([buf[:rows] for buf in self._buffers.values()])
+        self._rows = 0
+
+    def close(self) -> None:
+        """Write the remaining rows and close the file."""
+        if self._buffers is None:
+            self._write_header(
+                {name: np.dtype("<f8") for name in self.columns}
+            )
+
+        self.flush()
+        self._fd.close()
+
+
+class ColumnarReader:
+    """Read a Chunked Columnar file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        with path.open("rb") as fd:
+            if fd.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path.name}' is not a Columnar file.")
+
+            (header_size,) = _UINT32.unpack(fd.read(_UINT32.size))
+            header = json.loads(fd.read(header_size))
+            self._chunks = self._index_chunks(
+                fd=fd, n_cols=len(header["columns"])
+            )
+
+        self.dtypes = {
+            name: np.dtype(dtype) for name, dtype in header["columns"]
+        }
+        self.constants: dict[str, Any] = header["constants"]
+        self.compression: str | None = header["compression"]
+
+        self._mmap: np.memmap | None = None
+
+    @staticmethod
+    def _index_chunks(
+        fd: BinaryIO, n_cols: int
+    ) -> list[tuple[int, list[tuple[int, int]]]]:
+        """Locate every chunk, returning its rows and column offsets/sizes."""
+        chunks = []
+        sizes = struct.Struct(f"<{n_cols}I")
+        while raw_rows := fd.read(_UINT32.size):
+            (rows,) = _UINT32.unpack(raw_rows)
+            col_sizes = sizes.unpack(fd.read(sizes.size))
+
+            offset = fd.tell()
+            offsets = []
+            for size in col_sizes:
+                offsets.append((offset, size))
+                offset += size
+
+            chunks.append((rows, offsets))
+            fd.seek(offset)
+
+        return chunks
+
+    def __len__(self) -> int:
+        return sum(rows for rows, _ in self._chunks)
+
+    def read(self, columns: Collection[str] | None = None) -> dict[str, Any]:
+        """Read the values of `columns` (all by default).
+
+        Uncompressed files are memory-mapped: a recording written in a single
+        chunk is returned without copying any data.
+        """
+        names = list(self.dtypes) if columns is None else list(columns)
+        parts: dict[str, list[np.ndarray]] = {name: [] for name in names}
+        for _, chunk in self.iter_chunks(columns=names):
+            for name, values in chunk.items():
+                parts[name].append(values)
+
+        return {
+            name: self._join(name, arrays) for name, arrays in parts.items()
+        }
+
+    def iter_chunks(
+        self,
+        columns: Collection[str] | None = None,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+        """Iterate over the chunks with rows between `start` and `stop`.
+
+        Yields the index of the first row and the values of `columns` (all
+        by default). Chunks outside of the range are not read at all.
+        """
+        names = list(self.dtypes) if columns is None else list(columns)
+        indexes = {name: list(self.dtypes).index(name) for name in names}
+        stop = len(self) if stop is None else stop
+
+        with self.path.open("rb") as fd:
+            first_row = 0
+            for rows, offsets in self._chunks:
+                last_row = first_row + rows
+                if last_row <= start or first_row >= stop:
+                    first_row = last_row
+                    continue
+
+                # Rows of the chunk that are within range
+                begin = max(start - first_row, 0)
+                end = min(stop, last_row) - first_row
+
+                chunk = {}
+                for name, idx in indexes.items():
+                    offset, size = offsets[idx]
+                    block = self._read_block(fd=fd, start=offset, size=size)
+                    chunk[name] = block.view(self.dtypes[name])[begin:end]
+
+                yield first_row + begin, chunk
+                first_row = last_row
+
+    def _read_block(self, fd: BinaryIO, start: int, size: int) -> np.ndarray:
+        if self.compression is None:
+            if self._mmap is None:
+                self._mmap = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+            end = start + size
+            return self._mmap[start:end]
+
+        fd.seek(start)
+        _, decompress = COMPRESSION[self.compression]
+        return np.frombuffer(decompress(fd.read(size)), dtype=np.uint8)
+
+    def _join(self, name: str, arrays: list[np.ndarray]) -> np.ndarray:
+        if not arrays:
+            return np.empty(0, dtype=self.dtypes[name])
+
+        if len(arrays) == 1:
+            return arrays[0]
+
+        return np.concatenate(arrays)
@@ -1,10 +1,8 @@
 """Fixed Pendulum Simulator CLI Commands."""
 import click
-import pyglet
 
-from pendulum.fixed.plot import plot_recording
-from pendulum.fixed.simulator import FixedPendulumSim
-from pendulum.recorder import prompt_recording
+from pendulum import settings as sett
+from pendulum.lazy import LazyChoice
 
 
 @click.group()
@@ -16,16 +14,166 @@ def fixed():
 @click.option("-e", "--export", is_flag=True, help="Export Animation.")
 @click.option("-g", "--grid", is_flag=True, help="Display Grid.")
 @click.option("-r", "--record", is_flag=True, help="Record simulation data.")
-def run(export: bool, grid: bool, record: bool):
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+@click.option(
+    "-t",
+    "--time-factor",
+    type=float,
+    default=sett.TIME_FACTOR,
+    help="Simulated time per real time ('inf' for full speed). Change it "
+    "while running with '[' and ']'.",
+)
+@click.option(
+    "-T",
+    "--timings",
+    is_flag=True,
+    help="Time each phase of the loop, saving the stats on exit. Toggle "
+    "the overlay with 'T'.",
+)
+@click.option(
+    "-S",
+    "--stress",
+    "stress_rate",
+    type=float,
+    default=0.0,
+    help="Fire this many projectiles per (simulated) second.",
+)
+def run(
+    export: bool,
+    grid: bool,
+    record: bool,
+    rec_format: str,
+    time_factor: float,
+    timings: bool,
+    stress_rate: float,
+):
     """Run the simulation."""
-    FixedPendulumSim(record=record, export=export, grid=grid)
+    # Importing pyglet windows requires a display.
+    import pyglet
+
+    from pendulum.fixed.simulator import FixedPendulumSim
+
+    FixedPendulumSim(
+        record=record,
+        export=export,
+        grid=grid,
+        rec_format=rec_format,
+        time_factor=time_factor,
+        timings=timings,
+        stress_rate=stress_rate,
+    )
+    pyglet.app.run()
+
+
+@fixed.command()
+@click.option(
+    "-n",
+    "--count",
+    type=click.IntRange(min=1),
+    default=500,
+    help="Number of pendulums.",
+)
+@click.option(
+    "-s",
+    "--spread",
+    type=float,
+    default=0.001,
+    help="Difference (deg) between the initial angles of the pendulums.",
+)
+@click.option(
+    "-a",
+    "--angle",
+    type=float,
+    default=179.0,
+    help="Initial angle (deg) around which the pendulums are spread.",
+)
+@click.option("-e", "--export", is_flag=True, help="Export Animation.")
+@click.option("-g", "--grid", is_flag=True, help="Display Grid.")
+@click.option(
+    "-t",
+    "--time-factor",
+    type=float,
+    default=sett.TIME_FACTOR,
+    help="Simulated time per real time ('inf' for full speed). Change it "
+    "while running with '[' and ']'.",
+)
+@click.option(
+    "-T",
+    "--timings",
+    is_flag=True,
+    help="Time each phase of the loop, saving the stats on exit. Toggle "
+    "the overlay with 'T'.",
+)
+def ensemble(
+    count: int,
+    spread: float,
+    angle: float,
+    export: bool,
+    grid: bool,
+    time_factor: float,
+    timings: bool,
+):
+    """Run many pendulums at once, with slightly different angles."""
+    # Importing pyglet windows requires a display.
+    import pyglet
+
+    from pendulum.fixed.simulator import FixedEnsembleSim
+
+    FixedEnsembleSim(
+        count=count,
+        spread=spread,
+        angle=angle,
+        grid=grid,
+        export=export,
+        time_factor=time_factor,
+        timings=timings,
+    )
     pyglet.app.run()
 
 
+@fixed.command()
+@click.option(
+    "-d",
+    "--duration",
+    type=float,
+    default=60.0,
+    help="Simulated time (s).",
+)
+@click.option("-r", "--record", is_flag=True, help="Record simulation data.")
+@click.option(
+    "-R",
+    "--rec-format",
+    type=LazyChoice("pendulum.recorder:FORMATS"),
+    default="csv",
+    help="Recording file format.",
+)
+def simulate(duration: float, record: bool, rec_format: str):
+    """Run the simulation without a window, as fast as possible."""
+    from pendulum.fixed.headless import FixedPendulumHeadless
+
+    sim = FixedPendulumHeadless(record=record, rec_format=rec_format)
+    sim.run(duration=duration).echo()
+
+
 @fixed.command()
 @click.option("-H", "--height", type=int, default=1080, help="Plot Height.")
 @click.option("-W", "--width", type=int, default=1920, help="Plot Width.")
-def plot(height: int, width: int):
+@click.option(
+    "--from", "start", type=float, help="Plot from this time (s) onwards."
+)
+@click.option("--to", "stop", type=float, help="Plot up to this time (s).")
+def plot(height: int, width: int, start: float | None, stop: float | None):
     """Plot Recording data."""
+    from pendulum.fixed.plot import plot_recording
+    from pendulum.recorder import prompt_recording
+
     rec_path = prompt_recording(prefix="fixed")
-    plot_recording(path=rec_path, height=height, width=width)
+    plot_recording(
+        path=rec_path, height=height, width=width, start=start, stop=stop
+    )
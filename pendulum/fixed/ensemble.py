@@ -0,0 +1,72 @@
+"""PyMunk model of many Fixed Pendulums with slightly different angles."""
+import colorsys
+import math
+
+import numpy as np
+import pymunk
+
+from pendulum.munk.entities import Entity, Fixed, Pendulums
+
+
+class FixedPendulumEnsemble:
+    """Ensemble of independent Fixed Pendulums, sharing a single space.
+
+    Pendulums have the mass and length of the `FixedPendulumModel`, and
+    initial angles spread around `angle`, to show how sensitive the motion
+    is to them. Pendulums are colored by their initial angle.
+    """
+
+    MASS = 0.100  # kg
+    RADIUS = 6.0  # mm
+    LENGTH = 310.0  # mm
+
+    def __init__(
+        self,
+        space: pymunk.Space,
+        count: int,
+        spread: float,
+        angle: float,
+        width: float,
+    ):
+        self.space = space
+        self.count = count
+
+        #: Initial angles (deg), `spread` degrees apart, centered on `angle`
+        self.initial_angles = angle + spread * (
+            np.arange(count) - (count - 1) / 2
+        )
+
+        self.fixed = Fixed(space=self.space, pos=(width / 2, 360))
+        self.pendulums = Pendulums(
+            space=self.space,
+            fixed=self.fixed,
+            mass=self.MASS,
+            radius=self.RADIUS,
+            length=self.LENGTH,
+            angles=np.radians(self.initial_angles).tolist(),
+            colors=[self._color(idx) for idx in range(count)],
+        )
+
+    def _color(self, idx: int) -> tuple[int, int, int, int]:
+        hue = 0.8 * idx / max(self.count - 1, 1)
+        red, green, blue = colorsys.hsv_to_rgb(hue, 0.8, 1.0)
+        return int(red * 255), int(green * 255), int(blue * 255), 255
+
+    @property
+    def entities(self) -> tuple[Entity, ...]:
+        """Entities to draw, from the back to the front."""
+        return self.pendulums, self.fixed
+
+    @property
+    def angles(self) -> np.ndarray:
+        """Angle (deg) of each pendulum, between -180 and 180."""
+        return np.degrees(self.pendulums.angles)
+
+    @property
+    def divergence(self) -> float:
+        """Circular spread (deg) of the angles, 0 when all are together."""
+        angles = self.pendulums.angles
+        resultant = math.hypot(np.cos(angles).mean(), np.sin(angles).mean())
+        # Rounding can make the resultant length slightly over 1.
+        resultant = min(max(resultant, 1e-12), 1.0)
+        return math.degrees(math.sqrt(2 * math.log(1 / resultant)))
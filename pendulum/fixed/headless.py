@@ -0,0 +1,22 @@
+"""Headless simulation of a Pendulum attached to a fixed point."""
+from pendulum import settings as sett
+from pendulum.fixed.model import FixedPendulumModel
+from pendulum.headless import HeadlessSimulation
+
+
+class FixedPendulumHeadless(HeadlessSimulation):
+    """Fixed Pendulum simulation stepped without a window."""
+
+    REC_PREFIX = "fixed"
+    REC_FIELDS = ("angle",)
+
+    def __init__(self, record: bool, rec_format: str = "csv"):
+        super().__init__(record=record, rec_format=rec_format)
+
+        self.model = FixedPendulumModel(space=self.space, width=self.width)
+
+    def step(self) -> None:
+        self.space.step(sett.SIMULATION_STEP)
+
+        if self.recorder:
+            self.recorder.insert(angle=self.model.angle)
@@ -0,0 +1,50 @@
+"""PyMunk model of a Pendulum attached to a fixed point."""
+import pymunk
+from pymunk import Vec2d
+
+from pendulum import settings as sett
+from pendulum.munk.entities import Circle, Entity, Fixed, Rod
+
+
+class FixedPendulumModel:
+    """Fixed Pendulum PyMunk Model."""
+
+    FORCE = 10  # mN
+
+    def __init__(self, space: pymunk.Space, width: float = sett.WIDTH):
+        self.space = space
+        self.width = width
+
+        self._create_entities()
+        self._create_constraints()
+
+    def _create_entities(self) -> None:
+        self.circle = Circle(
+            space=self.space,
+            mass=0.100,
+            radius=10.0,
+            initial_pos=Vec2d(self.width / 2, 50),
+        )
+        self.fixed = Fixed(space=self.space, pos=(self.width / 2, 360))
+
+    def _create_constraints(self) -> None:
+        self.rod = Rod(space=self.space, a=self.fixed.body, b=self.circle.body)
+
+    @property
+    def entities(self) -> tuple[Entity, ...]:
+        """Entities to draw, from the back to the front."""
+        return self.rod, self.fixed, self.circle
+
+    @property
+    def angle(self) -> float:
+        """Angle (deg) between the Pendulum and the resting location."""
+        return self.vector.get_angle_degrees_between(Vec2d(0, -1))
+
+    @property
+    def vector(self) -> Vec2d:
+        """Pendulum Vector, from Fixed point to the center of the Circle."""
+        return self.circle.body.position - self.fixed.body.position
+
+    def accelerate(self, direction: Vec2d):
+        impulse = self.FORCE * direction.normalized()
+        self.circle.body.apply_impulse_at_local_point(impulse=impulse)
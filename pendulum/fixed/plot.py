@@ -5,16 +5,28 @@ import click
 from plotly import graph_objects as go
 
 from pendulum import settings
-from pendulum.plot import load_recording
+from pendulum.plot import decimate_recording
 
 
-def plot_recording(path: Path, height: int, width: int) -> None:
-    """Plot Recording data."""
-    df = load_recording(path)
+def plot_recording(
+    path: Path,
+    height: int,
+    width: int,
+    start: float | None = None,
+    stop: float | None = None,
+) -> None:
+    """Plot Recording data, between the `start` and `stop` times.
 
+    Data is streamed and decimated to the plot `width`.
+    """
+    data = decimate_recording(
+        path, columns=("angle",), bins=width, start=start, stop=stop
+    )
+
+    t, angle = data["angle"]
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df.index, y=df["angle"], name="Angle (deg)"))
-    plot_path = settings.PLOT_PATH / f"{path.stem}.png"
+    fig.add_trace(go.Scatter(x=t, y=angle, name="Angle (deg)"))
+    plot_path = settings.ensure_path(settings.PLOT_PATH) / f"{path.stem}.png"
     fig.update_layout(
         title="Fixed Pendulum Simulation.",
         autosize=False,
@@ -1,55 +1,12 @@
 """PyMunk simulation of a Pendulum attached to a fixed point."""
-import pymunk
-from pyglet import window
+from pyglet import clock
 from pyglet.window import key
-from pymunk import Vec2d
 
 from pendulum import settings as sett
-from pendulum.munk.entities import Circle, Fixed
+from pendulum.fixed.ensemble import FixedPendulumEnsemble
+from pendulum.fixed.model import FixedPendulumModel
 from pendulum.simulation import BaseSimulation
-
-
-class FixedPendulumModel:
-    """Fixed Pendulum PyMunk Model."""
-
-    FORCE = 10  # mN
-
-    def __init__(self, space: pymunk.Space, window: window.Window):
-        self.space = space
-        self.window = window
-
-        self._create_entities()
-        self._create_constraints()
-
-    def _create_entities(self) -> None:
-        self.circle = Circle(
-            space=self.space,
-            mass=0.100,
-            radius=10.0,
-            initial_pos=Vec2d(640, 50),
-        )
-        self.fixed = Fixed(space=self.space, pos=(640, 360))
-
-    def _create_constraints(self) -> None:
-        rod_joint = pymunk.constraints.PinJoint(
-            a=self.fixed.body,
-            b=self.circle.body,
-        )
-        self.space.add(rod_joint)
-
-    @property
-    def angle(self) -> float:
-        """Angle (deg) between the Pendulum and the resting location."""
-        return self.vector.get_angle_degrees_between(Vec2d(0, -1))
-
-    @property
-    def vector(self) -> Vec2d:
-        """Pendulum Vector, from Fixed point to the center of the Circle."""
-        return self.circle.body.position - self.fixed.body.position
-
-    def accelerate(self, direction: Vec2d):
-        impulse = self.FORCE * direction.normalized()
-        self.circle.body.apply_impulse_at_local_point(impulse=impulse)
+from pendulum.utils import HUD
 
 
 class FixedPendulumSim(BaseSimulation):
@@ -63,19 +20,37 @@ class FixedPendulumSim(BaseSimulation):
         "input_right",
     )
 
-    def __init__(self, record: bool, export: bool, grid: bool):
-        super().__init__(record=record, export=export, grid=grid)
-
-        self.model = FixedPendulumModel(space=self.space, window=self)
+    def __init__(
+        self,
+        record: bool,
+        export: bool,
+        grid: bool,
+        rec_format: str = "csv",
+        time_factor: float = sett.TIME_FACTOR,
+        timings: bool = False,
+        stress_rate: float = 0.0,
+    ):
+        super().__init__(
+            record=record,
+            export=export,
+            grid=grid,
+            rec_format=rec_format,
+            time_factor=time_factor,
+            timings=timings,
+            stress_rate=stress_rate,
+        )
 
-    def update(self, dt: float) -> None:
-        """Update PyMunk's Space state.
+        self.model = FixedPendulumModel(space=self.space, width=self.width)
+        self.renderer.add(*self.model.entities)
 
-        :param float dt: Time between calls of `update`.
-        """
+    def step(self) -> None:
+        """Update PyMunk's Space state."""
+        self.timers.begin()
         self._handle_input(keyboard=self.keyboard)
+        self.timers.lap("step.input")
 
         self.space.step(sett.SIMULATION_STEP)
+        self.timers.lap("step.space")
 
         if self.recorder is not None:
             self.recorder.insert(
@@ -83,6 +58,7 @@ class FixedPendulumSim(BaseSimulation):
                 input_left=self.keyboard[key.LEFT],
                 input_right=self.keyboard[key.RIGHT],
             )
+        self.timers.lap("step.recorder")
 
     def _handle_input(self, keyboard: key.KeyStateHandler) -> None:
         if keyboard[key.LEFT]:
@@ -95,3 +71,70 @@ class FixedPendulumSim(BaseSimulation):
 
     def _accelerate_ccw(self) -> None:
         self.model.accelerate(direction=self.model.vector.rotated_degrees(90))
+
+
+class FixedEnsembleSim(BaseSimulation):
+    """Many Fixed Pendulums, with slightly different initial angles.
+
+    All pendulums share a single space, stepped at once, and are drawn as a
+    single entity.
+    """
+
+    CAPTION = "PyMunk Fixed Pendulum Ensemble"
+
+    REC_PREFIX = "fixed_ensemble"
+
+    HUD_COLOR = 0, 255, 0, 255
+
+    def __init__(
+        self,
+        count: int,
+        spread: float,
+        angle: float,
+        grid: bool = False,
+        export: bool = False,
+        time_factor: float = sett.TIME_FACTOR,
+        timings: bool = False,
+    ):
+        super().__init__(
+            record=False,
+            export=export,
+            grid=grid,
+            time_factor=time_factor,
+            timings=timings,
+        )
+
+        self.model = FixedPendulumEnsemble(
+            space=self.space,
+            count=count,
+            spread=spread,
+            angle=angle,
+            width=self.width,
+        )
+        self.renderer.add(*self.model.entities)
+
+        self.hud: HUD = HUD(
+            window=self,
+            lines=[
+                (f"n: {count}", self.HUD_COLOR),
+                ("spread: {spread:.4f} deg", self.HUD_COLOR),
+            ],
+        )
+        # Reading every pendulum is too slow for each step.
+        clock.schedule_interval(self._update_hud, 1 / sett.HUD_RATE)
+
+    def _update_hud(self, dt: float) -> None:
+        self.hud.update(spread=self.model.divergence)
+
+    def step(self) -> None:
+        """Update PyMunk's Space state."""
+        self.timers.begin()
+        self.space.step(sett.SIMULATION_STEP)
+        self.timers.lap("step.space")
+
+    def draw_extra(self) -> None:
+        self.hud.draw()
+
+    def on_close(self) -> None:
+        clock.unschedule(self._update_hud)
+        super().on_close()
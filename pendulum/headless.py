@@ -0,0 +1,207 @@
+"""Run PyMunk simulations without a window.
+
+Headless simulations are not bound to the pyglet clock: the space is stepped
+as fast as the CPU allows, until the requested (simulated) duration elapses
+or one of the stop conditions is met.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import click
+import pymunk
+
+from pendulum import checkpoint, settings as sett
+from pendulum.recorder import Recorder
+
+#: Check performed on the model after every step. Returns True to stop.
+StopCondition = Callable[[Any], bool]
+
+
+@dataclass
+class RunSummary:
+    """Summary of a Headless Simulation run."""
+
+    steps: int
+    sim_time: float  # s
+    wall_time: float  # s
+    stop_reason: str | None
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per real second."""
+        if not self.wall_time:
+            return float("inf")
+
+        return self.sim_time / self.wall_time
+
+    def echo(self) -> None:
+        """Print the summary to the terminal."""
+        reason = self.stop_reason or "duration"
+        click.secho(f"Stopped by: {reason}", fg="green")
+        click.echo(f" - Steps: {self.steps}")
+        click.echo(f" - Simulated Time: {self.sim_time:.2f} s")
+        click.echo(f" - Wall Time: {self.wall_time:.2f} s")
+        click.echo(f" - Speedup: {self.speedup:.1f}x")
+
+
+class HeadlessSimulation:
+    """Base class for simulations stepped without a window.
+
+    Subclasses create the `model` and implement `step`, the equivalent of
+    `BaseSimulation.update` for a single physics step.
+
+    With `checkpoint_every`, a snapshot of the `STATE_ATTRS` is saved every
+    that many (simulated) seconds, next to the recording (see `seek`).
+    """
+
+    REC_FIELDS: tuple[str, ...]
+    REC_PREFIX: str
+
+    #: Attributes holding the state of the simulation, saved in snapshots
+    STATE_ATTRS: tuple[str, ...] = ("space", "model")
+
+    model: Any
+
+    def __init__(
+        self,
+        record: bool,
+        width: int = sett.WIDTH,
+        rec_format: str = "csv",
+        checkpoint_every: float | None = None,
+    ):
+        assert self.REC_FIELDS, "REC_FIELDS needs to be set."
+
+        self.width = width
+
+        self.recorder = (
+            Recorder(
+                fields=self.REC_FIELDS,
+                prefix=self.REC_PREFIX,
+                rec_format=rec_format,
+            )
+            if record
+            else None
+        )
+
+        self.space = pymunk.Space()
+        self.space.gravity = sett.GRAVITY
+
+        self.conditions: dict[str, StopCondition] = {}
+        self.steps = 0
+
+        self.checkpoints = (
+            checkpoint.CheckpointWriter(
+                path=checkpoint.checkpoint_path(
+                    prefix=self.REC_PREFIX, recorder=self.recorder
+                ),
+                interval=checkpoint_every,
+            )
+            if checkpoint_every
+            else None
+        )
+        #: Steps between the snapshots of the run being followed, if any
+        self.snapshot_steps = (
+            self.checkpoints.interval_steps if self.checkpoints else None
+        )
+
+    @property
+    def elapsed(self) -> float:
+        """Simulated time (s) since the beginning of the simulation."""
+        return self.steps * sett.SIMULATION_STEP
+
+    def add_condition(self, name: str, condition: StopCondition) -> None:
+        """Stop the simulation as soon as `condition` returns True."""
+        self.conditions[name] = condition
+
+    def check_conditions(self) -> str | None:
+        """Return the name of the first condition met, if any."""
+        for name, condition in self.conditions.items():
+            if condition(self.model):
+                return name
+
+        return None
+
+    def run(self, duration: float) -> RunSummary:
+        """Step the simulation for `duration` (simulated) seconds."""
+        start_steps = self.steps
+        total_steps = self.steps + round(duration / sett.SIMULATION_STEP)
+        stop_reason = None
+
+        start = time.perf_counter()
+        try:
+            while self.steps < total_steps:
+                self._advance()
+                stop_reason = self.check_conditions()
+                if stop_reason is not None:
+                    break
+        finally:
+            wall_time = time.perf_counter() - start
+            self.close()
+
+        steps = self.steps - start_steps
+        return RunSummary(
+            steps=steps,
+            sim_time=steps * sett.SIMULATION_STEP,
+            wall_time=wall_time,
+            stop_reason=stop_reason,
+        )
+
+    def snapshot(self) -> bytes:
+        """Payload of a snapshot of the current state."""
+        state = {name: getattr(self, name) for name in self.STATE_ATTRS}
+        return checkpoint.dumps(steps=self.steps, state=state)
+
+    def restore(self, payload: bytes) -> None:
+        """Continue from the state of a snapshot."""
+        self.steps, state = checkpoint.loads(payload)
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _advance(self) -> None:
+        if self.snapshot_steps and self.steps % self.snapshot_steps == 0:
+            self.save_checkpoint()
+
+        self.step()
+        self.steps += 1
+
+    def save_checkpoint(self) -> None:
+        """Take a snapshot, saving it if there is a checkpoint file.
+
+        Restoring drops the warm start of the PyMunk solver, so the run
+        continues from the snapshot too. Seeking to any time, or branching
+        from it without changes, then reproduces the exact same states.
+        """
+        payload = self.snapshot()
+        if self.checkpoints:
+            self.checkpoints.write(steps=self.steps, payload=payload)
+
+        self.restore(payload)
+
+    def seek(self, checkpoints: checkpoint.CheckpointFile, at: float) -> int:
+        """Restore the state at `at` (s), from the nearest snapshot before it.
+
+        Only the remaining steps are simulated. Returns how many.
+        """
+        target = round(at / sett.SIMULATION_STEP)
+        self.restore(checkpoints.read(checkpoints.nearest(target)))
+        restored = self.steps
+
+        self.snapshot_steps = checkpoints.interval_steps
+        while self.steps < target:
+            self._advance()
+
+        return target - restored
+
+    def close(self) -> None:
+        """Release resources held by the simulation."""
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+
+        if self.checkpoints:
+            self.checkpoints.close()
+
+    def step(self) -> None:
+        """Advance the simulation by a single `SIMULATION_STEP`."""
+        raise NotImplementedError
@@ -0,0 +1,34 @@
+"""Defer importing heavy dependencies until they're actually needed.
+
+The CLI modules only import `click` and the settings at the top, so that
+`--help` and short commands don't pay for NumPy, pandas, PyMunk or pyglet.
+Commands import what they use in their own body instead.
+"""
+import importlib
+from functools import cached_property
+from typing import Any
+
+import click
+
+
+def import_object(target: str) -> Any:
+    """Import an object from a `package.module:name` path."""
+    module_name, _, name = target.partition(":")
+    return getattr(importlib.import_module(module_name), name)
+
+
+class LazyChoice(click.Choice):
+    """Choice of the keys (or items) of an object imported on first use.
+
+    The object is only imported once the choices are listed (e.g. by
+    `--help`) or a value is validated.
+    """
+
+    def __init__(self, target: str, case_sensitive: bool = True) -> None:
+        # Not calling super().__init__, which would set `choices`.
+        self.target = target
+        self.case_sensitive = case_sensitive
+
+    @cached_property
+    def choices(self) -> list[str]:  # type: ignore[override]
+        return list(import_object(self.target))
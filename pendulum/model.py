@@ -0,0 +1,235 @@
+"""Equations of motion of the Cart Pendulum, derived with SymPy.
+
+The derivation of `analysis/frictionless_model_with_forcing.ipynb`: the
+Euler-Lagrange equations of a pendulum hanging from a cart, with a
+horizontal force on the cart, solved for the accelerations. The system is
+then differentiated into the Jacobians of the state and input.
+
+Solving them takes seconds, so the expressions are turned into NumPy code
+once and cached on disk, keyed by a hash of the source of the derivation
+and code generation (and the SymPy version). Loading the cached code
+doesn't import SymPy at all.
+
+The state is `[x, v, theta, omega]`, with `theta` measured from the resting
+position (so the inverted one is pi), and the input the force (mN) applied
+to the cart. Every function broadcasts over its arguments.
+"""
+import hashlib
+import importlib.metadata
+import importlib.util
+import inspect
+import itertools
+import os
+from functools import lru_cache
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from pendulum import settings as sett
+
+#: Arguments of the generated functions: state, input and properties
+ARGS = (
+    "x",
+    "v",
+    "theta",
+    "omega",
+    "force",
+    "cart_mass",
+    "circle_mass",
+    "circle_length",
+    "gravity",
+)
+
+#: Inverted position, where the controller linearizes the system
+SET_POINT = (0.0, 0.0, np.pi, 0.0)
+
+#: Gravity acceleration magnitude (mm/s²)
+GRAVITY = -sett.GRAVITY[1]
+
+
+def derive() -> dict[str, Any]:
+    """Derive the accelerations and Jacobians, as SymPy expressions.
+
+    Expressions use plain symbols, named after the `ARGS`.
+    """
+    # Only needed to generate the code, on a cache miss.
+    import sympy as sp
+
+    t = sp.Symbol("t")
+    force, mass, m, length, g = sp.symbols(ARGS[4:])
+    x, theta = sp.Function("x")(t), sp.Function("theta")(t)
+
+    # Pendulum position, hanging down from the cart at theta = 0
+    x_p = x + length * sp.sin(theta)
+    y_p = -length * sp.cos(theta)
+
+    half = sp.Rational(1, 2)
+    kinetic = half * mass * x.diff(t) ** 2
+    kinetic += half * m * (x_p.diff(t) ** 2 + y_p.diff(t) ** 2)
+    potential = m * g * y_p
+    x_eq, theta_eq = sp.euler_equations(kinetic - potential, [x, theta], t)
+
+    # The force on the cart is the generalized force of `x`.
+    x_eq = sp.Eq(x_eq.lhs, -force)
+    accelerations = sp.solve(
+        [x_eq, theta_eq], [x.diff(t, 2), theta.diff(t, 2)]
+    )
+
+    # Replace the functions of time (derivatives first) by plain symbols.
+    state = sp.symbols(ARGS[:4])
+    plain = {
+        theta.diff(t): state[3],
+        x.diff(t): state[1],
+        theta: state[2],
+        x: state[0],
+    }
+    # Expanding sin(2 * theta) shares the sine and cosine of theta.
+    x_ddot, theta_ddot = (
+        sp.expand_trig(accelerations[var.diff(t, 2)].subs(plain).simplify())
+        for var in (x, theta)
+    )
+
+    system = sp.Matrix([state[1], x_ddot, state[3], theta_ddot])
+    return {
+        "x_ddot": x_ddot,
+        "theta_ddot": theta_ddot,
+        "a_jacobian": system.jacobian(state),
+        "b_jacobian": system.jacobian([force]),
+    }
+
+
+def generate_source(expressions: dict[str, Any]) -> str:
+    """Source of a module with a NumPy function per expression.
+
+    Common subexpressions are computed once. Matrices are returned as
+    nested lists of their elements (see `_stack`).
+    """
+    import sympy as sp
+    from sympy.printing.numpy import NumPyPrinter
+
+    printer = NumPyPrinter()
+    lines = [
+        '"""Generated by `pendulum.model`, do not edit."""',
+        "import numpy",
+    ]
+    for name, expression in expressions.items():
+        is_matrix = isinstance(expression, sp.MatrixBase)
+        elements = list(expression) if is_matrix else [expression]
+        replacements, reduced = sp.cse(elements)
+
+        lines += ["", "", f"def {name}({', '.join(ARGS)}):"]
+        for symbol, value in replacements:
+            lines.append(f"    {symbol} = {printer.doprint(value)}")
+
+        printed = iter(printer.doprint(element) for element in reduced)
+        if is_matrix:
+            rows = [
+                f"[{', '.join(itertools.islice(printed, expression.cols))}]"
+                for _ in range(expression.rows)
+            ]
+            lines.append(f"    return [{', '.join(rows)}]")
+        else:
+            lines.append(f"    return {next(printed)}")
+
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def model_key() -> str:
+    """Hash of everything the generated code depends on."""
+    inputs = [
+        inspect.getsource(derive),
+        inspect.getsource(generate_source),
+        importlib.metadata.version("sympy"),
+    ]
+    return hashlib.sha256("\n".join(inputs).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def load() -> ModuleType:
+    """Module with the generated functions, generating it if not cached."""
+    path = sett.MODEL_CACHE_PATH / f"{model_key()}.py"
+    if not path.exists():
+        source = generate_source(derive())
+
+        sett.ensure_path(sett.MODEL_CACHE_PATH)
+        # Replace atomically, as parallel workers may generate it at once.
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(source)
+        tmp_path.replace(path)
+
+    spec = importlib.util.spec_from_file_location("pendulum_model", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _stack(rows: list[list[Any]]) -> np.ndarray:
+    """Array of the generated matrix elements, broadcast to each other.
+
+    Elements that don't depend on the arguments are plain numbers.
+    """
+    elements = np.broadcast_arrays(
+        *(element for row in rows for element in row)
+    )
+    return np.array(elements, dtype=float).reshape(
+        len(rows), len(rows[0]), *elements[0].shape
+    )
+
+
+def _args(
+    state: npt.ArrayLike,
+    force: npt.ArrayLike,
+    cart_mass: npt.ArrayLike,
+    circle_mass: npt.ArrayLike,
+    circle_length: npt.ArrayLike,
+    gravity: float,
+) -> tuple[Any, ...]:
+    """Arguments of the generated functions, in the order of `ARGS`."""
+    return (
+        *np.asarray(state, dtype=float),
+        force,
+        cart_mass,
+        circle_mass,
+        circle_length,
+        gravity,
+    )
+
+
+def accelerations(
+    state: npt.ArrayLike,
+    force: npt.ArrayLike,
+    cart_mass: npt.ArrayLike,
+    circle_mass: npt.ArrayLike,
+    circle_length: npt.ArrayLike,
+    gravity: float = GRAVITY,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Accelerations of the cart (mm/s²) and pendulum (rad/s²).
+
+    `state` has `[x, v, theta, omega]` along its first axis.
+    """
+    generated = load()
+    args = _args(state, force, cart_mass, circle_mass, circle_length, gravity)
+    return generated.x_ddot(*args), generated.theta_ddot(*args)
+
+
+def linearize(
+    cart_mass: float,
+    circle_mass: float,
+    circle_length: float,
+    state: npt.ArrayLike = SET_POINT,
+    force: float = 0.0,
+    gravity: float = GRAVITY,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the A (4, 4) and B (4, 1) matrices about an operating point.
+
+    By default, about the inverted position, with no force applied.
+    """
+    generated = load()
+    args = _args(state, force, cart_mass, circle_mass, circle_length, gravity)
+    a_matrix = _stack(generated.a_jacobian(*args))
+    b_matrix = _stack(generated.b_jacobian(*args))
+    return a_matrix, b_matrix
@@ -1,11 +1,153 @@
 """Main Entities used by PyMunk simulations.
 
-Entities are an abstraction comprised of a PyMunk body and shape.
+Entities are an abstraction comprised of a PyMunk body and shape (or
+constraint). Once attached to a batch, they are drawn from a persistent
+vertex list, whose transform is updated in place from the body.
 """
+import math
+from typing import Any, Sequence
+
+import numpy as np
 import pymunk
 
+from pendulum.munk import state
+
+Color = tuple[int, int, int, int]
+Vertices = list[tuple[float, float]]
+
+#: Same colors as PyMunk's debug draw
+DYNAMIC_COLOR: Color = 52, 152, 219, 255
+OUTLINE_COLOR: Color = 44, 62, 80, 255
+CONSTRAINT_COLOR: Color = 142, 68, 173, 255
+
+#: Width (px) of the rods, rails and outlines
+LINE_WIDTH = 2.0
+
+
+def _line(length: float, width: float = LINE_WIDTH) -> Vertices:
+    """Triangles of a line from the origin along the X axis."""
+    top, bottom = width / 2, -width / 2
+    return [
+        (0, bottom),
+        (length, bottom),
+        (length, top),
+        (0, bottom),
+        (length, top),
+        (0, top),
+    ]
+
+
+def _disk(radius: float) -> Vertices:
+    """Triangles of a disk centered on the origin."""
+    segments = max(14, int(radius / 1.25))
+    points = [
+        (
+            radius * math.cos(2 * math.pi * idx / segments),
+            radius * math.sin(2 * math.pi * idx / segments),
+        )
+        for idx in range(segments + 1)
+    ]
+    vertices: Vertices = []
+    for start, end in zip(points, points[1:]):
+        vertices.extend(((0, 0), start, end))
+
+    return vertices
+
+
+class Entity:
+    """Base of the Entities that can be drawn.
+
+    Subclasses define their geometry around the origin (`_geometry`) and
+    where it's placed (`_transform`). The vertex list is only written when
+    the transform changes, so static entities cost nothing per frame.
+    """
+
+    def __init__(self) -> None:
+        self._vertex_list: Any = None
+        self._colors: list[int] = []
+        self._transform_synced: tuple[float, float, float] | None = None
+        self._visible = True
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Vertex lists live in the GL context: snapshots leave them out, to
+        # be attached again once restored.
+        state = self.__dict__.copy()
+        state.update(_vertex_list=None, _colors=[], _transform_synced=None)
+        return state
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        """Triangles (3 vertices each) and their color, in local space."""
+        raise NotImplementedError
+
+    def _transform(self) -> tuple[float, float, float]:
+        """Position (x, y) and angle (rad) of the local space."""
+        raise NotImplementedError
+
+    def attach(self, batch: Any, group: Any = None) -> None:
+        """Create the vertex list, drawn with the `batch`."""
+        # Headless simulations never draw, so they don't import pyglet.
+        from pyglet import gl, shapes
+
+        position: list[float] = []
+        for vertices, color in self._geometry():
+            for vertex in vertices:
+                position.extend(vertex)
+                self._colors.extend(color)
+
+        count = len(position) // 2
+        self._vertex_list = shapes.get_default_shader().vertex_list(
+            count,
+            gl.GL_TRIANGLES,
+            batch=batch,
+            group=group,
+            position=("f", position),
+            translation=("f", (0.0, 0.0) * count),
+            rotation=("f", (0.0,) * count),
+            colors=("Bn", self._colors),
+        )
+        self._transform_synced = None
+        self.sync()
+
+    def detach(self) -> None:
+        """Release the vertex list."""
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+
+        self._vertex_list = None
+        self._colors = []
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    @visible.setter
+    def visible(self, value: bool) -> None:
+        self._visible = value
+        if self._vertex_list is None:
+            return
+
+        colors = self._colors if value else [0] * len(self._colors)
+        self._vertex_list.colors[:] = colors
+        self._transform_synced = None
+
+    def sync(self) -> None:
+        """Move the vertex list to the current transform of the entity."""
+        if self._vertex_list is None or not self._visible:
+            return
 
-class Circle:
+        transform = self._transform()
+        if transform == self._transform_synced:
+            return
+
+        self._transform_synced = transform
+        x, y, angle = transform
+        count = self._vertex_list.count
+        self._vertex_list.translation[:] = (x, y) * count
+        # The shader rotates clockwise, in degrees.
+        self._vertex_list.rotation[:] = (-math.degrees(angle),) * count
+
+
+class Circle(Entity):
     """Circle that sits on the end of the pendulum rod."""
 
     def __init__(
@@ -14,11 +156,13 @@ class Circle:
         mass: float,
         radius: float,
         initial_pos: pymunk.Vec2d = pymunk.Vec2d(0, 0),
-        color: tuple[int, int, int, int] | None = None,
+        color: Color | None = None,
     ):
+        super().__init__()
         self.mass = mass
         self.radius = radius
         self.initial_pos = initial_pos
+        self.color = color or DYNAMIC_COLOR
 
         self.moment = pymunk.moment_for_circle(
             mass=self.mass, inner_radius=0, outer_radius=self.radius
@@ -32,8 +176,19 @@ class Circle:
 
         space.add(self.body, self.shape)
 
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        # The radius shows the rotation, as in the debug draw.
+        return [
+            (_disk(radius=self.radius), self.color),
+            (_line(length=self.radius, width=1.0), OUTLINE_COLOR),
+        ]
+
+    def _transform(self) -> tuple[float, float, float]:
+        x, y = self.body.position
+        return x, y, self.body.angle
 
-class Cart:
+
+class Cart(Entity):
     """Cart that carries the Pendulum."""
 
     def __init__(
@@ -43,6 +198,7 @@ class Cart:
         size: tuple[float, float],
         initial_pos: pymunk.Vec2d = pymunk.Vec2d(0, 0),
     ):
+        super().__init__()
         self.mass = mass
         self.size = size
         self.initial_pos = initial_pos
@@ -55,16 +211,262 @@ class Cart:
 
         space.add(self.body, self.shape)
 
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        a, b, c, d = self.shape.get_vertices()
+        return [([a, b, c, a, c, d], DYNAMIC_COLOR)]
+
+    def _transform(self) -> tuple[float, float, float]:
+        x, y = self.body.position
+        return x, y, self.body.angle
+
 
-class Fixed:
+class Fixed(Entity):
     """Fixed point in the space."""
 
+    #: Radius of the dot marking the point
+    RADIUS = 4.0
+
     def __init__(
         self,
         space: pymunk.Space,
         pos: tuple[float, float] = (0, 0),
     ):
+        super().__init__()
         self.pos = pos
 
         self.body: pymunk.Body = space.static_body
         self.body.position = pos
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        return [(_disk(radius=self.RADIUS), CONSTRAINT_COLOR)]
+
+    def _transform(self) -> tuple[float, float, float]:
+        x, y = self.body.position
+        return x, y, 0.0
+
+
+class Rod(Entity):
+    """Rigid rod pinning the centers of two bodies."""
+
+    def __init__(self, space: pymunk.Space, a: pymunk.Body, b: pymunk.Body):
+        super().__init__()
+        self.joint = pymunk.PinJoint(a=a, b=b)
+        space.add(self.joint)
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        return [(_line(length=self.joint.distance), CONSTRAINT_COLOR)]
+
+    def _transform(self) -> tuple[float, float, float]:
+        ax, ay = self.joint.a.position
+        bx, by = self.joint.b.position
+        return ax, ay, math.atan2(by - ay, bx - ax)
+
+
+class Rail(Entity):
+    """Straight rail the center of a body slides along."""
+
+    def __init__(
+        self,
+        space: pymunk.Space,
+        body: pymunk.Body,
+        start: tuple[float, float],
+        end: tuple[float, float],
+    ):
+        super().__init__()
+        self.start = pymunk.Vec2d(*start)
+        self.end = pymunk.Vec2d(*end)
+
+        self.joint = pymunk.GrooveJoint(
+            a=space.static_body,
+            b=body,
+            groove_a=self.start,
+            groove_b=self.end,
+            anchor_b=(0, 0),
+        )
+        space.add(self.joint)
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        length = self.start.get_distance(self.end)
+        return [(_line(length=length), CONSTRAINT_COLOR)]
+
+    def _transform(self) -> tuple[float, float, float]:
+        return self.start.x, self.start.y, (self.end - self.start).angle
+
+    def draw(self) -> None:
+        """Draw the rail right away, as it never moves (see `StaticLayers`)."""
+        from pyglet import shapes
+
+        shapes.Line(
+            *self.start,
+            *self.end,
+            width=LINE_WIDTH,
+            color=CONSTRAINT_COLOR,
+        ).draw()
+
+
+class Link(Entity):
+    """Rigid link of a chain: a circle hanging from a rod.
+
+    The body sits on the circle and turns with the link, pivoting at the
+    other end of the rod, on the `anchor` of the `parent` body (in its own
+    coordinates). The `angle` of the link is 0 when hanging down.
+
+    With `damping`, a damped rotary spring, without stiffness, resists the
+    rotation of the link relative to its parent.
+    """
+
+    def __init__(
+        self,
+        space: pymunk.Space,
+        parent: pymunk.Body,
+        mass: float,
+        radius: float,
+        length: float,
+        angle: float = 0.0,
+        anchor: tuple[float, float] = (0, 0),
+        damping: float = 0.0,
+        shape_filter: pymunk.ShapeFilter = pymunk.ShapeFilter(),
+    ):
+        super().__init__()
+        self.mass = mass
+        self.radius = radius
+        self.length = length
+
+        moment = pymunk.moment_for_circle(
+            mass=mass, inner_radius=0, outer_radius=radius
+        )
+        self.body = pymunk.Body(mass=mass, moment=moment)
+        pivot = parent.local_to_world(anchor)
+        self.body.position = pivot + pymunk.Vec2d(0, -length).rotated(angle)
+        self.body.angle = angle
+
+        self.shape = pymunk.Circle(body=self.body, radius=radius)
+        self.shape.filter = shape_filter
+
+        self.joint = pymunk.PivotJoint(parent, self.body, anchor, (0, length))
+        space.add(self.body, self.shape, self.joint)
+
+        if damping:
+            self.damper = pymunk.DampedRotarySpring(
+                parent, self.body, 0.0, 0.0, damping
+            )
+            space.add(self.damper)
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        # Turned to go up from the circle, to the pivot.
+        rod = [(-y, x) for x, y in _line(length=self.length)]
+        return [(rod, CONSTRAINT_COLOR), (_disk(self.radius), DYNAMIC_COLOR)]
+
+    def _transform(self) -> tuple[float, float, float]:
+        x, y = self.body.position
+        return x, y, self.body.angle
+
+
+class Chain(Entity):
+    """Links of a chain, drawn as a single entity.
+
+    The vertices of every link are moved at once, from the positions and
+    angles of all the links, read in bulk.
+    """
+
+    def __init__(self, links: Sequence[Link]):
+        super().__init__()
+        self.links = links
+        self.bodies = [link.body for link in links]
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        return [part for link in self.links for part in link._geometry()]
+
+    def _transform(self) -> tuple[float, float, float]:
+        return 0.0, 0.0, 0.0
+
+    def sync(self) -> None:
+        if self._vertex_list is None or not self._visible:
+            return
+
+        # Links share the geometry, so they have the same number of vertices.
+        per_link = self._vertex_list.count // len(self.links)
+        translation = np.ctypeslib.as_array(self._vertex_list.translation)
+        translation[:] = np.repeat(
+            state.positions(self.bodies), per_link, axis=0
+        ).ravel()
+        rotation = np.ctypeslib.as_array(self._vertex_list.rotation)
+        rotation[:] = np.repeat(
+            -np.degrees(state.angles(self.bodies)), per_link
+        )
+
+
+class Pendulums(Entity):
+    """Pendulums hanging from the same fixed point, as a single entity.
+
+    The circles have no shapes: they don't collide with each other, nor pay
+    for the collision detection, which would pair up every overlapping
+    circle. All of them are drawn from a single vertex list, rods first,
+    in the local space of each rod, so only the rotations change.
+    """
+
+    #: Alpha of the rods, which pile up while the pendulums are together
+    ROD_ALPHA = 40
+
+    def __init__(
+        self,
+        space: pymunk.Space,
+        fixed: Fixed,
+        mass: float,
+        radius: float,
+        length: float,
+        angles: Sequence[float],
+        colors: Sequence[Color],
+    ):
+        super().__init__()
+        self.fixed = fixed
+        self.radius = radius
+        self.length = length
+        self.colors = colors
+
+        moment = pymunk.moment_for_circle(
+            mass=mass, inner_radius=0, outer_radius=radius
+        )
+        resting = pymunk.Vec2d(0, -length)
+        self.bodies = []
+        for angle in angles:
+            body = pymunk.Body(mass=mass, moment=moment)
+            body.position = fixed.body.position + resting.rotated(angle)
+            space.add(body, pymunk.PinJoint(a=fixed.body, b=body))
+            self.bodies.append(body)
+
+        self._rod_vertices = len(_line(length=length))
+        self._circle_vertices = len(_disk(radius=radius))
+
+    @property
+    def count(self) -> int:
+        return len(self.bodies)
+
+    @property
+    def angles(self) -> np.ndarray:
+        """Angle (rad) of each pendulum, from the resting location."""
+        offsets = state.positions(self.bodies) - self.fixed.body.position
+        return np.arctan2(offsets[:, 0], -offsets[:, 1])
+
+    def _geometry(self) -> list[tuple[Vertices, Color]]:
+        # Rods and circles lie along the X axis, rotated by the sync.
+        rod = _line(length=self.length)
+        circle = [(x + self.length, y) for x, y in _disk(radius=self.radius)]
+        rods = [(rod, (*c[:3], self.ROD_ALPHA)) for c in self.colors]
+        return rods + [(circle, color) for color in self.colors]
+
+    def _transform(self) -> tuple[float, float, float]:
+        x, y = self.fixed.body.position
+        return x, y, 0.0
+
+    def sync(self) -> None:
+        if self._vertex_list is None or not self._visible:
+            return
+
+        super().sync()
+        # Angles from the X axis, clockwise in degrees, as in the shader.
+        degrees = -np.degrees(self.angles - np.pi / 2)
+        rotation = np.ctypeslib.as_array(self._vertex_list.rotation)
+        rods = self.count * self._rod_vertices
+        rotation[:rods] = np.repeat(degrees, self._rod_vertices)
+        rotation[rods:] = np.repeat(degrees, self._circle_vertices)
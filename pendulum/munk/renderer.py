@@ -0,0 +1,51 @@
+"""Draw the Entities of a simulation with a single batch."""
+from pyglet import gl, graphics, shapes
+
+from pendulum.munk.entities import Entity
+
+
+class EntitiesGroup(graphics.Group):
+    """Draw alpha blended triangles with the default shader of `shapes`."""
+
+    def __init__(self, parent: graphics.Group | None = None):
+        super().__init__(parent=parent)
+        self.program = shapes.get_default_shader()
+
+    def set_state(self) -> None:
+        self.program.use()
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+    def unset_state(self) -> None:
+        gl.glDisable(gl.GL_BLEND)
+        self.program.stop()
+
+
+class EntityRenderer:
+    """Keep the vertex lists of the entities and draw them at once.
+
+    Instead of building every shape and constraint again on each frame,
+    like `space.debug_draw`, entities are attached once and only their
+    transform is updated before drawing. Entities are drawn in the order
+    they were added.
+    """
+
+    def __init__(self) -> None:
+        self.batch = graphics.Batch()
+        self.group = EntitiesGroup()
+        self.entities: list[Entity] = []
+
+    def add(self, *entities: Entity) -> None:
+        for entity in entities:
+            entity.attach(batch=self.batch, group=self.group)
+            self.entities.append(entity)
+
+    def remove(self, entity: Entity) -> None:
+        entity.detach()
+        self.entities.remove(entity)
+
+    def draw(self) -> None:
+        for entity in self.entities:
+            entity.sync()
+
+        self.batch.draw()
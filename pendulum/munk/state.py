@@ -0,0 +1,39 @@
+"""Read the state of many bodies at once, into NumPy arrays.
+
+PyMunk only exposes the state of each body through its own properties, so
+the values are chained into a single iterator and copied by NumPy, without
+creating an intermediate list or array per body.
+"""
+import itertools
+from typing import Sequence
+
+import numpy as np
+import pymunk
+
+
+def positions(bodies: Sequence[pymunk.Body]) -> np.ndarray:
+    """Position of each body, as a (count, 2) array."""
+    coords = itertools.chain.from_iterable(b.position for b in bodies)
+    array = np.fromiter(coords, dtype=float, count=2 * len(bodies))
+    return array.reshape(len(bodies), 2)
+
+
+def velocities(bodies: Sequence[pymunk.Body]) -> np.ndarray:
+    """Velocity of each body, as a (count, 2) array."""
+    coords = itertools.chain.from_iterable(b.velocity for b in bodies)
+    array = np.fromiter(coords, dtype=float, count=2 * len(bodies))
+    return array.reshape(len(bodies), 2)
+
+
+def angles(bodies: Sequence[pymunk.Body]) -> np.ndarray:
+    """Angle (rad) of each body."""
+    return np.fromiter(
+        (b.angle for b in bodies), dtype=float, count=len(bodies)
+    )
+
+
+def angular_velocities(bodies: Sequence[pymunk.Body]) -> np.ndarray:
+    """Angular velocity (rad/s) of each body."""
+    return np.fromiter(
+        (b.angular_velocity for b in bodies), dtype=float, count=len(bodies)
+    )
@@ -1,15 +1,199 @@
 """Plot Simulation data."""
+from functools import partial
 from pathlib import Path
+from typing import Collection, Iterator
 
+import numpy as np
 import pandas as pd
 
+from pendulum import settings as sett
+from pendulum.columnar import ColumnarReader
+from pendulum.recorder import ColumnarBackend
 
-def load_recording(path: Path) -> pd.DataFrame:
+#: Rows read at once when streaming CSV Recordings
+CHUNK_SIZE = 65536
+
+
+def load_recording(
+    path: Path, columns: Collection[str] | None = None
+) -> pd.DataFrame:
     """Load Recording data as a DataFrame.
 
     Dataframe is indexed with the elapsed time from the beginning of the
-    simulation, using the defined `interval` as the step.
+    simulation, using the defined `interval` as the step. Only `columns` are
+    loaded, if defined.
+
+    Columnar recordings are memory-mapped, and their constants are available
+    in `DataFrame.attrs`.
     """
-    df = pd.read_csv(filepath_or_buffer=path)
-    df.index = pd.Index(df.index * df["interval"])
+    if path.suffix != ColumnarBackend.SUFFIX:
+        usecols = None if columns is None else ["interval", *columns]
+        df = pd.read_csv(filepath_or_buffer=path, usecols=usecols)
+        df.index = pd.Index(df.index * df["interval"])
+        return df
+
+    reader = ColumnarReader(path=path)
+    interval = reader.constants["interval"]
+    df = pd.DataFrame(reader.read(columns=columns), copy=False)
+    df.index = pd.Index(np.arange(len(df)) * interval)
+    df.attrs.update(reader.constants)
     return df
+
+
+def recording_info(path: Path) -> tuple[float, int]:
+    """Return the `interval` and the number of entries of a Recording.
+
+    CSV files are not parsed, only their lines are counted.
+    """
+    if path.suffix == ColumnarBackend.SUFFIX:
+        reader = ColumnarReader(path=path)
+        return reader.constants["interval"], len(reader)
+
+    first = pd.read_csv(filepath_or_buffer=path, usecols=["interval"], nrows=1)
+    if first.empty:
+        return sett.SIMULATION_STEP, 0
+
+    with path.open("rb") as fd:
+        blocks = iter(partial(fd.read, 1 << 20), b"")
+        lines = sum(block.count(b"\n") for block in blocks)
+
+    return float(first["interval"].iloc[0]), lines - 1
+
+
+def recording_columns(path: Path) -> list[str]:
+    """Return the names of the columns of a Recording."""
+    if path.suffix == ColumnarBackend.SUFFIX:
+        return list(ColumnarReader(path=path).dtypes)
+
+    return list(pd.read_csv(filepath_or_buffer=path, nrows=0).columns)
+
+
+def iter_recording(
+    path: Path,
+    columns: Collection[str],
+    start: float | None = None,
+    stop: float | None = None,
+) -> Iterator[tuple[np.ndarray, dict[str, np.ndarray]]]:
+    """Iterate over a Recording in chunks, without loading it entirely.
+
+    Yields the elapsed time and the values of `columns` of each chunk. Only
+    entries between the `start` and `stop` times (in seconds) are read.
+    """
+    interval, length = recording_info(path=path)
+    first = 0 if start is None else max(int(np.ceil(start / interval)), 0)
+    last = length if stop is None else min(int(stop / interval) + 1, length)
+    if first >= last:
+        return
+
+    if path.suffix == ColumnarBackend.SUFFIX:
+        reader = ColumnarReader(path=path)
+        for row, chunk in reader.iter_chunks(columns, start=first, stop=last):
+            size = len(next(iter(chunk.values())))
+            yield np.arange(row, row + size) * interval, chunk
+
+        return
+
+    chunks = pd.read_csv(
+        filepath_or_buffer=path,
+        header=None,
+        names=recording_columns(path=path),
+        usecols=list(columns),
+        skiprows=first + 1,
+        nrows=last - first,
+        chunksize=CHUNK_SIZE,
+    )
+    row = first
+    for df in chunks:
+        yield (
+            np.arange(row, row + len(df)) * interval,
+            {name: df[name].to_numpy() for name in columns},
+        )
+        row += len(df)
+
+
+class MinMaxDecimator:
+    """Reduce a stream of samples to the minimum and maximum of each bin.
+
+    Bins split the time window evenly so, with one bin per pixel, a plot
+    keeps the peaks of the signal with at most two points per pixel.
+    """
+
+    def __init__(self, start: float, stop: float, bins: int):
+        self.start = start
+        self.bins = bins
+        # An empty window (a single sample) still needs a non-zero width.
+        self.bin_width = max(stop - start, 1e-9) / bins
+
+        self._min = np.full(bins, np.inf)
+        self._min_t = np.full(bins, np.nan)
+        self._max = np.full(bins, -np.inf)
+        self._max_t = np.full(bins, np.nan)
+
+    def update(self, t: np.ndarray, y: np.ndarray) -> None:
+        """Add the samples `y`, taken at times `t`."""
+        y = np.asarray(y, dtype=float)
+        valid = ~np.isnan(y)
+        t, y = t[valid], y[valid]
+        if not len(y):
+            return
+
+        idx = ((t - self.start) / self.bin_width).astype(np.intp)
+        np.clip(idx, 0, self.bins - 1, out=idx)
+
+        # Sort by bin, then value: the first sample of each bin is its
+        # minimum and the last one is its maximum.
+        order = np.lexsort((y, idx))
+        sorted_idx = idx[order]
+        first = np.empty(len(order), dtype=bool)
+        first[0] = True
+        np.not_equal(sorted_idx[1:], sorted_idx[:-1], out=first[1:])
+        last = np.roll(first, -1)
+
+        bins = sorted_idx[first]
+        self._merge(bins, t, y, order[first], self._min, self._min_t, np.less)
+        self._merge(
+            bins, t, y, order[last], self._max, self._max_t, np.greater
+        )
+
+    @staticmethod
+    def _merge(bins, t, y, pos, values, times, better) -> None:
+        update = better(y[pos], values[bins])
+        values[bins[update]] = y[pos[update]]
+        times[bins[update]] = t[pos[update]]
+
+    def points(self) -> tuple[np.ndarray, np.ndarray]:
+        """Time and value of the kept samples, sorted by time."""
+        filled = ~np.isnan(self._min_t)
+        t = np.concatenate((self._min_t[filled], self._max_t[filled]))
+        y = np.concatenate((self._min[filled], self._max[filled]))
+
+        # Bins with a single sample keep it as both minimum and maximum.
+        t, unique = np.unique(t, return_index=True)
+        return t, y[unique]
+
+
+def decimate_recording(
+    path: Path,
+    columns: Collection[str],
+    bins: int,
+    start: float | None = None,
+    stop: float | None = None,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Stream a Recording, reducing each column to `bins` min/max pairs.
+
+    Returns the time and values of the kept samples of each column.
+    """
+    interval, length = recording_info(path=path)
+    duration = max(length - 1, 0) * interval
+    window_start = 0.0 if start is None else max(start, 0.0)
+    window_stop = duration if stop is None else min(stop, duration)
+
+    decimators = {
+        name: MinMaxDecimator(start=window_start, stop=window_stop, bins=bins)
+        for name in columns
+    }
+    for t, chunk in iter_recording(path, columns, start=start, stop=stop):
+        for name, decimator in decimators.items():
+            decimator.update(t=t, y=chunk[name])
+
+    return {name: dec.points() for name, dec in decimators.items()}
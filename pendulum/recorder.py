@@ -1,37 +1,51 @@
 """Record data from simulation."""
 import csv
+import dataclasses
+import itertools
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Collection
+from typing import Any, Collection
 
 import click
+import numpy as np
 from click import UsageError
 from click.exceptions import Exit
 
 from pendulum import settings as sett
+from pendulum.background import BackgroundWriter
+from pendulum.catalog import Catalog, CatalogEntry, FieldStats
+from pendulum.columnar import ColumnarWriter
 
+#: Timestamp of the filenames, with microseconds so that files started in
+#: the same second don't overwrite each other
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H:%M:%S.%f"
 
-def generate_filename(prefix: str) -> str:
-    """Generate filename with Prefix and Timestamp."""
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-    return f"{prefix}_{timestamp}.csv"
+#: Timestamp of the filenames generated before, in whole seconds
+SECONDS_FORMAT = "%Y-%m-%d_%H:%M:%S"
 
 
-def list_recordings(prefix: str) -> list[Path]:
-    """Return list of all Recording files related to `prefix`."""
-    return list(sett.REC_PATH.glob(f"{prefix}_*.csv"))
+def generate_filename(prefix: str, suffix: str = ".csv") -> str:
+    """Generate filename with Prefix and Timestamp."""
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    return f"{prefix}_{timestamp}{suffix}"
 
 
 def parse_filename(path: Path) -> datetime:
     """Parse filename into a timestamp."""
     ts = path.stem.split("_", maxsplit=1)[1]
-    return datetime.strptime(ts, "%Y-%m-%d_%H:%M:%S")
+    return datetime.strptime(
+        ts, TIMESTAMP_FORMAT if "." in ts else SECONDS_FORMAT
+    )
 
 
 def prompt_recording(prefix: str) -> Path:
     """Print a list of recordings and prompt user for selection."""
-    recordings = sorted(list_recordings(prefix=prefix), reverse=True)
+    recordings = []
+    if sett.REC_PATH.exists():
+        with open_catalog() as catalog:
+            recordings = catalog.query(prefix=prefix)
+
     if not recordings:
         msg = f'There are no "{prefix}" recordings available.'
         click.secho(msg, fg="bright_red")
@@ -39,18 +53,18 @@ def prompt_recording(prefix: str) -> Path:
 
     if len(recordings) == 1:
         click.secho("Selecting only recording available.", fg="yellow")
-        return recordings[0]
+        return check_recording(entry=recordings[0])
 
     click.echo()
     click.secho(f'Available "{prefix}" recordings:', underline=True)
-    for idx, rec_path in enumerate(recordings):
+    for idx, entry in enumerate(recordings):
         idx_str = click.style(idx, bold=True)
-        ts_str = click.style(parse_filename(path=rec_path), fg="green")
-        click.echo(f"[{idx_str}] - {ts_str}")
+        desc_str = click.style(entry.describe(), fg="green")
+        click.echo(f"[{idx_str}] - {desc_str}")
 
     def value_proc(value: str) -> Path:
         try:
-            return recordings[int(value)]
+            return check_recording(entry=recordings[int(value)])
         except (IndexError, ValueError):
             raise UsageError(f"Invalid recording index: {value}.")
 
@@ -58,30 +72,199 @@ def prompt_recording(prefix: str) -> Path:
     return click.prompt("Select", value_proc=value_proc, default=0)
 
 
-class Recorder:
-    """Record data from simulation into CSV file."""
+def check_recording(entry: CatalogEntry) -> Path:
+    """Make sure the file of a Catalog entry still exists."""
+    if not entry.path.exists():
+        msg = f"Recording '{entry.filename}' was deleted. Sync the catalog."
+        raise UsageError(msg)
+
+    return entry.path
+
+
+class CSVBackend:
+    """Write each row as a line of a CSV file."""
 
-    def __init__(self, fields: Collection[str], prefix: str):
-        if not sett.REC_PATH.exists():
-            click.secho("Creating Recordings path.", fg="yellow")
-            sett.REC_PATH.mkdir()
+    SUFFIX = ".csv"
 
-        file_path = sett.REC_PATH / generate_filename(prefix=prefix)
-        self.csv_file = file_path.open("w")
+    def __init__(self, path: Path, fields: Collection[str]):
+        self.csv_file = path.open("w")
 
-        fieldnames = ["ts", "interval"]
-        fieldnames.extend(fields)
-        self.writer = csv.DictWriter(self.csv_file, fieldnames=fieldnames)
+        self.fieldnames = ["ts", "interval"]
+        self.fieldnames.extend(fields)
+        self.writer = csv.DictWriter(self.csv_file, fieldnames=self.fieldnames)
         self.writer.writeheader()
 
+        self.rows_writer = csv.writer(self.csv_file)
+
+    def insert(self, row: dict[str, Any]) -> None:
+        row["interval"] = sett.SIMULATION_STEP
+        self.writer.writerow(row)
+
+    def insert_block(self, columns: dict[str, np.ndarray]) -> None:
+        values = [
+            columns[name].tolist()
+            if name != "interval"
+            else itertools.repeat(sett.SIMULATION_STEP)
+            for name in self.fieldnames
+        ]
+        self.rows_writer.writerows(zip(*values))
+
+    def close(self) -> None:
+        self.csv_file.close()
+
+
+class ColumnarBackend:
+    """Write rows into a (binary) Chunked Columnar file."""
+
+    SUFFIX = ".col"
+    COMPRESSION: str | None = None
+
+    def __init__(self, path: Path, fields: Collection[str]):
+        self.writer = ColumnarWriter(
+            path=path,
+            columns=["ts", *fields],
+            constants={"interval": sett.SIMULATION_STEP},
+            compression=self.COMPRESSION,
+        )
+
+    def insert(self, row: dict[str, Any]) -> None:
+        self.writer.append(row)
+
+    def insert_block(self, columns: dict[str, np.ndarray]) -> None:
+        self.writer.extend(columns)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class CompressedColumnarBackend(ColumnarBackend):
+    """Columnar Backend with compressed chunks."""
+
+    COMPRESSION = "zlib"
+
+
+#: Available Recording formats
+FORMATS: dict[str, type[CSVBackend] | type[ColumnarBackend]] = {
+    "csv": CSVBackend,
+    "columnar": ColumnarBackend,
+    "columnar-zlib": CompressedColumnarBackend,
+}
+
+
+#: Recording format of each file suffix (the first one that uses it)
+SUFFIXES = {
+    backend.SUFFIX: name for name, backend in reversed(FORMATS.items())
+}
+
+
+def open_catalog() -> Catalog:
+    """Open the Recordings Catalog, indexing existing files if it's new."""
+    sett.ensure_path(sett.REC_PATH)
+    is_new = not sett.CATALOG_PATH.exists()
+    catalog = Catalog(path=sett.CATALOG_PATH)
+    if is_new:
+        catalog.sync(suffixes=SUFFIXES)
+
+    return catalog
+
+
+class Recorder:
+    """Record data from simulation into a file.
+
+    The file format is defined by `rec_format` (see `FORMATS`).
+
+    With `background` enabled, inserted entries are only buffered in memory
+    and a separate thread writes them to the file (see `BackgroundWriter`).
+
+    When closed, the Recording is added to the Catalog, along with summary
+    statistics of its fields and the details set with `describe`.
+    """
+
+    def __init__(
+        self,
+        fields: Collection[str],
+        prefix: str,
+        rec_format: str = "csv",
+        background: bool = False,
+        policy: str = sett.REC_BUFFER_POLICY,
+    ):
+        sett.ensure_path(sett.REC_PATH)
+        self.prefix = prefix
+        self.rec_format = rec_format
+
+        backend = FORMATS[rec_format]
+        filename = generate_filename(prefix=prefix, suffix=backend.SUFFIX)
+        self.path = sett.REC_PATH / filename
+        self.backend = backend(path=self.path, fields=fields)
+
+        self.stats = FieldStats(fields=fields)
+        self.started: float | None = None
+        self.controller: bool | None = None
+        self.params: dict[str, Any] = {}
+
+        self.writer = (
+            BackgroundWriter(
+                write=self._write_block,
+                fields=["ts", *fields],
+                policy=policy,
+            )
+            if background
+            else None
+        )
+
+    def describe(self, controller: bool, params: Any = None) -> None:
+        """Set the simulation details stored in the Catalog."""
+        self.controller = controller
+        if params is not None:
+            self.params = dataclasses.asdict(params)
+
     def insert(self, **kwargs):
         """Insert data entry.
 
         Timestamp is inserted automatically.
         """
-        row = dict(ts=time.time(), interval=sett.SIMULATION_STEP, **kwargs)
-        self.writer.writerow(row)
+        row = dict(ts=time.time(), **kwargs)
+        if self.started is None:
+            self.started = row["ts"]
+
+        if self.writer:
+            self.writer.insert(row)
+        else:
+            self.stats.update_row(row)
+            self.backend.insert(row)
+
+    def _write_block(self, columns: dict[str, np.ndarray]) -> None:
+        self.stats.update_block(columns)
+        self.backend.insert_block(columns)
 
     def close(self):
-        """Close file."""
-        self.csv_file.close()
+        """Write any buffered entries, close file and update the Catalog.
+
+        The Recording is added to the Catalog even if writing failed, with
+        the entries written until then.
+        """
+        try:
+            if self.writer:
+                self.writer.close()
+                if self.writer.dropped:
+                    msg = f"Recording dropped {self.writer.dropped} entries."
+                    click.secho(msg, fg="bright_red")
+        finally:
+            self.backend.close()
+
+            with open_catalog() as catalog:
+                catalog.add(self.entry())
+
+    def entry(self) -> CatalogEntry:
+        """Catalog entry of the Recording."""
+        return CatalogEntry(
+            filename=self.path.name,
+            prefix=self.prefix,
+            format=self.rec_format,
+            started=self.started or time.time(),
+            duration=self.stats.count * sett.SIMULATION_STEP,
+            samples=self.stats.count,
+            controller=self.controller,
+            params=self.params,
+            stats=self.stats.summary(),
+        )
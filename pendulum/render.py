@@ -0,0 +1,330 @@
+"""Render videos from exported PNG frames or from NumPy drawings.
+
+Frames are decoded by a pool of threads and handed, in order, to the encoder
+through a bounded prefetch window, so memory use doesn't grow with the number
+of frames.
+
+Encoded frames are cached as video segments. Rendering again only encodes the
+frames added (or changed) since the last render, and the segments are joined
+without re-encoding them.
+
+`Canvas` draws simple shapes straight into frame arrays, for videos rendered
+without a window (e.g. replays of Recordings).
+"""
+import datetime
+import itertools
+import json
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import click
+import imageio.v2 as iio
+import imageio_ffmpeg
+import numpy as np
+
+from pendulum import settings as sett
+
+#: Frames per second of the rendered animation
+FPS = 60
+
+#: Encoding presets of x264, from the fastest to the smallest files
+PRESETS = (
+    "ultrafast",
+    "superfast",
+    "veryfast",
+    "faster",
+    "fast",
+    "medium",
+    "slow",
+    "slower",
+    "veryslow",
+)
+
+#: Maximum number of frames decoded ahead of the encoder
+PREFETCH = 32
+
+
+def frame_key(path: Path) -> list[Any]:
+    """Identify a frame file, to detect when it changes."""
+    stat = path.stat()
+    return [path.name, stat.st_size, stat.st_mtime_ns]
+
+
+def decode_frames(
+    paths: Iterable[Path],
+    workers: int | None = None,
+    prefetch: int = PREFETCH,
+) -> Iterator[np.ndarray]:
+    """Decode images in parallel, yielding them in the order of `paths`.
+
+    At most `prefetch` images are decoded ahead of the consumer.
+    """
+    remaining = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future] = deque(
+            executor.submit(iio.imread, path)
+            for path in itertools.islice(remaining, prefetch)
+        )
+        while pending:
+            frame = pending.popleft().result()
+            for path in itertools.islice(remaining, 1):
+                pending.append(executor.submit(iio.imread, path))
+
+            yield frame
+
+
+class SegmentCache:
+    """Video segments of previously encoded frames.
+
+    The manifest lists the segments, in order, along with the key (see
+    `frame_key`) of every frame each one contains.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = sett.ensure_path(path or sett.RENDER_CACHE_PATH)
+        self.manifest_path = self.path / "manifest.json"
+
+        self.segments: list[dict[str, Any]] = []
+        if self.manifest_path.exists():
+            self.segments = json.loads(self.manifest_path.read_text())
+
+    def reusable(
+        self, keys: list[list[Any]]
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Segments matching the beginning of `keys` and their frame count."""
+        segments = []
+        covered = 0
+        for segment in self.segments:
+            end = covered + len(segment["frames"])
+            if keys[covered:end] != segment["frames"]:
+                break
+
+            if not (self.path / segment["file"]).exists():
+                break
+
+            segments.append(segment)
+            covered = end
+
+        return segments, covered
+
+    def new_segment(self, keys: list[list[Any]]) -> dict[str, Any]:
+        files = {segment["file"] for segment in self.segments}
+        index = next(
+            idx for idx in itertools.count() if f"{idx}.mp4" not in files
+        )
+        return {"file": f"{index}.mp4", "frames": keys}
+
+    def save(self, segments: list[dict[str, Any]]) -> None:
+        """Keep only `segments`, deleting the files of the others."""
+        kept = {segment["file"] for segment in segments}
+        for segment in self.segments:
+            if segment["file"] not in kept:
+                (self.path / segment["file"]).unlink(missing_ok=True)
+
+        self.segments = segments
+        self.manifest_path.write_text(json.dumps(segments))
+
+
+def write_video(
+    frames: Iterable[np.ndarray],
+    out_path: Path,
+    length: int | None = None,
+    fps: int = FPS,
+    preset: str | None = None,
+) -> None:
+    """Stream `frames` (RGB arrays) into the encoder.
+
+    `preset` is the x264 encoding preset, trading file size for speed.
+    """
+    params = [] if preset is None else ["-preset", preset]
+    # H.264 (yuv420p) only requires even sizes, not multiples of 16.
+    with iio.get_writer(
+        out_path,
+        format="FFMPEG",
+        mode="I",
+        fps=fps,
+        ffmpeg_params=params,
+        macro_block_size=2,
+    ) as writer:
+        with click.progressbar(frames, length=length) as bar:
+            for frame in bar:
+                writer.append_data(frame)
+
+
+def encode(
+    frames: list[Path], out_path: Path, workers: int | None = None
+) -> None:
+    """Encode the `frames` files into a video."""
+    write_video(
+        frames=decode_frames(frames, workers=workers),
+        out_path=out_path,
+        length=len(frames),
+    )
+
+
+class Canvas:
+    """Rasterize simple shapes directly into a NumPy RGB frame.
+
+    Shapes are defined in world coordinates (mm, with the y axis pointing up)
+    and scaled to fit the frame, where the world has the size of the
+    simulation window.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        background: tuple[int, int, int] = (0, 0, 0),
+    ):
+        self.width = width
+        self.height = height
+        self.frame = np.empty((height, width, 3), dtype=np.uint8)
+        self.frame[..., :] = background
+        self._background = self.frame.copy()
+
+        self.scale = min(width / sett.WIDTH, height / sett.HEIGHT)
+        self.offset_x = (width - sett.WIDTH * self.scale) / 2
+        self.offset_y = (height - sett.HEIGHT * self.scale) / 2
+
+        #: Pixel offsets of disks, by radius (in pixels)
+        self._disks: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    def to_pixels(self, x, y) -> tuple[Any, Any]:
+        """Convert world coordinates into (column, row) pixel coordinates."""
+        col = self.offset_x + x * self.scale
+        row = self.height - (self.offset_y + y * self.scale)
+        return col, row
+
+    def clear(self) -> None:
+        """Restore the background (see `keep_as_background`)."""
+        np.copyto(self.frame, self._background)
+
+    def keep_as_background(self) -> None:
+        """Make the current drawing the background restored by `clear`.
+
+        Static shapes are drawn only once, instead of on every frame.
+        """
+        np.copyto(self._background, self.frame)
+
+    def rect(self, x: float, y: float, width: float, height: float, color):
+        """Draw a rectangle centered on (x, y)."""
+        left, top = self.to_pixels(x - width / 2, y + height / 2)
+        right, bottom = self.to_pixels(x + width / 2, y - height / 2)
+        # Negative bounds would index from the other end of the frame.
+        col_1, col_2 = (
+            min(max(round(bound), 0), self.width) for bound in (left, right)
+        )
+        row_1, row_2 = (
+            min(max(round(bound), 0), self.height) for bound in (top, bottom)
+        )
+        if col_1 >= col_2 or row_1 >= row_2:
+            return
+
+        self.frame[row_1:row_2, col_1:col_2] = color
+
+    def _disk_offsets(self, radius: int) -> tuple[np.ndarray, np.ndarray]:
+        if radius not in self._disks:
+            span = np.arange(-radius, radius + 1)
+            rows, cols = np.meshgrid(span, span, indexing="ij")
+            inside = rows**2 + cols**2 <= radius**2 + radius
+            self._disks[radius] = rows[inside], cols[inside]
+
+        return self._disks[radius]
+
+    def _stamp(self, cols: np.ndarray, rows: np.ndarray, radius: int, color):
+        """Draw disks of `radius` pixels centered on each pixel."""
+        disk_rows, disk_cols = self._disk_offsets(radius=radius)
+        all_rows = (np.rint(rows)[:, None] + disk_rows).astype(np.intp).ravel()
+        all_cols = (np.rint(cols)[:, None] + disk_cols).astype(np.intp).ravel()
+        inside = (
+            (all_rows >= 0)
+            & (all_rows < self.height)
+            & (all_cols >= 0)
+            & (all_cols < self.width)
+        )
+        self.frame[all_rows[inside], all_cols[inside]] = color
+
+    def disk(self, x: float, y: float, radius: float, color) -> None:
+        col, row = self.to_pixels(x, y)
+        self._stamp(
+            cols=np.array([col]),
+            rows=np.array([row]),
+            radius=round(radius * self.scale),
+            color=color,
+        )
+
+    def line(self, start, end, thickness: float, color) -> None:
+        """Draw a line between the `start` and `end` (x, y) points."""
+        col_1, row_1 = self.to_pixels(*start)
+        col_2, row_2 = self.to_pixels(*end)
+        points = int(np.hypot(col_2 - col_1, row_2 - row_1)) + 2
+        self._stamp(
+            cols=np.linspace(col_1, col_2, points),
+            rows=np.linspace(row_1, row_2, points),
+            radius=max(round(thickness * self.scale / 2), 0),
+            color=color,
+        )
+
+
+def join_segments(paths: list[Path], out_path: Path) -> None:
+    """Concatenate videos (with the same encoding), without re-encoding."""
+    if len(paths) == 1:
+        shutil.copyfile(paths[0], out_path)
+        return
+
+    list_path = out_path.with_suffix(".txt")
+    list_path.write_text("".join(f"file '{path}'\n" for path in paths))
+    try:
+        subprocess.run(
+            [
+                imageio_ffmpeg.get_ffmpeg_exe(),
+                *("-y", "-loglevel", "error"),
+                *("-f", "concat", "-safe", "0", "-i", str(list_path)),
+                *("-c", "copy", str(out_path)),
+            ],
+            check=True,
+        )
+    finally:
+        list_path.unlink()
+
+
+def render_animation(name: str | None = None, workers: int | None = None):
+    """Render the exported frames into an animation.
+
+    Only frames without a cached segment are decoded and encoded.
+    """
+    if name is None:
+        name = "pendulum"
+
+    frames = []
+    if sett.PNG_EXPORT_PATH.exists():
+        frames = sorted(sett.PNG_EXPORT_PATH.iterdir(), key=lambda x: x.stem)
+
+    if not frames:
+        click.secho("There are no exported frames.", fg="bright_red")
+        return
+
+    ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    out_path = sett.ensure_path(sett.GIF_EXPORT_PATH) / f"{name}_{ts}.mp4"
+    click.secho(f"Rendering animation to '{out_path}'...", fg="bright_green")
+
+    cache = SegmentCache()
+    keys = [frame_key(path) for path in frames]
+    segments, covered = cache.reusable(keys=keys)
+    if covered:
+        click.secho(f"Reusing {covered} encoded frames.", fg="yellow")
+
+    if covered < len(frames):
+        segment = cache.new_segment(keys=keys[covered:])
+        encode(frames[covered:], cache.path / segment["file"], workers)
+        segments.append(segment)
+
+    cache.save(segments=segments)
+    join_segments(
+        paths=[cache.path / segment["file"] for segment in segments],
+        out_path=out_path,
+    )
@@ -1,10 +1,13 @@
-"""Application Settings and constants."""
+"""Application Settings and constants.
 
-#: PyMunk Gravity value
+Importing the settings has no side effects: data directories are only created
+when first used (see `ensure_path`).
+"""
 from pathlib import Path
 
 import click
 
+#: PyMunk Gravity value
 GRAVITY = 0, -9807  # mm/s²
 
 #: Screen Size in px
@@ -12,18 +15,31 @@ GRAVITY = 0, -9807  # mm/s²
 WIDTH = 1280
 HEIGHT = 720
 
-#: How frequently the simulation is updated. If values are higher than
-# simulation steps, the simulation appears in slow motion.
+#: How frequently the simulation is updated (and drawn). Each update runs as
+# many simulation steps as the elapsed time requires.
 UPDATE_INTERVAL = 1.0 / 120
 
 #: The amount of (real) time between each update in the simulation space
 SIMULATION_STEP = 1.0 / 240
 
-#: The relation between simulated time and real time (i.e. how long it takes to
-# simulate 1 second)
-SIMULATION_RATE = UPDATE_INTERVAL / SIMULATION_STEP
+#: Simulated time per real time, selectable while running (`inf` runs as many
+# steps as fit in each update)
+TIME_FACTORS = (0.1, 0.25, 0.5, 1.0, 2.0, 10.0, float("inf"))
+TIME_FACTOR = 1.0
+
+#: Maximum simulation steps per update. If the simulation can't keep up,
+# it falls behind instead of taking even longer to catch up (death spiral).
+MAX_SUBSTEPS = 64
+
+#: How many times per second the HUD text is refreshed
+HUD_RATE = 10.0
 
-#: How many (real) secconds to wait before clearing the aim
+#: Number of rows buffered by the Recorder before blocking, dropping or
+# growing, depending on the policy (see `pendulum.background.POLICIES`).
+REC_BUFFER_SIZE = 4096
+REC_BUFFER_POLICY = "block"
+
+#: How many (simulated) seconds to wait before clearing the aim, once fired
 CLEAR_AIM_TIME = 0.5
 
 #: Base Project directory
@@ -31,28 +47,48 @@ BASE_DIR = Path(__file__).parent.parent
 
 #: Data Path
 DATA_PATH = BASE_DIR / "data"
-if not DATA_PATH.exists():
-    click.secho("Data path doesn't exist. Creating it.", fg="yellow")
-    DATA_PATH.mkdir()
 
 #: Recordings Path
 REC_PATH = DATA_PATH / "recordings"
 
+#: Recordings Catalog (SQLite database)
+CATALOG_PATH = REC_PATH / "catalog.sqlite3"
+
+#: Cache of synthesized LQR gains, by Parameters hash
+GAINS_PATH = DATA_PATH / "gains"
+
+#: Generated code of the equations of motion, by model hash
+MODEL_CACHE_PATH = DATA_PATH / ".model_cache"
+
+#: Parameter Sweeps Path
+SWEEP_PATH = DATA_PATH / "sweeps"
+
+#: Region of Attraction maps (classified points and heatmaps)
+ROA_PATH = DATA_PATH / "roa"
+
 #: Plots Path
 PLOT_PATH = DATA_PATH / "plot"
-if not PLOT_PATH.exists():
-    click.secho("Plot path doesn't exist. Creating it.", fg="yellow")
-    PLOT_PATH.mkdir()
 
 #: PNG Export Path
 PNG_EXPORT_PATH = DATA_PATH / ".png_export"
-if not PNG_EXPORT_PATH.exists():
-    click.secho("Export path doesn't exist. Creating it.", fg="yellow")
-    PNG_EXPORT_PATH.mkdir()
 
+#: Video segments of already rendered frames
+RENDER_CACHE_PATH = DATA_PATH / ".render_cache"
+
+#: Phase timings and profiling reports
+PROFILE_PATH = DATA_PATH / "profiles"
+
+#: Benchmark results
+BENCHMARK_PATH = DATA_PATH / "benchmarks"
 
 #: Gif Destination Path
 GIF_EXPORT_PATH = DATA_PATH / "animations"
-if not GIF_EXPORT_PATH.exists():
-    click.secho("Animations path doesn't exist. Creating it.", fg="yellow")
-    GIF_EXPORT_PATH.mkdir()
+
+
+def ensure_path(path: Path) -> Path:
+    """Create a data directory (and its parents) if it doesn't exist yet."""
+    if not path.exists():
+        click.secho(f"Creating '{path.name}' path.", fg="yellow")
+        path.mkdir(parents=True, exist_ok=True)
+
+    return path
@@ -1,20 +1,48 @@
+import math
+import time
+
+import click
 import pymunk
 from pyglet import clock, window
 from pyglet.window import key, mouse
 from pymunk.pyglet_util import DrawOptions
 
-from pendulum import settings as sett
+from pendulum import checkpoint, settings as sett
 from pendulum.cannon import Cannon
-from pendulum.recorder import Recorder
-from pendulum.utils import AnimationExporter, FPSDisplay, GridDisplay
+from pendulum.munk.renderer import EntityRenderer
+from pendulum.recorder import Recorder, generate_filename
+from pendulum.timing import PhaseTimers
+from pendulum.utils import (
+    HUD,
+    AnimationExporter,
+    FPSDisplay,
+    GridDisplay,
+    StaticLayers,
+    TimingsDisplay,
+)
 
 
 class BaseSimulation(window.Window):
+    """Base class for the simulations drawn in a window.
+
+    With `checkpoint_every`, a snapshot of the `STATE_ATTRS` is saved every
+    that many (simulated) seconds, to seek and branch from with the headless
+    simulations. Unlike those, the window keeps running from its own state
+    (see `HeadlessSimulation.save_checkpoint`) and input isn't saved: states
+    between snapshots are only reproduced approximately.
+    """
 
     CAPTION = "Base Simulation"
-    REC_FIELDS: tuple[str, ...]
+    #: Recorded fields, only needed by the simulations that record
+    REC_FIELDS: tuple[str, ...] = ()
     REC_PREFIX: str
 
+    #: Values of the simulation, set by the subclasses that show them
+    hud: HUD | None = None
+
+    #: Attributes holding the state of the simulation, saved in snapshots
+    STATE_ATTRS: tuple[str, ...] = ("space", "model")
+
     def __init__(
         self,
         record: bool,
@@ -22,14 +50,24 @@ class BaseSimulation(window.Window):
         grid: bool = False,
         width: int = sett.WIDTH,
         height: int = sett.HEIGHT,
+        rec_format: str = "csv",
+        time_factor: float = sett.TIME_FACTOR,
+        timings: bool = False,
+        stress_rate: float = 0.0,
+        checkpoint_every: float | None = None,
     ):
         assert self.CAPTION is not None, "CAPTION needs to be set."
-        assert self.REC_FIELDS, "REC_FIELDS needs to be set."
+        assert not record or self.REC_FIELDS, "REC_FIELDS needs to be set."
 
         super().__init__(width=width, height=height, caption=self.CAPTION)
 
         self.recorder = (
-            Recorder(fields=self.REC_FIELDS, prefix=self.REC_PREFIX)
+            Recorder(
+                fields=self.REC_FIELDS,
+                prefix=self.REC_PREFIX,
+                rec_format=rec_format,
+                background=True,
+            )
             if record
             else None
         )
@@ -37,28 +75,74 @@ class BaseSimulation(window.Window):
         self.space = pymunk.Space()
         self.space.gravity = sett.GRAVITY
 
+        #: Simulation steps since the beginning
+        self.steps = 0
+        self.checkpoints = (
+            checkpoint.CheckpointWriter(
+                path=checkpoint.checkpoint_path(
+                    prefix=self.REC_PREFIX, recorder=self.recorder
+                ),
+                interval=checkpoint_every,
+            )
+            if checkpoint_every
+            else None
+        )
+
+        #: Draws the entities, or the whole space with `debug_draw` ('D')
+        self.renderer = EntityRenderer()
         self.draw_options = DrawOptions()
+        self.debug_draw = False
+
+        #: Durations of the phases of each step and draw (see `on_close`)
+        self.timers = PhaseTimers(enabled=timings)
 
         self.fps_display = FPSDisplay(window=self)
+        self.timings_display = TimingsDisplay(window=self, timers=self.timers)
         self.exporter = AnimationExporter(enabled=export)
-        self.grid = GridDisplay(window=self, enabled=grid)
+        self.grid = GridDisplay(window=self)
+
+        #: Fixed geometry, drawn into a texture only when it changes
+        self.static_layers = StaticLayers(window=self)
+        self.static_layers.register("grid", self.grid.draw, enabled=grid)
 
-        self.cannon = Cannon(space=self.space)
+        self.cannon = Cannon(
+            space=self.space,
+            width=width,
+            height=height,
+            stress_rate=stress_rate,
+            renderer=self.renderer,
+        )
 
         self.keyboard = key.KeyStateHandler()
         self.push_handlers(self.keyboard)
 
+        #: Simulated time that still has to be stepped (s)
+        self.accumulator = 0.0
+        self.set_time_factor(factor=time_factor)
+
         clock.schedule_interval(self.update, interval=sett.UPDATE_INTERVAL)
 
     def on_draw(self) -> None:
         """Screen Draw Event."""
+        timers = self.timers
+        timers.begin()
         self.clear()
+        self.static_layers.draw()
+        timers.lap("draw.static")
         self.fps_display.draw()
-        self.grid.draw()
+        self.timings_display.draw()
+        timers.lap("draw.hud")
         self.cannon.draw()
-        self.space.debug_draw(options=self.draw_options)
+        timers.lap("draw.cannon")
+        if self.debug_draw:
+            self.space.debug_draw(options=self.draw_options)
+        else:
+            self.renderer.draw()
+        timers.lap("draw.space")
         self.draw_extra()
+        timers.lap("draw.extra")
         self.exporter.save_frame()
+        timers.lap("draw.export")
 
     def draw_extra(self) -> None:
         """Draw simulation specific graphics.
@@ -68,11 +152,31 @@ class BaseSimulation(window.Window):
         """
         pass
 
+    def on_resize(self, width: int, height: int) -> None:
+        super().on_resize(width, height)
+        self.grid.resize()
+        self.static_layers.invalidate()
+
     def on_close(self) -> None:
         """Handle Window close event."""
+        if self.hud:
+            self.hud.close()
+
+        self.timings_display.close()
+
         if self.recorder:
             self.recorder.close()
 
+        if self.checkpoints:
+            self.checkpoints.close()
+
+        if self.timers.enabled:
+            path = sett.ensure_path(sett.PROFILE_PATH) / generate_filename(
+                prefix=f"{self.REC_PREFIX}_timings", suffix=".json"
+            )
+            self.timers.dump(path=path)
+            click.secho(f"Timings saved to '{path}'.", fg="green")
+
         super().on_close()
 
     def on_mouse_press(self, x, y, button, modifiers) -> None:
@@ -95,8 +199,89 @@ class BaseSimulation(window.Window):
 
     def on_key_release(self, symbol, modifiers):
         if symbol == key.G:
-            self.grid.toggle()
+            self.static_layers.toggle("grid")
+        elif symbol == key.D:
+            self.debug_draw = not self.debug_draw
+        elif symbol == key.T:
+            self.timings_display.toggle()
+        elif symbol == key.BRACKETLEFT:
+            self.change_time_factor(offset=-1)
+        elif symbol == key.BRACKETRIGHT:
+            self.change_time_factor(offset=1)
+
+    def set_time_factor(self, factor: float) -> None:
+        """Set the simulated time per real time (`inf` runs at full speed)."""
+        self.time_factor = factor
+        self.accumulator = 0.0
+
+        factor_str = "max" if math.isinf(factor) else f"{factor:g}x"
+        self.set_caption(f"{self.CAPTION} [{factor_str}]")
+
+    def change_time_factor(self, offset: int) -> None:
+        """Select the previous/next of the `TIME_FACTORS`."""
+        factors = sorted({*sett.TIME_FACTORS, self.time_factor})
+        idx = factors.index(self.time_factor) + offset
+        self.set_time_factor(factors[min(max(idx, 0), len(factors) - 1)])
 
     def update(self, dt: float) -> None:
-        """Update the Simulation."""
+        """Step the simulation to match the (scaled) elapsed time.
+
+        Drawing happens once per update, regardless of the number of steps.
+        """
+        if not self.timers.enabled:
+            self._advance(dt=dt)
+            return
+
+        start = time.perf_counter_ns()
+        self._advance(dt=dt)
+        self.timers.record("update", time.perf_counter_ns() - start)
+
+    def _advance(self, dt: float) -> None:
+        if math.isinf(self.time_factor):
+            # Leave part of the interval for drawing.
+            self._step_for(budget=sett.UPDATE_INTERVAL / 2)
+            return
+
+        self.accumulator += dt * self.time_factor
+        steps = int(self.accumulator / sett.SIMULATION_STEP)
+        if steps > sett.MAX_SUBSTEPS:
+            # Give up on the time that can't be simulated.
+            steps = sett.MAX_SUBSTEPS
+            self.accumulator = steps * sett.SIMULATION_STEP
+
+        for _ in range(steps):
+            self._step()
+
+        self.accumulator -= steps * sett.SIMULATION_STEP
+
+    def _step_for(self, budget: float) -> None:
+        """Step the simulation for (about) `budget` seconds of real time."""
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            for _ in range(8):
+                self._step()
+
+    def _step(self) -> None:
+        if self.checkpoints and self.checkpoints.due(self.steps):
+            self.save_checkpoint()
+
+        self.step()
+        self.cannon.step(dt=sett.SIMULATION_STEP)
+        self.timers.lap("step.cannon")
+        self.steps += 1
+
+    def save_checkpoint(self) -> None:
+        """Append a snapshot of the current state to the checkpoints."""
+        assert self.checkpoints is not None
+        state = {name: getattr(self, name) for name in self.STATE_ATTRS}
+        self.checkpoints.write(
+            steps=self.steps,
+            payload=checkpoint.dumps(steps=self.steps, state=state),
+        )
+
+    def step(self) -> None:
+        """Advance the simulation by a single `SIMULATION_STEP`.
+
+        Call `timers.begin` first and `timers.lap` after each phase.
+        """
         raise NotImplementedError
@@ -0,0 +1,126 @@
+"""Measure how long the simulation hot paths take."""
+import cProfile
+import json
+import pstats
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import click
+import numpy as np
+
+
+class LatencyStats:
+    """Collect call durations (in ns).
+
+    Every call counts towards the mean and maximum, while percentiles are
+    computed over the most recent `size` calls.
+    """
+
+    def __init__(self, size: int = 4096):
+        self._samples = np.zeros(size, dtype=np.int64)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        self._samples[self.count % len(self._samples)] = duration_ns
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    @property
+    def mean(self) -> float:
+        """Mean duration (s)."""
+        return self.total_ns / max(self.count, 1) / 1e9
+
+    def percentile(self, q: float) -> float:
+        """Duration (s) below which `q`% of the recent calls took."""
+        if not self.count:
+            return 0.0
+
+        recent = self._samples[: min(self.count, len(self._samples))]
+        return float(np.percentile(recent, q)) / 1e9
+
+    def summary(self) -> dict[str, float]:
+        """Statistics of the durations (s)."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max_ns / 1e9,
+        }
+
+    def echo(self, name: str, budget: float | None = None) -> None:
+        """Print the statistics, compared to a `budget` (s) per call."""
+        click.secho(f"{name} latency ({self.count} calls):", fg="green")
+        click.echo(f" - Mean: {self.mean * 1e6:.2f} µs")
+        click.echo(f" - p50: {self.percentile(50) * 1e6:.2f} µs")
+        click.echo(f" - p99: {self.percentile(99) * 1e6:.2f} µs")
+        click.echo(f" - Max: {self.max_ns / 1e3:.2f} µs")
+        if budget is None:
+            return
+
+        usage = self.percentile(99) / budget
+        color = "green" if usage < 1 else "bright_red"
+        click.secho(f" - p99 of the budget: {usage:.2%}", fg=color)
+
+
+class PhaseTimers:
+    """Time the consecutive phases of a loop (e.g. the steps of an update).
+
+    Each `lap` records the time since the previous one (or since `begin`)
+    as the duration of the phase that just ended. While disabled, timers
+    don't read the clock at all.
+    """
+
+    def __init__(self, enabled: bool = True, size: int = 1024):
+        self.enabled = enabled
+        self.size = size
+        self.stats: dict[str, LatencyStats] = {}
+        self._last = 0
+
+    def begin(self) -> None:
+        if self.enabled:
+            self._last = time.perf_counter_ns()
+
+    def lap(self, name: str) -> None:
+        """End the phase `name`, starting the next one."""
+        if not self.enabled:
+            return
+
+        now = time.perf_counter_ns()
+        self.record(name, now - self._last)
+        self._last = now
+
+    def record(self, name: str, duration_ns: int) -> None:
+        if name not in self.stats:
+            self.stats[name] = LatencyStats(size=self.size)
+
+        self.stats[name].record(duration_ns)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    def dump(self, path: Path) -> None:
+        """Save the statistics of every phase as JSON."""
+        path.write_text(json.dumps(self.summary(), indent=2))
+
+
+def profile_call(
+    func: Callable[[], Any], out_path: Path, sort: str, lines: int
+) -> None:
+    """Run `func` under cProfile, saving the stats and a text report.
+
+    The stats (`.prof`) can be loaded with `pstats` or any of its viewers,
+    while the report (`.txt`) lists the `lines` slowest functions.
+    """
+    profiler = cProfile.Profile()
+    profiler.runcall(func)
+    profiler.dump_stats(out_path.with_suffix(".prof"))
+
+    with out_path.with_suffix(".txt").open("w") as fd:
+        stats = pstats.Stats(profiler, stream=fd)
+        stats.sort_stats(sort).print_stats(lines)
@@ -1,11 +1,42 @@
 """Utility Functions and Classes."""
-import datetime
+from typing import Any, Callable
 
-import click
-import imageio as iio
-from pyglet import graphics, image, shapes, text, window
+from pyglet import clock, gl, graphics, image, shapes, sprite, text, window
+from pyglet.graphics.shader import ShaderProgram
+from pyglet.image.buffer import Framebuffer
+from pyglet.text import document, layout
 
 from pendulum import settings as sett
+from pendulum.timing import PhaseTimers
+
+
+class PointsGroup(graphics.Group):
+    """Draw (alpha blended) GL_POINTS of a given size, in pixels.
+
+    Use it with the default shader of `pyglet.shapes`, whose vertices have
+    a `position`, a `translation` and `colors`.
+    """
+
+    def __init__(
+        self,
+        size: float,
+        program: ShaderProgram,
+        parent: graphics.Group | None = None,
+    ):
+        super().__init__(parent=parent)
+        self.size = size
+        self.program = program
+
+    def set_state(self) -> None:
+        self.program.use()
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        gl.glPointSize(self.size)
+
+    def unset_state(self) -> None:
+        gl.glPointSize(1)
+        gl.glDisable(gl.GL_BLEND)
+        self.program.stop()
 
 
 class FPSDisplay(window.FPSDisplay):
@@ -26,20 +57,226 @@ class FPSDisplay(window.FPSDisplay):
         )
 
 
+class HUD:
+    """Lines of text showing the latest values of the simulation.
+
+    Values can be set on every step (see `update`), but the text is only
+    laid out again at `rate` Hz, and only when the formatted text changed.
+    All lines share a single layout, each one with its own color.
+    """
+
+    FONT_SIZE = 16
+    LINE_HEIGHT = FONT_SIZE * 1.5
+
+    def __init__(
+        self,
+        window: window.Window,
+        lines: list[tuple[str, tuple[int, int, int, int]]],
+        rate: float = sett.HUD_RATE,
+    ):
+        #: Line templates (see `str.format`) and their colors
+        self.lines = lines
+        self.values: dict[str, Any] = {}
+
+        self.document = document.FormattedDocument()
+        self.layout = layout.TextLayout(
+            self.document,
+            width=window.width // 2,
+            height=round(len(lines) * self.LINE_HEIGHT) + self.FONT_SIZE,
+            multiline=True,
+        )
+        self.layout.anchor_y = "top"
+        self.layout.x = 5
+        self.layout.y = window.height - 5
+
+        self._text = ""
+        clock.schedule_interval(self.refresh, 1 / rate)
+
+    def update(self, **values: Any) -> None:
+        """Set the latest values, shown on the next refresh."""
+        self.values.update(values)
+
+    def refresh(self, dt: float = 0.0) -> None:
+        try:
+            lines = [line.format(**self.values) for line, _ in self.lines]
+        except KeyError:
+            # Not every value was set yet.
+            return
+
+        new_text = "\n".join(lines)
+        if new_text == self._text:
+            return
+
+        self._text = new_text
+        # Laid out only once, by `end_update`.
+        self.layout.begin_update()
+        self.document.delete_text(0, len(self.document.text))
+        position = 0
+        for idx, (line, (_, color)) in enumerate(zip(lines, self.lines)):
+            if idx:
+                line = f"\n{line}"
+
+            self.document.insert_text(
+                position,
+                line,
+                {
+                    "color": color,
+                    "font_size": self.FONT_SIZE,
+                    "line_spacing": self.LINE_HEIGHT,
+                },
+            )
+            position += len(line)
+
+        self.layout.end_update()
+
+    def draw(self) -> None:
+        self.layout.draw()
+
+    def close(self) -> None:
+        """Stop refreshing, once the window is closed."""
+        clock.unschedule(self.refresh)
+
+
+class TimingsDisplay:
+    """Show the p50/p99 durations of each phase, below the FPS Display.
+
+    The text is only refreshed every `REFRESH_INTERVAL`, as laying it out
+    takes longer than most of the phases.
+    """
+
+    FONT_SIZE = 10
+    FONT_COLOR = 255, 0, 0, 200
+    REFRESH_INTERVAL = 0.5  # s
+    WIDTH = 330
+
+    def __init__(self, window: window.Window, timers: PhaseTimers):
+        self.timers = timers
+        self.enabled = timers.enabled
+
+        self.label = text.Label(
+            font_name="monospace",
+            font_size=self.FONT_SIZE,
+            x=window.width - 5,
+            y=window.height - FPSDisplay.FONT_SIZE * 2 - 10,
+            width=self.WIDTH,
+            anchor_x="right",
+            anchor_y="top",
+            multiline=True,
+            color=self.FONT_COLOR,
+        )
+        if self.enabled:
+            clock.schedule_interval(self.refresh, self.REFRESH_INTERVAL)
+
+    def refresh(self, dt: float = 0.0) -> None:
+        lines = [f"{'phase':<16}{'p50 µs':>7}{'p99 µs':>8}"]
+        for name, stats in self.timers.stats.items():
+            p50, p99 = stats.percentile(50) * 1e6, stats.percentile(99) * 1e6
+            lines.append(f"{name:<16}{p50:>7.1f}{p99:>8.1f}")
+
+        self.label.text = "\n".join(lines)
+
+    def draw(self) -> None:
+        if self.enabled:
+            self.label.draw()
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled and self.timers.enabled
+
+    def close(self) -> None:
+        """Stop refreshing, once the window is closed."""
+        clock.unschedule(self.refresh)
+
+
+class StaticLayers:
+    """Fixed geometry (e.g. the grid) drawn once into a texture.
+
+    Each frame only draws the texture, which replaces the (black) window
+    background. It's rendered again only after layers are registered or
+    toggled, or the window is resized (see `invalidate`).
+    """
+
+    def __init__(self, window: window.Window):
+        self.window = window
+
+        #: Draw function of each layer, in drawing order
+        self._layers: dict[str, Callable[[], None]] = {}
+        self.enabled: dict[str, bool] = {}
+
+        self._framebuffer: Framebuffer | None = None
+        self._sprite: sprite.Sprite | None = None
+        self._size = 0, 0
+        self._valid = False
+
+    def register(
+        self, name: str, draw: Callable[[], None], enabled: bool = True
+    ) -> None:
+        """Add a layer, drawn on top of the ones registered before it."""
+        self._layers[name] = draw
+        self.enabled[name] = enabled
+        self.invalidate()
+
+    def toggle(self, name: str) -> None:
+        self.enabled[name] = not self.enabled[name]
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Render the layers again before the next draw."""
+        self._valid = False
+
+    def _render(self) -> None:
+        width, height = self.window.get_framebuffer_size()
+        if self._sprite is None or self._size != (width, height):
+            self._size = width, height
+            texture = image.Texture.create(width=width, height=height)
+            self._framebuffer = Framebuffer()
+            self._framebuffer.attach_texture(texture)
+            # Replace the background, instead of blending into it.
+            self._sprite = sprite.Sprite(
+                texture, blend_src=gl.GL_ONE, blend_dest=gl.GL_ZERO
+            )
+
+        self._sprite.update(
+            scale_x=self.window.width / width,
+            scale_y=self.window.height / height,
+        )
+
+        self._framebuffer.bind()
+        self.window.clear()
+        for name, draw in self._layers.items():
+            if self.enabled[name]:
+                draw()
+
+        self._framebuffer.unbind()
+        self._valid = True
+
+    def draw(self) -> None:
+        if not any(self.enabled.values()):
+            return
+
+        if not self._valid:
+            self._render()
+
+        self._sprite.draw()
+
+
 class GridDisplay:
     """Draw a grid on the screen."""
 
     GRID_STEP_SIZE = 50
 
-    def __init__(self, window: window.Window, enabled: bool = True):
+    def __init__(self, window: window.Window):
         self.window = window
 
-        self.enabled = enabled
-
         self._lines: list[shapes.ShapeBase] = []
         self._batch = graphics.Batch()
         self._create_grid()
 
+    def resize(self) -> None:
+        """Create the Grid Lines again, to fit the window."""
+        self._lines = []
+        self._batch = graphics.Batch()
+        self._create_grid()
+
     def _create_grid(self) -> None:
         """Define the Grid Lines."""
         self._create_horizontal_grids()
@@ -94,11 +331,7 @@ class GridDisplay:
         self._lines.append(line)
 
     def draw(self) -> None:
-        if self.enabled:
-            self._batch.draw()
-
-    def toggle(self) -> None:
-        self.enabled = not self.enabled
+        self._batch.draw()
 
 
 class AnimationExporter:
@@ -109,7 +342,7 @@ class AnimationExporter:
         self._clear_files()
 
     def _clear_files(self) -> None:
-        for filepath in sett.PNG_EXPORT_PATH.iterdir():
+        for filepath in sett.ensure_path(sett.PNG_EXPORT_PATH).iterdir():
             filepath.unlink()
 
     def save_frame(self):
@@ -120,21 +353,3 @@ class AnimationExporter:
         image.get_buffer_manager().get_color_buffer().save(filepath)
 
         self._frame_count += 1
-
-
-def render_animation(name: str = None) -> None:
-    if name is None:
-        name = "pendulum"
-
-    ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    out_path = sett.GIF_EXPORT_PATH / f"{name}_{ts}.mp4"
-
-    click.secho(f"Rendering animation to '{out_path}'...", fg="bright_green")
-    img_files = sorted(
-        list(sett.PNG_EXPORT_PATH.iterdir()), key=lambda x: x.stem
-    )
-    with iio.get_writer(out_path, format="FFMPEG", mode="I", fps=60) as writer:
-        with click.progressbar(img_files) as bar:
-            for img_path in bar:
-                image = iio.imread(img_path)
-                writer.append_data(image)
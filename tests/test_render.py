@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from pendulum import settings as sett
+from pendulum.render import Canvas
+
+WHITE = 255, 255, 255
+
+
+@pytest.fixture
+def canvas() -> Canvas:
+    """Canvas at the window size, so pixels match the world (mm)."""
+    return Canvas(width=sett.WIDTH, height=sett.HEIGHT)
+
+
+def test_rect_inside(canvas):
+    canvas.rect(x=100, y=100, width=20, height=10, color=WHITE)
+
+    rows, cols = np.nonzero(canvas.frame.any(axis=-1))
+    assert (cols.min(), cols.max()) == (90, 109)
+    assert (rows.min(), rows.max()) == (sett.HEIGHT - 105, sett.HEIGHT - 96)
+
+
+@pytest.mark.parametrize(
+    "x, y",
+    [
+        (-100, 100),
+        (sett.WIDTH + 100, 100),
+        (100, -100),
+        (100, sett.HEIGHT + 100),
+    ],
+)
+def test_rect_outside(canvas, x, y):
+    canvas.rect(x=x, y=y, width=20, height=10, color=WHITE)
+
+    assert not canvas.frame.any()
+
+
+def test_rect_partly_outside(canvas):
+    canvas.rect(x=0, y=sett.HEIGHT, width=20, height=10, color=WHITE)
+
+    rows, cols = np.nonzero(canvas.frame.any(axis=-1))
+    assert (cols.min(), cols.max()) == (0, 9)
+    assert (rows.min(), rows.max()) == (0, 4)